@@ -0,0 +1,39 @@
+"""
+Conditional GET helpers (ETag / If-None-Match).
+
+ETags are derived from the ``(id, version)`` pairs of the rows a response is
+built from, so they can be computed from loaded ORM objects before any
+Pydantic validation or serialization happens.
+"""
+import hashlib
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response, status
+
+
+def compute_etag(*parts: Any) -> str:
+    """Strong ETag over the given parts."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def version_parts(rows: Iterable[Any]) -> tuple:
+    """``(id, version)`` pairs identifying the state of ``rows``."""
+    return tuple((row.id, row.version) for row in rows)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches ``etag``."""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
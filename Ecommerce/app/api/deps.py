@@ -0,0 +1,60 @@
+"""
+Shared API dependencies.
+"""
+from typing import Callable, Dict, FrozenSet, List, Optional
+from fastapi import HTTPException, Query, Request, status
+
+from app.core.config import settings
+from app.services.attribute_filter import parse_attribute_filters
+from app.services.loader_profile import LoaderProfile
+
+
+def expand_query(profile: LoaderProfile) -> Callable[..., FrozenSet[str]]:
+    """Build a dependency parsing the ``expand`` query parameter for a profile."""
+    description = f"Comma-separated relations to include ({', '.join(profile.names)})"
+
+    def parse_expand(
+        expand: Optional[str] = Query(None, description=description)
+    ) -> FrozenSet[str]:
+        try:
+            return profile.parse(expand)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    return parse_expand
+
+
+def attribute_filters(request: Request) -> Dict[str, str]:
+    """Parse ``attr.<key>=<value>`` query parameters into attribute filters."""
+    try:
+        return parse_attribute_filters(request.query_params.multi_items())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+def ids_query(
+    ids: Optional[str] = Query(None, description="Comma-separated ids to fetch in one request")
+) -> Optional[List[int]]:
+    """Parse the multi-get ``ids`` query parameter, dropping repeats."""
+    if ids is None:
+        return None
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    parsed = list(dict.fromkeys(parsed))
+    if not parsed or len(parsed) > settings.MULTI_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must name between 1 and {settings.MULTI_GET_MAX_IDS} ids"
+        )
+    return parsed
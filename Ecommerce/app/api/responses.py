@@ -0,0 +1,50 @@
+"""
+Single-validation JSON responses for API envelopes.
+
+Returning a Pydantic envelope from an endpoint makes FastAPI dump it to a
+dict, validate that dict again against ``response_model`` and encode it
+with ``jsonable_encoder`` plus ``json.dumps``. Endpoints instead validate
+each ORM row once (``_category_data``/``_product_data``), assemble the
+envelope with ``model_construct`` and return an ``EnvelopeResponse``, which
+FastAPI passes through untouched and which renders with the envelope's
+compiled pydantic-core serializer straight to JSON bytes. ``response_model``
+stays on the routes for the OpenAPI schema.
+"""
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+EnvelopeT = TypeVar("EnvelopeT", bound=BaseModel)
+
+
+class EnvelopeResponse(Response):
+    """JSON response rendering a Pydantic envelope without re-validating it."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = status.HTTP_200_OK,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        super().__init__(content=content, status_code=status_code, headers=headers)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
+
+
+def envelope(
+    response_model: Type[EnvelopeT],
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None,
+    **fields: Any
+) -> EnvelopeResponse:
+    """
+    Respond with ``response_model`` built from already validated fields.
+
+    ``data`` must hold schema instances (or lists of them); nothing is
+    validated again.
+    """
+    return EnvelopeResponse(response_model.model_construct(**fields), status_code, headers)
@@ -3,7 +3,7 @@ API v1 router configuration.
 """
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import categories
+from app.api.v1.endpoints import categories, export, imports, products, skus
 
 api_router = APIRouter()
 
@@ -13,3 +13,27 @@ api_router.include_router(
     prefix="/categories",
     tags=["categories"]
 )
+
+api_router.include_router(
+    products.router,
+    prefix="/products",
+    tags=["products"]
+)
+
+api_router.include_router(
+    skus.router,
+    prefix="/skus",
+    tags=["skus"]
+)
+
+api_router.include_router(
+    export.router,
+    prefix="/export",
+    tags=["export"]
+)
+
+api_router.include_router(
+    imports.router,
+    prefix="/imports",
+    tags=["imports"]
+)
@@ -1,34 +1,62 @@
 """
 Category API endpoints.
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import FrozenSet, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.api.conditional import compute_etag, etag_matches, not_modified, version_parts
+from app.api.deps import expand_query, ids_query
+from app.api.responses import EnvelopeResponse, envelope
+from app.core.database import get_db, get_read_db
+from app.models.category import Category as CategoryModel
+from app.services.archive_service import ArchiveService
 from app.services.category_service import CategoryService
+from app.services.loader_profile import CATEGORY_PROFILE
 from app.schemas.category import (
     CategoryCreate,
     CategoryUpdate,
     Category,
+    CategoryWithProducts,
     CategoryResponse,
-    CategoriesResponse
+    CategoriesResponse,
+    CategoryTreeResponse
 )
 
 router = APIRouter()
 
 
+def _category_data(
+    category: CategoryModel,
+    expand: FrozenSet[str] = frozenset()
+) -> Category:
+    """Validate a category with the schema matching its loader profile."""
+    schema = CategoryWithProducts if "products" in expand else Category
+    return schema.model_validate(category)
+
+
+def _category_etag(categories: List[CategoryModel], expand: FrozenSet[str], *extra) -> str:
+    """ETag over category (id, version, counters) and any expanded products."""
+    return compute_etag(*extra, *(
+        (category.id, category.version, category.child_count, category.product_count,
+         version_parts(category.products) if "products" in expand else ())
+        for category in categories
+    ))
+
+
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category_create: CategoryCreate,
     db: AsyncSession = Depends(get_db)
 ) -> CategoryResponse:
-    """Create a new category."""
+    """Create a new category (one round trip)."""
     service = CategoryService(db)
     try:
         category = await service.create(category_create)
-        return CategoryResponse(
-            data=category,
+        return envelope(
+            CategoryResponse,
+            status_code=status.HTTP_201_CREATED,
+            data=_category_data(category),
             message="Category created successfully"
         )
     except ValueError as e:
@@ -45,30 +73,72 @@ async def create_category(
 
 @router.get("/", response_model=CategoriesResponse)
 async def get_categories(
+    request: Request,
     parent_id: Optional[int] = Query(None, description="Filter by parent category ID"),
     include_deleted: bool = Query(False, description="Include deleted categories"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from meta.next_cursor (overrides page)"),
+    expand: FrozenSet[str] = Depends(expand_query(CATEGORY_PROFILE)),
+    ids: Optional[List[int]] = Depends(ids_query),
+    db: AsyncSession = Depends(get_read_db)
 ) -> CategoriesResponse:
-    """Get categories with optional filtering."""
+    """
+    Get categories with optional filtering, or the categories named by
+    ``ids`` (in that order, unknown ones skipped) in one lookup.
+    """
     service = CategoryService(db)
     try:
+        if ids is not None:
+            categories = await service.get_many(ids, expand)
+            found = {category.id for category in categories}
+            etag = _category_etag(categories, expand, request.url.query)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            return envelope(
+                CategoriesResponse,
+                headers={"ETag": etag},
+                data=[_category_data(category, expand) for category in categories],
+                message="Categories retrieved successfully",
+                meta={
+                    "ids": ids,
+                    "missing": [category_id for category_id in ids if category_id not in found],
+                    "expand": sorted(expand)
+                }
+            )
+        
         categories = await service.get_all(
             parent_id=parent_id,
             include_deleted=include_deleted,
             page=page,
-            size=size
+            size=size,
+            expand=expand,
+            cursor=cursor
         )
-        return CategoriesResponse(
-            data=categories,
+
+        # Check the page's ETag before any schema is built
+        etag = _category_etag(categories, expand, request.url.query)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return envelope(
+            CategoriesResponse,
+            headers={"ETag": etag},
+            data=[_category_data(category, expand) for category in categories],
             message="Categories retrieved successfully",
             meta={
-                "page": page,
+                "page": page if cursor is None else None,
                 "size": size,
-                "parent_id": parent_id
+                "parent_id": parent_id,
+                "expand": sorted(expand),
+                "next_cursor": service.next_cursor(categories, size)
             }
         )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -76,47 +146,62 @@ async def get_categories(
         )
 
 
-# @router.get("/tree", response_model=CategoriesResponse)
-# async def get_category_tree(
-#     root_id: Optional[int] = Query(None, description="Root category ID (null for all roots)"),
-#     max_depth: int = Query(3, ge=1, le=10, description="Maximum depth to fetch"),
-#     db: AsyncSession = Depends(get_db)
-# ) -> CategoriesResponse:
-#     """Get category hierarchy tree."""
-#     service = CategoryService(db)
-#     try:
-#         tree = await service.get_tree(root_id=root_id, max_depth=max_depth)
-#         return CategoriesResponse(
-#             data=tree,
-#             message="Category tree retrieved successfully",
-#             meta={
-#                 "root_id": root_id,
-#                 "max_depth": max_depth
-#             }
-#         )
-#     except Exception as e:
-#         raise HTTPException(
-#             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-#             detail="Failed to retrieve category tree"
-#         )
+@router.get("/tree", response_model=CategoryTreeResponse)
+async def get_category_tree(
+    root_id: Optional[int] = Query(None, description="Root category ID (null for all roots)"),
+    max_depth: int = Query(3, ge=1, le=10, description="Maximum depth to fetch"),
+    db: AsyncSession = Depends(get_read_db)
+) -> CategoryTreeResponse:
+    """Get category hierarchy tree."""
+    service = CategoryService(db)
+    try:
+        tree = await service.get_tree(root_id=root_id, max_depth=max_depth)
+        # The tree arrives as plain dicts, so this envelope is validated once here
+        return EnvelopeResponse(CategoryTreeResponse(
+            data=tree,
+            message="Category tree retrieved successfully",
+            meta={
+                "root_id": root_id,
+                "max_depth": max_depth
+            }
+        ))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve category tree"
+        )
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category(
+    request: Request,
     category_id: int,
-    db: AsyncSession = Depends(get_db)
+    expand: FrozenSet[str] = Depends(expand_query(CATEGORY_PROFILE)),
+    db: AsyncSession = Depends(get_read_db)
 ) -> CategoryResponse:
     """Get category by ID."""
     service = CategoryService(db)
     try:
-        category = await service.get_by_id(category_id)
+        category = await service.get_by_id(category_id, expand=expand)
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Category not found"
             )
-        return CategoryResponse(
-            data=category,
+
+        etag = _category_etag([category], expand)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return envelope(
+            CategoryResponse,
+            headers={"ETag": etag},
+            data=_category_data(category, expand),
             message="Category retrieved successfully"
         )
     except HTTPException:
@@ -134,7 +219,11 @@ async def update_category(
     category_update: CategoryUpdate,
     db: AsyncSession = Depends(get_db)
 ) -> CategoryResponse:
-    """Update category by ID."""
+    """
+    Update category by ID; fields left null keep their value.
+    
+    One round trip (two when a category with children is renamed).
+    """
     service = CategoryService(db)
     try:
         category = await service.update(category_id, category_update)
@@ -143,8 +232,48 @@ async def update_category(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Category not found"
             )
-        return CategoryResponse(
-            data=category,
+        return envelope(
+            CategoryResponse,
+            data=_category_data(category),
+            message="Category updated successfully"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update category"
+        )
+
+
+@router.patch("/{category_id}", response_model=CategoryResponse)
+async def patch_category(
+    category_id: int,
+    category_update: CategoryUpdate,
+    db: AsyncSession = Depends(get_db)
+) -> CategoryResponse:
+    """
+    Partially update category by ID: only the fields sent change, and null
+    clears a field (``parent_id: null`` moves to the root).
+    
+    One round trip (two when a category with children is renamed or moved).
+    """
+    service = CategoryService(db)
+    try:
+        category = await service.update(category_id, category_update, partial=True)
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Category not found"
+            )
+        return envelope(
+            CategoryResponse,
+            data=_category_data(category),
             message="Category updated successfully"
         )
     except ValueError as e:
@@ -167,7 +296,7 @@ async def delete_category(
     force: bool = Query(False, description="Force delete (permanent)"),
     db: AsyncSession = Depends(get_db)
 ) -> None:
-    """Delete category by ID (soft delete by default)."""
+    """Delete category by ID (soft delete by default; one round trip)."""
     service = CategoryService(db)
     try:
         success = await service.delete(category_id, force=force)
@@ -196,7 +325,7 @@ async def move_category(
     new_parent_id: Optional[int] = Query(None, description="New parent category ID (null for root)"),
     db: AsyncSession = Depends(get_db)
 ) -> CategoryResponse:
-    """Move category to a new parent."""
+    """Move category to a new parent (one round trip, two with children)."""
     service = CategoryService(db)
     try:
         category = await service.move(category_id, new_parent_id)
@@ -205,8 +334,9 @@ async def move_category(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Category not found"
             )
-        return CategoryResponse(
-            data=category,
+        return envelope(
+            CategoryResponse,
+            data=_category_data(category),
             message="Category moved successfully"
         )
     except ValueError as e:
@@ -221,3 +351,36 @@ async def move_category(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to move category"
         )
+
+
+@router.post("/{category_id}/restore", response_model=CategoryResponse)
+async def restore_category(
+    category_id: int,
+    db: AsyncSession = Depends(get_db)
+) -> CategoryResponse:
+    """Undelete a category, moving it back from the archive if needed."""
+    service = ArchiveService(db)
+    try:
+        category = await service.restore(CategoryModel, category_id)
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Category not found"
+            )
+        return envelope(
+            CategoryResponse,
+            data=_category_data(category),
+            message="Category restored successfully"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to restore category"
+        )
@@ -0,0 +1,29 @@
+"""
+Catalog export API endpoints.
+"""
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.services.export_service import MEDIA_TYPES, ExportEntity, ExportFormat, ExportService
+
+router = APIRouter()
+
+
+@router.get("/{entity}")
+async def export_table(
+    entity: ExportEntity,
+    format: ExportFormat = Query(ExportFormat.ndjson, description="Output format"),
+    include_deleted: bool = Query(False, description="Include deleted rows"),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+    db: AsyncSession = Depends(get_read_db)
+) -> StreamingResponse:
+    """Stream a whole table as NDJSON or CSV in id order."""
+    service = ExportService(db)
+    filename = f"{entity.value}.{format.value}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        service.stream(entity, format=format, include_deleted=include_deleted, gzip=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
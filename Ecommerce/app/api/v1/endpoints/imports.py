@@ -0,0 +1,75 @@
+"""
+Catalog import API endpoints.
+"""
+import os
+import tempfile
+from typing import Optional
+import aiofiles
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.responses import envelope
+from app.core.database import get_db
+from app.schemas.import_job import ImportJob, ImportJobResponse, ImportResponse
+from app.services.import_service import BLOCK_SIZE, ImportEntity, ImportFormat, ImportService
+
+router = APIRouter()
+
+
+@router.post("/{entity}", response_model=ImportResponse)
+async def import_file(
+    entity: ImportEntity,
+    file: UploadFile = File(..., description="CSV (with header row) or NDJSON file"),
+    format: Optional[ImportFormat] = Query(None, description="Defaults to the file extension"),
+    restart: bool = Query(False, description="Ignore any checkpoint and start over"),
+    db: AsyncSession = Depends(get_db)
+) -> ImportResponse:
+    """
+    Import an uploaded file; uploading the same file again after a failure
+    resumes after its last committed chunk. Use ``import_data.py`` for very
+    large files.
+    """
+    fd, path = tempfile.mkstemp(suffix=".import")
+    os.close(fd)
+    try:
+        async with aiofiles.open(path, "wb") as f:
+            while chunk := await file.read(BLOCK_SIZE):
+                await f.write(chunk)
+
+        service = ImportService(db)
+        result = await service.run(
+            path, entity, format=format, source=file.filename or "upload", restart=restart
+        )
+        return envelope(
+            ImportResponse,
+            data=result,
+            message="Import completed" if result.resumed_from == 0 else "Import resumed and completed"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Import failed; upload the same file again to resume"
+        )
+    finally:
+        os.remove(path)
+
+
+@router.get("/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db)
+) -> ImportJobResponse:
+    """Get an import's checkpoint and status."""
+    service = ImportService(db)
+    job = await service.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return envelope(ImportJobResponse, data=ImportJob.model_validate(job))
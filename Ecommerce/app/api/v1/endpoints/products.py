@@ -0,0 +1,304 @@
+"""
+Product API endpoints.
+"""
+from typing import Dict, FrozenSet, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import compute_etag, etag_matches, not_modified, version_parts
+from app.api.deps import attribute_filters, expand_query, ids_query
+from app.api.responses import EnvelopeResponse, envelope
+from app.core.database import get_db, get_read_db
+from app.models.product import Product as ProductModel
+from app.services.archive_service import ArchiveService
+from app.services.bulk_service import BulkService
+from app.services.product_service import ProductService
+from app.services.loader_profile import PRODUCT_PROFILE
+from app.schemas.bulk import BulkResponse, ProductBulkRequest, bulk_response
+from app.schemas.product import (
+    Product,
+    ProductWithCategory,
+    ProductWithSKUs,
+    ProductWithAll,
+    ProductResponse,
+    ProductsResponse,
+    ProductFacets,
+    ProductFacetsResponse,
+    ProductSearchRequest,
+    ProductSearchResult,
+    ProductSearchResponse
+)
+
+router = APIRouter()
+
+
+def _product_data(
+    product: ProductModel,
+    expand: FrozenSet[str] = frozenset()
+) -> Product:
+    """Validate a product with the schema matching its loader profile."""
+    if {"category", "skus"} <= expand:
+        schema = ProductWithAll
+    elif "category" in expand:
+        schema = ProductWithCategory
+    elif "skus" in expand:
+        schema = ProductWithSKUs
+    else:
+        schema = Product
+    return schema.model_validate(product)
+
+
+def _product_etag(products: List[ProductModel], expand: FrozenSet[str], *extra) -> str:
+    """ETag over product (id, version) pairs and any expanded relations."""
+    return compute_etag(*extra, *(
+        (product.id, product.version,
+         version_parts([product.category]) if "category" in expand else (),
+         version_parts(product.skus) if "skus" in expand else ())
+        for product in products
+    ))
+
+
+@router.post(":bulk", response_model=BulkResponse)
+async def bulk_upsert_products(
+    bulk: ProductBulkRequest,
+    db: AsyncSession = Depends(get_db)
+) -> BulkResponse:
+    """Create products, or update them when an ``id`` is given; results are per item."""
+    service = BulkService(db)
+    try:
+        return EnvelopeResponse(bulk_response(await service.upsert_products(bulk.items)))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to write products"
+        )
+
+
+@router.get("/", response_model=ProductsResponse)
+async def get_products(
+    request: Request,
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    include_deleted: bool = Query(False, description="Include deleted products"),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from meta.next_cursor (overrides page)"),
+    expand: FrozenSet[str] = Depends(expand_query(PRODUCT_PROFILE)),
+    attributes: Dict[str, str] = Depends(attribute_filters),
+    ids: Optional[List[int]] = Depends(ids_query),
+    db: AsyncSession = Depends(get_read_db)
+) -> ProductsResponse:
+    """
+    Get products with optional filtering; ``attr.<key>=<value>`` filters on
+    attributes. ``ids`` fetches those products instead (in that order,
+    unknown ones skipped) in one lookup.
+    """
+    service = ProductService(db)
+    try:
+        if ids is not None:
+            products = await service.get_many(ids, expand)
+            found = {product.id for product in products}
+            etag = _product_etag(products, expand, request.url.query)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            return envelope(
+                ProductsResponse,
+                headers={"ETag": etag},
+                data=[_product_data(product, expand) for product in products],
+                message="Products retrieved successfully",
+                meta={
+                    "ids": ids,
+                    "missing": [product_id for product_id in ids if product_id not in found],
+                    "expand": sorted(expand)
+                }
+            )
+
+        products = await service.get_all(
+            category_id=category_id,
+            include_deleted=include_deleted,
+            page=page,
+            size=size,
+            expand=expand,
+            cursor=cursor,
+            attributes=attributes
+        )
+
+        # Check the page's ETag before any schema is built
+        etag = _product_etag(products, expand, request.url.query)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return envelope(
+            ProductsResponse,
+            headers={"ETag": etag},
+            data=[_product_data(product, expand) for product in products],
+            message="Products retrieved successfully",
+            meta={
+                "page": page if cursor is None else None,
+                "size": size,
+                "category_id": category_id,
+                "attributes": attributes,
+                "expand": sorted(expand),
+                "next_cursor": service.next_cursor(products, size)
+            }
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve products"
+        )
+
+
+@router.get("/search", response_model=ProductSearchResponse)
+async def search_products(
+    search: ProductSearchRequest = Depends(),
+    db: AsyncSession = Depends(get_read_db)
+) -> ProductSearchResponse:
+    """Search products by name, optionally within a category."""
+    service = ProductService(db)
+    try:
+        hits, total = await service.search(search)
+        return envelope(
+            ProductSearchResponse,
+            data=[
+                ProductSearchResult.model_validate(product).model_copy(
+                    update={"score": hit.score, "highlight": hit.highlight}
+                )
+                for product, hit in hits
+            ],
+            message="Products retrieved successfully",
+            meta={
+                "page": search.page,
+                "size": search.size,
+                "total": total,
+                "query": search.query,
+                "category_id": search.category_id
+            }
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search products"
+        )
+
+
+@router.get("/facets", response_model=ProductFacetsResponse)
+async def get_product_facets(
+    query: Optional[str] = Query(None, description="Search query for product name"),
+    category_id: Optional[int] = Query(None, description="Filter by category ID (including subcategories)"),
+    top: Optional[int] = Query(None, ge=1, le=100, description="Values listed per facet key"),
+    attributes: Dict[str, str] = Depends(attribute_filters),
+    db: AsyncSession = Depends(get_read_db)
+) -> ProductFacetsResponse:
+    """Category and attribute counts for a product search; ``attr.<key>=<value>`` narrows it."""
+    service = ProductService(db)
+    try:
+        facets = await service.facets(
+            query=query,
+            category_id=category_id,
+            attributes=attributes,
+            top=top
+        )
+        return envelope(
+            ProductFacetsResponse,
+            data=ProductFacets.model_validate(facets),
+            message="Facets retrieved successfully",
+            meta={
+                "query": query,
+                "category_id": category_id,
+                "attributes": attributes
+            }
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve facets"
+        )
+
+
+@router.get("/{product_id}", response_model=ProductResponse)
+async def get_product(
+    request: Request,
+    product_id: int,
+    expand: FrozenSet[str] = Depends(expand_query(PRODUCT_PROFILE)),
+    db: AsyncSession = Depends(get_read_db)
+) -> ProductResponse:
+    """Get product by ID."""
+    service = ProductService(db)
+    try:
+        product = await service.get_by_id(product_id, expand=expand)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
+            )
+
+        etag = _product_etag([product], expand)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return envelope(
+            ProductResponse,
+            headers={"ETag": etag},
+            data=_product_data(product, expand),
+            message="Product retrieved successfully"
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve product"
+        )
+
+
+@router.post("/{product_id}/restore", response_model=ProductResponse)
+async def restore_product(
+    product_id: int,
+    db: AsyncSession = Depends(get_db)
+) -> ProductResponse:
+    """Undelete a product, moving it back from the archive if needed."""
+    service = ArchiveService(db)
+    try:
+        product = await service.restore(ProductModel, product_id)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
+            )
+        return envelope(
+            ProductResponse,
+            data=_product_data(product),
+            message="Product restored successfully"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to restore product"
+        )
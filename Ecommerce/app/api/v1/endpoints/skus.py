@@ -0,0 +1,255 @@
+"""
+SKU API endpoints.
+"""
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import attribute_filters, ids_query
+from app.api.responses import EnvelopeResponse, envelope
+from app.core.database import get_db, get_read_db
+from app.models.sku import SKU as SKUModel
+from app.schemas.bulk import BulkResponse, SKUBulkRequest, bulk_response
+from app.schemas.sku import (
+    InventoryAdjustment,
+    InventoryBatchAdjustment,
+    InventoryBatchResponse,
+    InventoryLevel,
+    InventoryResponse,
+    SKU,
+    SKUResponse,
+    SKUSearchRequest,
+    SKUsResponse
+)
+from app.services.archive_service import ArchiveService
+from app.services.bulk_service import BulkService
+from app.services.inventory_coalescer import inventory_coalescer
+from app.services.inventory_service import InsufficientInventory, InventoryService
+from app.services.sku_service import SKUService
+
+router = APIRouter()
+
+
+@router.post(":bulk", response_model=BulkResponse)
+async def bulk_upsert_skus(
+    bulk: SKUBulkRequest,
+    db: AsyncSession = Depends(get_db)
+) -> BulkResponse:
+    """Create or update SKUs keyed on ``sku_code``; results are per item."""
+    service = BulkService(db)
+    try:
+        return EnvelopeResponse(bulk_response(await service.upsert_skus(bulk.items)))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to write SKUs"
+        )
+
+
+@router.get("/", response_model=SKUsResponse)
+async def get_skus(
+    ids: Optional[List[int]] = Depends(ids_query),
+    db: AsyncSession = Depends(get_read_db)
+) -> SKUsResponse:
+    """Get the SKUs named by ``ids`` (in that order, unknown ones skipped) in one lookup."""
+    if ids is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids is required; use /skus/search to filter SKUs"
+        )
+    try:
+        skus = await SKUService(db).get_many(ids)
+        found = {sku.id for sku in skus}
+        return envelope(
+            SKUsResponse,
+            data=[SKU.model_validate(sku) for sku in skus],
+            message="SKUs retrieved successfully",
+            meta={
+                "ids": ids,
+                "missing": [sku_id for sku_id in ids if sku_id not in found]
+            }
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve SKUs"
+        )
+
+
+@router.get("/search", response_model=SKUsResponse)
+async def search_skus(
+    search: SKUSearchRequest = Depends(),
+    attributes: Dict[str, str] = Depends(attribute_filters),
+    db: AsyncSession = Depends(get_read_db)
+) -> SKUsResponse:
+    """
+    Search SKUs by code prefix, product, price range, stock and
+    ``attr.<key>=<value>`` attributes, cheapest first.
+    """
+    service = SKUService(db)
+    try:
+        skus, total = await service.search(search, attributes=attributes)
+        return envelope(
+            SKUsResponse,
+            data=[SKU.model_validate(sku) for sku in skus],
+            message="SKUs retrieved successfully",
+            meta={
+                "page": search.page,
+                "size": search.size,
+                "total": total,
+                "attributes": attributes
+            }
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search SKUs"
+        )
+
+
+@router.post("/inventory:adjust", response_model=InventoryBatchResponse)
+async def adjust_inventory_batch(
+    batch: InventoryBatchAdjustment,
+    db: AsyncSession = Depends(get_db)
+) -> InventoryBatchResponse:
+    """
+    Add deltas to several SKUs' inventory in one statement. Atomic batches
+    apply nothing (409) unless every SKU can be adjusted.
+    """
+    service = InventoryService(db)
+    try:
+        results = await service.adjust_many(batch.items, atomic=batch.atomic)
+        rejected = [result for result in results if result.status != "adjusted"]
+        return envelope(
+            InventoryBatchResponse,
+            status_code=status.HTTP_409_CONFLICT if batch.atomic and rejected else status.HTTP_200_OK,
+            status="error" if batch.atomic and rejected else "success",
+            data=results,
+            message="Inventory batch rejected" if batch.atomic and rejected else "Inventory adjusted successfully",
+            meta={"total": len(results), "adjusted": len(results) - len(rejected), "rejected": len(rejected)}
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to adjust inventory"
+        )
+
+
+@router.get("/{sku_id}/inventory", response_model=InventoryResponse)
+async def get_inventory(
+    sku_id: int,
+    db: AsyncSession = Depends(get_db)
+) -> InventoryResponse:
+    """
+    Current inventory of a SKU, including adjustments still waiting for a
+    coalesced flush. Always read from the primary.
+    """
+    try:
+        inventory_count = await inventory_coalescer.read(db, sku_id)
+        if inventory_count is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="SKU not found"
+            )
+        return envelope(
+            InventoryResponse,
+            data=InventoryLevel(sku_id=sku_id, inventory_count=inventory_count),
+            message="Inventory retrieved successfully"
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve inventory"
+        )
+
+
+@router.post("/{sku_id}/inventory:adjust", response_model=InventoryResponse)
+async def adjust_inventory(
+    sku_id: int,
+    adjustment: InventoryAdjustment,
+    db: AsyncSession = Depends(get_db)
+) -> InventoryResponse:
+    """
+    Add a delta to a SKU's inventory without reading it first; never below
+    zero. With write coalescing on, the delta is committed with the next
+    batched flush before the response is sent.
+    """
+    service = InventoryService(db)
+    try:
+        if inventory_coalescer.running:
+            inventory_count = await inventory_coalescer.adjust(sku_id, adjustment.delta)
+        else:
+            inventory_count = await service.adjust(sku_id, adjustment.delta)
+        if inventory_count is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="SKU not found"
+            )
+        return envelope(
+            InventoryResponse,
+            data=InventoryLevel(sku_id=sku_id, inventory_count=inventory_count),
+            message="Inventory adjusted successfully"
+        )
+    except InsufficientInventory as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to adjust inventory"
+        )
+
+
+@router.post("/{sku_id}/restore", response_model=SKUResponse)
+async def restore_sku(
+    sku_id: int,
+    db: AsyncSession = Depends(get_db)
+) -> SKUResponse:
+    """Undelete a SKU, moving it back from the archive if needed."""
+    service = ArchiveService(db)
+    try:
+        sku = await service.restore(SKUModel, sku_id)
+        if not sku:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="SKU not found"
+            )
+        return envelope(
+            SKUResponse,
+            data=SKU.model_validate(sku),
+            message="SKU restored successfully"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to restore SKU"
+        )
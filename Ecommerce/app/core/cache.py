@@ -0,0 +1,212 @@
+"""
+Read-through cache with pluggable backends.
+
+Services cache plain column rows (not ORM instances) under keys such as
+``category:{id}`` and ``categories:list:{parent_id}:{params}``, and delete the
+affected keys or key prefixes after each committed write. Two backends are
+available: a bounded in-process LRU with TTL, and Redis (any client speaking
+the ``redis.asyncio`` API). Backend errors are counted and treated as misses,
+so an unavailable cache never fails a request.
+"""
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """Interface for cache storage backends."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Stored value of ``key``, or None when missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Drop ``keys``."""
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        """Drop every key starting with ``prefix``."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop everything."""
+
+
+class MemoryBackend(CacheBackend):
+    """Bounded in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisBackend(CacheBackend):
+    """Backend for a ``redis.asyncio``-compatible client."""
+
+    def __init__(self, client: Any, namespace: str = "ecommerce:"):
+        self.client = client
+        self.namespace = namespace
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.namespace + key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(self.namespace + key, value, ex=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.namespace + key for key in keys))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.namespace}{prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def clear(self) -> None:
+        await self.delete_prefix("")
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode_value(value: Dict[str, Any]) -> Any:
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    if "__decimal__" in value:
+        return Decimal(value["__decimal__"])
+    return value
+
+
+def row_of(instance: Any) -> Dict[str, Any]:
+    """Column values of an ORM instance, suitable for caching."""
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+
+class Cache:
+    """JSON-encoding cache facade with hit/miss counters."""
+
+    def __init__(self, backend: Optional[CacheBackend], ttl_seconds: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Cached value for ``key``, or None on a miss."""
+        if self.backend is None:
+            return None
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw, object_hook=_decode_value)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store ``value`` under ``key``."""
+        if self.backend is None:
+            return
+        raw = json.dumps(value, default=_encode_value, separators=(",", ":")).encode()
+        try:
+            await self.backend.set(key, raw, ttl or self.ttl_seconds)
+        except Exception:
+            self.errors += 1
+
+    async def invalidate(self, keys: Tuple[str, ...] = (), prefixes: Tuple[str, ...] = ()) -> None:
+        """Delete exact keys and every key under the given prefixes."""
+        if self.backend is None:
+            return
+        try:
+            if keys:
+                await self.backend.delete(*keys)
+            for prefix in prefixes:
+                await self.backend.delete_prefix(prefix)
+        except Exception:
+            self.errors += 1
+
+    async def clear(self) -> None:
+        """Drop every entry and reset counters."""
+        if self.backend is not None:
+            await self.backend.clear()
+        self.hits = self.misses = self.errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the metrics endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+def create_cache() -> Cache:
+    """Build the cache configured by ``CACHE_BACKEND``."""
+    if settings.CACHE_BACKEND == "memory":
+        backend = MemoryBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+    elif settings.CACHE_BACKEND == "redis":
+        import redis.asyncio as redis
+        backend = RedisBackend(redis.Redis.from_url(settings.REDIS_URL))
+    else:
+        backend = None
+    return Cache(backend, ttl_seconds=settings.CACHE_TTL_SECONDS)
+
+
+cache = create_cache()
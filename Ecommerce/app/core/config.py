@@ -18,6 +18,24 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Read replicas for GET traffic (comma-separated URLs; empty reads the primary)
+    DATABASE_REPLICA_URLS: str = ""
+    # Seconds a replica stays out of rotation after a connection failure
+    REPLICA_EJECT_SECONDS: int = 30
+    
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
+    # Connection pool (per worker; not used for in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statements cached per connection (0 behind PgBouncer)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    
     # Security
     SECRET_KEY: str
     
@@ -36,6 +54,71 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
     
+    # Bulk writes: items per request and rows per multi-row INSERT
+    BULK_MAX_ITEMS: int = 5000
+    BULK_CHUNK_SIZE: int = 500
+    
+    # Streaming export: rows fetched per server-side cursor batch
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Imports: rows per committed chunk and chunks buffered between stages
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_QUEUE_SIZE: int = 4
+    
+    # Inventory write coalescing (per worker): batch single-SKU adjustments and
+    # flush them every interval or once this many are queued
+    INVENTORY_COALESCE: bool = False
+    INVENTORY_COALESCE_INTERVAL_MS: int = 20
+    INVENTORY_COALESCE_MAX_EVENTS: int = 500
+    
+    # Caching ("memory", "redis" or "none"); memory caches are per worker
+    CACHE_BACKEND: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_ENTRIES: int = 10000
+    
+    # Product search backend ("trigram", "fts" or "like"); "fts" uses SQLite
+    # FTS5 or PostgreSQL full-text search and falls back to "like"
+    SEARCH_BACKEND: str = "trigram"
+    # Also index descriptions in the in-process trigram index
+    SEARCH_INDEX_DESCRIPTION: bool = False
+    
+    # Facet counts for product search (in-process, per worker): attribute keys
+    # counted from products and from their SKUs, and values listed per key
+    FACET_PRODUCT_ATTRIBUTES: str = "brand,material"
+    FACET_SKU_ATTRIBUTES: str = "color,size"
+    FACET_TOP_VALUES: int = 10
+    # Seconds between checks for other workers' product and SKU writes; the
+    # trigram and facet indexes lag those writes by at most this much
+    SEARCH_INDEX_REFRESH_SECONDS: int = 30
+    
+    @property
+    def facet_product_attributes(self) -> List[str]:
+        return [key.strip() for key in self.FACET_PRODUCT_ATTRIBUTES.split(",") if key.strip()]
+    
+    @property
+    def facet_sku_attributes(self) -> List[str]:
+        return [key.strip() for key in self.FACET_SKU_ATTRIBUTES.split(",") if key.strip()]
+    
+    # Attribute filters (attr.<key>=<value>): keys per request, and the match
+    # count under which a filter drives the query instead of being probed per row
+    ATTRIBUTE_FILTER_MAX_KEYS: int = 5
+    ATTRIBUTE_FILTER_DRIVE_LIMIT: int = 5000
+    
+    # Soft-delete archival: days a deleted row stays in the hot table, and
+    # rows moved to the archive per transaction
+    ARCHIVE_RETENTION_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 1000
+    
+    # Ids per multi-get (?ids=) request, fetched with one IN (...) query
+    MULTI_GET_MAX_IDS: int = 100
+    
+    # Category hierarchy snapshot (seconds before other workers' writes are seen)
+    CATEGORY_HIERARCHY_TTL_SECONDS: int = 30
+    
+    # Statement shapes repeated this often in one request are logged as N+1 suspects
+    N_PLUS_ONE_THRESHOLD: int = 5
+    
     # Rate Limiting
     RATE_LIMIT_REQUESTS_PER_MINUTE: int = 100
     
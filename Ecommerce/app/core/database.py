@@ -1,9 +1,42 @@
 """
 Database configuration and session management.
+
+Writes go through ``get_db`` (the primary). GET handlers use ``get_read_db``,
+which spreads reads round-robin over ``DATABASE_REPLICA_URLS``. A replica
+whose connection fails is ejected for ``REPLICA_EJECT_SECONDS``; with no
+healthy replica, or when the request sends ``X-Read-Your-Writes: 1``, reads
+go to the primary instead.
 """
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
+from app.core.pool import InstrumentedAsyncPool
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """Pool and driver options from settings for ``database_url``."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite lives in one connection; keep SQLAlchemy's default pool
+        return {}
+
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
 
 
 # Create async engine
@@ -11,6 +44,7 @@ engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
+    **engine_options(settings.DATABASE_URL),
 )
 
 # Create async session factory
@@ -21,6 +55,61 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+class ReplicaRouter:
+    """Round-robin read routing over replica engines with health-based ejection."""
+
+    def __init__(self, urls: List[str], eject_seconds: float):
+        self.eject_seconds = eject_seconds
+        self.engines: List[AsyncEngine] = []
+        self._sessionmakers: Dict[AsyncEngine, async_sessionmaker] = {}
+        self._ejected_until: Dict[AsyncEngine, float] = {}
+        for url in urls:
+            replica = create_async_engine(url, echo=settings.DEBUG, future=True, **engine_options(url))
+            event.listen(replica.sync_engine, "handle_error", self._on_error(replica))
+            self.engines.append(replica)
+            self._sessionmakers[replica] = async_sessionmaker(
+                replica, class_=AsyncSession, expire_on_commit=False
+            )
+        self._turn = itertools.cycle(range(len(self.engines)))
+
+    def next_sessionmaker(self) -> Optional[async_sessionmaker]:
+        """Session factory of the next healthy replica, or None if none is healthy."""
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            replica = self.engines[next(self._turn)]
+            if self._ejected_until.get(replica, 0.0) <= now:
+                return self._sessionmakers[replica]
+        return None
+
+    def eject(self, replica: AsyncEngine) -> None:
+        """Take ``replica`` out of rotation for ``eject_seconds``."""
+        self._ejected_until[replica] = time.monotonic() + self.eject_seconds
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                "healthy": self._ejected_until.get(replica, 0.0) <= now,
+            }
+            for replica in self.engines
+        ]
+
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+    def _on_error(self, replica: AsyncEngine):
+        def handle_error(context) -> None:
+            # Failing to connect at all leaves no connection on the context
+            if context.is_disconnect or context.connection is None:
+                self.eject(replica)
+        return handle_error
+
+
+replica_router = ReplicaRouter(settings.replica_urls, settings.REPLICA_EJECT_SECONDS)
+
+
 class Base(DeclarativeBase):
     """Base class for all database models."""
     pass
@@ -35,3 +124,21 @@ async def get_db() -> AsyncSession:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """
+    Dependency to get a read-only database session.
+
+    Sessions come from a healthy replica when one is configured. Clients that
+    must see their own recent writes send ``X-Read-Your-Writes: 1`` to read
+    from the primary.
+    """
+    sessionmaker = None
+    if request.headers.get("X-Read-Your-Writes", "").lower() not in ("1", "true"):
+        sessionmaker = replica_router.next_sessionmaker()
+    async with (sessionmaker or AsyncSessionLocal)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,39 @@
+"""
+Latency histogram shared by the runtime metrics on ``/metrics``.
+"""
+from typing import Any, Dict, List, Sequence
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram of durations in seconds."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.sum = 0.0
+        self.max = 0.0
+        self._counts: List[int] = [0] * (len(self.buckets) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self._counts[i] += 1
+                return
+        self._counts[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets: Dict[str, int] = {}
+        total = 0
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self._counts):
+            total += count
+            buckets[bound] = total
+        return {
+            "buckets": buckets,
+            "count": total,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+        }
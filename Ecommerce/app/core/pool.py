@@ -0,0 +1,80 @@
+"""
+Instrumented database connection pool.
+
+``InstrumentedAsyncPool`` is the async queue pool with counters: checkout
+latency as a cumulative histogram (time spent in ``Pool.connect``, including
+waits for a free connection and pre-ping), overflow connections opened past
+``pool_size``, checkout timeouts and connections invalidated (for instance
+by a failed pre-ping after a database failover). ``pool_stats`` combines them
+with the pool's live gauges for ``/metrics`` and ``/health``.
+"""
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.core.metrics import Histogram
+
+
+class PoolMetrics:
+    """Counters collected by an instrumented pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.wait = Histogram()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` recording ``PoolMetrics``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        event.listen(self, "invalidate", self._on_invalidate)
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.checkouts += 1
+            self.metrics.wait.observe(time.perf_counter() - started)
+
+    def _inc_overflow(self) -> bool:
+        created = super()._inc_overflow()
+        if created and self._overflow > 0:
+            self.metrics.overflow_events += 1
+        return created
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.metrics.invalidations += 1
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """Live gauges and counters of ``pool``."""
+    stats: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    metrics: Optional[PoolMetrics] = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update({
+            "checkouts": metrics.checkouts,
+            "overflow_events": metrics.overflow_events,
+            "timeouts": metrics.timeouts,
+            "invalidations": metrics.invalidations,
+            "wait_seconds": metrics.wait.snapshot(),
+        })
+    return stats
@@ -0,0 +1,134 @@
+"""
+Per-request SQL statement accounting.
+
+Cursor execution events on every ``Engine`` count statements (failed ones
+included) and time spent in the database for the innermost active
+``track_queries()`` block and each block enclosing it. ``QueryStatsMiddleware`` opens one block per HTTP
+request, reports it in a ``Server-Timing`` header and logs statement shapes
+repeated ``N_PLUS_ONE_THRESHOLD`` times or more as N+1 suspects. Tests open
+their own blocks around client calls to enforce query budgets.
+
+Statement shapes are the SQL text with bound parameters, so they are already
+free of literal values; expanded ``IN (?, ?, ...)`` lists are collapsed so a
+loop of ``IN`` lookups of varying size still shows up as one shape.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%s|\$\d+|:\w+)\s*,)+\s*(?:\?|%s|\$\d+|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalized SQL text identifying statements that differ only in values."""
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Statements executed within one ``track_queries()`` block."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        shape = statement_shape(statement)
+        stats: Optional[QueryStats] = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.shapes[shape] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Shapes executed at least ``threshold`` times, most frequent first."""
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count statements executed in this context until the block exits."""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# The start time rides on the statement's execution context, so a statement
+# that fails cannot leave it behind to skew the pooled connection's next one
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None and context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _finish(statement: str, context) -> None:
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        del context._query_started
+        stats.record(statement, time.perf_counter() - started)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _finish(statement, context)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context) -> None:
+    # A failed statement still made its round trip
+    if exception_context.statement is not None:
+        _finish(exception_context.statement, exception_context.execution_context)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware adding per-request query counts and DB time."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_timing(message) -> None:
+                if message["type"] == "http.response.start":
+                    # Statements run while a response streams are not in the header
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", stats.server_timing().encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        for shape, count in stats.repeated():
+            logger.warning(
+                "Possible N+1: %s %s ran %d times: %s",
+                scope["method"], scope["path"], count, shape
+            )
@@ -1,18 +1,36 @@
 """
 FastAPI main application.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.cache import cache
 from app.core.config import settings
+from app.core.database import engine, replica_router
+from app.core.pool import pool_stats
+from app.core.query_stats import QueryStatsMiddleware
+from app.services.inventory_coalescer import inventory_coalescer
 from app.api.v1.api import api_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the inventory flusher; on shutdown, commit what it still holds."""
+    if settings.INVENTORY_COALESCE:
+        inventory_coalescer.start()
+    yield
+    await inventory_coalescer.close()
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="E-commerce inventory management service",
     version="1.0.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set up CORS middleware
@@ -25,6 +43,9 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Count SQL statements per request (Server-Timing header, N+1 warnings)
+app.add_middleware(QueryStatsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -43,7 +64,20 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    stats = pool_stats(engine.pool)
+    pool = {key: stats[key] for key in ("size", "checked_out", "overflow", "timeouts") if key in stats}
+    return {"status": "healthy", "database": {"pool": pool}}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for capacity planning."""
+    return {
+        "cache": cache.stats(),
+        "db_pool": pool_stats(engine.pool),
+        "replicas": replica_router.stats(),
+        "inventory_coalescer": inventory_coalescer.stats()
+    }
 
 
 if __name__ == "__main__":
@@ -4,5 +4,10 @@ Models package initialization.
 from app.models.category import Category
 from app.models.product import Product
 from app.models.sku import SKU
+from app.models.import_job import ImportJob
+from app.models.attribute_index import ProductAttribute, SKUAttribute
+from app.models import category_counters  # noqa: F401  (registers counter triggers)
+from app.models import archive  # noqa: F401  (registers archive tables)
+from app.models import search  # noqa: F401  (registers full-text DDL on products)
 
-__all__ = ["Category", "Product", "SKU"]
+__all__ = ["Category", "Product", "SKU", "ImportJob", "ProductAttribute", "SKUAttribute"]
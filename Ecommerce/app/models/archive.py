@@ -0,0 +1,80 @@
+"""
+Archive tables for soft-deleted categories, products and SKUs.
+
+Soft deletes only flip ``is_deleted``, so tombstones would otherwise stay in
+the hot tables and their non-partial indexes forever. The archival job
+(``app.services.archive_service``) moves rows deleted longer than the
+retention window into ``<table>_archive``: same columns and ids, plus
+``archived_at``. Archived rows keep their ids, so ``with_archive`` can map
+a model over the union of both tables for ``include_deleted`` reads, and a
+restore moves the row back unchanged.
+
+``install_archive`` creates the archive tables on existing databases and
+rebuilds SQLite indexes created before they were partial.
+"""
+from typing import Dict, Type
+
+from sqlalchemy import Column, DateTime, Table, select, union_all
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Subquery
+
+from app.core.database import Base
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+
+
+def _archive_table(table: Table) -> Table:
+    """Archive twin of ``table``: its columns without constraints, plus ``archived_at``."""
+    return Table(
+        f"{table.name}_archive",
+        Base.metadata,
+        *(Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+          for column in table.columns),
+        Column("archived_at", DateTime, nullable=False, index=True),
+    )
+
+
+ARCHIVES: Dict[Type[Base], Table] = {
+    model: _archive_table(model.__table__) for model in (Category, Product, SKU)
+}
+
+
+def all_rows(model: Type[Base]) -> Subquery:
+    """Hot and archived rows of ``model``'s table, with the hot table's columns."""
+    table, archive = model.__table__, ARCHIVES[model]
+    return union_all(
+        select(*table.columns),
+        select(*(archive.c[column.name] for column in table.columns)),
+    ).subquery(f"{table.name}_all")
+
+
+def with_archive(model: Type[Base]):
+    """``model`` mapped over its hot and archive rows, for reads that include deleted ones."""
+    return aliased(model, all_rows(model))
+
+
+def install_archive(conn: Connection) -> None:
+    """Create missing archive tables and make SQLite's partial indexes partial."""
+    for archive in ARCHIVES.values():
+        archive.create(conn, checkfirst=True)
+    if conn.dialect.name != "sqlite":
+        return
+
+    for model in ARCHIVES:
+        created = {
+            name: sql for name, sql in conn.exec_driver_sql(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+                (model.__tablename__,)
+            )
+        }
+        for index in model.__table__.indexes:
+            if index.dialect_options["sqlite"]["where"] is None:
+                continue
+            if index.name in created:
+                if " WHERE " in (created[index.name] or "").upper():
+                    continue
+                index.drop(conn)
+            index.create(conn)
+    conn.exec_driver_sql("ANALYZE")
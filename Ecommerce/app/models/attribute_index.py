@@ -0,0 +1,149 @@
+"""
+Attribute index side tables for product and SKU JSON attributes.
+
+``Product.attributes`` and ``SKU.attributes`` are free-form JSON. Each
+scalar entry is mirrored as a ``(key, value, entity_id)`` row in
+``product_attributes``/``sku_attributes``, so ``attr.color=red`` becomes a
+primary-key lookup instead of decoding every document. Values are stored as
+text (``"red"``, ``"42"``, ``"true"``); objects, arrays, nulls and entries
+longer than the columns are not indexed.
+
+Rows are maintained by database triggers on the owning table, so every
+write path (ORM, bulk upsert, raw SQL) keeps them in sync. Tables and
+triggers are created with ``Base.metadata``; ``install_attribute_index``
+adds them to databases created before they existed and indexes the rows
+already there.
+"""
+from typing import Dict, List
+
+from sqlalchemy import DDL, Index, Integer, String, event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.product import Product
+from app.models.sku import SKU
+
+
+class ProductAttribute(Base):
+    """One scalar entry of a product's attributes."""
+    __tablename__ = "product_attributes"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), primary_key=True)
+    entity_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    __table_args__ = (
+        Index('ix_product_attributes_entity', 'entity_id'),
+        {'sqlite_with_rowid': False},
+    )
+
+
+class SKUAttribute(Base):
+    """One scalar entry of a SKU's attributes."""
+    __tablename__ = "sku_attributes"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), primary_key=True)
+    entity_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    __table_args__ = (
+        Index('ix_sku_attributes_entity', 'entity_id'),
+        {'sqlite_with_rowid': False},
+    )
+
+
+# Owning table name -> side table name
+INDEXED_TABLES = {
+    Product.__tablename__: ProductAttribute.__tablename__,
+    SKU.__tablename__: SKUAttribute.__tablename__,
+}
+
+SQLITE_ENTRIES = """
+    SELECT {id}, key,
+           CASE type WHEN 'true' THEN 'true' WHEN 'false' THEN 'false' ELSE CAST(value AS TEXT) END
+    FROM {source}json_each({attributes})
+    WHERE type NOT IN ('object', 'array', 'null')
+      AND length(key) <= 64 AND length(CAST(value AS TEXT)) <= 255
+"""
+
+POSTGRES_ENTRIES = """
+    SELECT {id}, e.key, e.value
+    FROM {source}jsonb_each_text(coalesce({attributes}::jsonb, '{{}}'::jsonb)) AS e
+    WHERE jsonb_typeof({attributes}::jsonb -> e.key) NOT IN ('object', 'array', 'null')
+      AND length(e.key) <= 64 AND length(e.value) <= 255
+"""
+
+
+def _sqlite_ddl(table: str, side: str) -> List[str]:
+    entries = SQLITE_ENTRIES.format(source="", id="new.id", attributes="new.attributes")
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {side}_ai AFTER INSERT ON {table} BEGIN
+            INSERT OR IGNORE INTO {side}(entity_id, key, value) {entries};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {side}_au AFTER UPDATE OF attributes ON {table} BEGIN
+            DELETE FROM {side} WHERE entity_id = old.id;
+            INSERT OR IGNORE INTO {side}(entity_id, key, value) {entries};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {side}_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM {side} WHERE entity_id = old.id;
+        END
+        """,
+    ]
+
+
+def _postgres_ddl(table: str, side: str) -> List[str]:
+    entries = POSTGRES_ENTRIES.format(source="", id="NEW.id", attributes="NEW.attributes")
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION {side}_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM {side} WHERE entity_id = OLD.id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO {side}(entity_id, key, value) {entries}
+                ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"DROP TRIGGER IF EXISTS {side}_sync ON {table}",
+        f"""
+        CREATE TRIGGER {side}_sync AFTER INSERT OR DELETE OR UPDATE OF attributes ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {side}_sync()
+        """,
+    ]
+
+
+TRIGGER_DDL: Dict[str, Dict[str, List[str]]] = {
+    "sqlite": {table: _sqlite_ddl(table, side) for table, side in INDEXED_TABLES.items()},
+    "postgresql": {table: _postgres_ddl(table, side) for table, side in INDEXED_TABLES.items()},
+}
+
+for model in (Product, SKU):
+    for dialect, statements in TRIGGER_DDL.items():
+        for statement in statements[model.__tablename__]:
+            event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+
+
+def install_attribute_index(conn: Connection) -> None:
+    """Create missing side tables and triggers, then index existing rows."""
+    dialect = conn.dialect.name
+    ProductAttribute.__table__.create(conn, checkfirst=True)
+    SKUAttribute.__table__.create(conn, checkfirst=True)
+    for statements in TRIGGER_DDL.get(dialect, {}).values():
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+
+    template = SQLITE_ENTRIES if dialect == "sqlite" else POSTGRES_ENTRIES
+    for table, side in INDEXED_TABLES.items():
+        entries = template.format(source=f"{table}, ", id=f"{table}.id", attributes=f"{table}.attributes")
+        conn.exec_driver_sql(f"DELETE FROM {side}")
+        conn.exec_driver_sql(f"INSERT INTO {side}(entity_id, key, value) {entries}")
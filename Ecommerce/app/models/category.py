@@ -2,8 +2,8 @@
 Database models for categories.
 """
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import String, Text, Integer, DateTime, Boolean, Index
+from typing import List, Optional, Dict, Any
+from sqlalchemy import String, Text, Integer, DateTime, Boolean, Index, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -19,10 +19,17 @@ class Category(Base):
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True, index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
+    # Flexible attributes (JSON)
+    attributes: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    
     # Hierarchy fields
     parent_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
     level: Mapped[int] = mapped_column(Integer, default=0, nullable=False, index=True)
-    path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True, index=True)  # Materialized path
+    path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Materialized path
+    
+    # Live children and products, kept by triggers (app.models.category_counters)
+    child_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    product_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     
     # Audit fields
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -30,12 +37,13 @@ class Category(Base):
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)  # For optimistic locking
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
     
-    # Relationships
-    products: Mapped[List["Product"]] = relationship("Product", back_populates="category", lazy="selectin")
+    # Relationships (lazy="raise": load explicitly through app.services.loader_profile)
+    products: Mapped[List["Product"]] = relationship("Product", back_populates="category", lazy="raise")
     
     # Indexes
     __table_args__ = (
-        Index('ix_categories_name_not_deleted', 'name', postgresql_where=~is_deleted),
+        Index('ix_categories_name_not_deleted', 'name', postgresql_where=~is_deleted, sqlite_where=is_deleted == False),
+        Index('ix_categories_keyset', 'is_deleted', 'name', 'id'),  # Keyset pagination
         Index('ix_categories_parent_level', 'parent_id', 'level'),
         Index('ix_categories_path', 'path'),
     )
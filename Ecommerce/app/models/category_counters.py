@@ -0,0 +1,126 @@
+"""
+Denormalized child and product counters on categories.
+
+``Category.child_count`` holds the number of live (not soft-deleted)
+children and ``Category.product_count`` the number of live products, so
+delete checks and category listings read them from the row instead of
+running ``COUNT(*)`` queries.
+
+The counters are maintained by database triggers on ``categories``
+(``parent_id``) and ``products`` (``category_id``): inserts, deletes, moves
+and soft deletes adjust the owning category by one in the writing
+transaction, whatever the write path (service, bulk upsert, raw SQL).
+Triggers are created with ``Base.metadata``; ``install_category_counters``
+adds the columns and triggers to databases created before they existed, and
+``recount_categories`` recomputes every counter in one set-based statement
+to repair drift.
+"""
+from typing import Dict, List, Tuple
+
+from sqlalchemy import DDL, and_, event, func, inspect, or_, select, update
+from sqlalchemy.engine import Connection
+
+from app.models.category import Category
+from app.models.product import Product
+
+# Owning table -> (column pointing at the category, counter it maintains)
+COUNTED_TABLES: Dict[str, Tuple[str, str]] = {
+    Category.__tablename__: ("parent_id", "child_count"),
+    Product.__tablename__: ("category_id", "product_count"),
+}
+
+COUNTER_COLUMNS_DDL = {
+    "child_count": "ALTER TABLE categories ADD COLUMN child_count INTEGER NOT NULL DEFAULT 0",
+    "product_count": "ALTER TABLE categories ADD COLUMN product_count INTEGER NOT NULL DEFAULT 0",
+}
+
+
+def _sqlite_ddl(table: str, column: str, counter: str) -> List[str]:
+    decrement = f"UPDATE categories SET {counter} = {counter} - 1 WHERE id = old.{column}"
+    increment = f"UPDATE categories SET {counter} = {counter} + 1 WHERE id = new.{column}"
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_{counter}_ai AFTER INSERT ON {table}
+        WHEN NOT new.is_deleted BEGIN
+            {increment};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_{counter}_au AFTER UPDATE OF {column}, is_deleted ON {table} BEGIN
+            {decrement} AND NOT old.is_deleted;
+            {increment} AND NOT new.is_deleted;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_{counter}_ad AFTER DELETE ON {table}
+        WHEN NOT old.is_deleted BEGIN
+            {decrement};
+        END
+        """,
+    ]
+
+
+def _postgres_ddl(table: str, column: str, counter: str) -> List[str]:
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION {table}_{counter}_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' AND NOT OLD.is_deleted THEN
+                UPDATE categories SET {counter} = {counter} - 1 WHERE id = OLD.{column};
+            END IF;
+            IF TG_OP <> 'DELETE' AND NOT NEW.is_deleted THEN
+                UPDATE categories SET {counter} = {counter} + 1 WHERE id = NEW.{column};
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"DROP TRIGGER IF EXISTS {table}_{counter}_sync ON {table}",
+        f"""
+        CREATE TRIGGER {table}_{counter}_sync AFTER INSERT OR DELETE OR UPDATE OF {column}, is_deleted ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {table}_{counter}_sync()
+        """,
+    ]
+
+
+TRIGGER_DDL: Dict[str, Dict[str, List[str]]] = {
+    "sqlite": {table: _sqlite_ddl(table, *spec) for table, spec in COUNTED_TABLES.items()},
+    "postgresql": {table: _postgres_ddl(table, *spec) for table, spec in COUNTED_TABLES.items()},
+}
+
+for model in (Category, Product):
+    for dialect, statements in TRIGGER_DDL.items():
+        for statement in statements[model.__tablename__]:
+            event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+
+
+def recount_categories(conn: Connection) -> int:
+    """Recompute every category's counters; returns how many were wrong."""
+    categories = Category.__table__
+    children = categories.alias("children")
+    products = Product.__table__
+    child_count = select(func.count()).where(
+        and_(children.c.parent_id == categories.c.id, children.c.is_deleted == False)
+    ).scalar_subquery()
+    product_count = select(func.count()).where(
+        and_(products.c.category_id == categories.c.id, products.c.is_deleted == False)
+    ).scalar_subquery()
+    result = conn.execute(
+        update(categories)
+        .where(or_(categories.c.child_count != child_count, categories.c.product_count != product_count))
+        # Counters are bookkeeping, not an edit: keep updated_at as it was
+        .values(child_count=child_count, product_count=product_count, updated_at=categories.c.updated_at)
+    )
+    return result.rowcount
+
+
+def install_category_counters(conn: Connection) -> int:
+    """Add missing counter columns and triggers, then recount; returns rows repaired."""
+    existing = {column["name"] for column in inspect(conn).get_columns("categories")}
+    for name, statement in COUNTER_COLUMNS_DDL.items():
+        if name not in existing:
+            conn.exec_driver_sql(statement)
+    for statements in TRIGGER_DDL.get(conn.dialect.name, {}).values():
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+    return recount_categories(conn)
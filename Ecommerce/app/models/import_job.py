@@ -0,0 +1,41 @@
+"""
+Database models for catalog import checkpoints.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, String, Text, Integer, DateTime, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+
+class ImportJob(Base):
+    """
+    Progress of one import file, identified by its entity and content checksum.
+
+    ``byte_offset`` and ``rows_processed`` are advanced in the same transaction
+    as each written chunk, so a rerun of the same file resumes after the last
+    committed chunk.
+    """
+    __tablename__ = "import_jobs"
+    
+    # Primary fields
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)
+    checksum: Mapped[str] = mapped_column(String(64), nullable=False)
+    source: Mapped[str] = mapped_column(String(255), nullable=False)
+    format: Mapped[str] = mapped_column(String(10), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="running", nullable=False)
+    
+    # Checkpoint
+    byte_offset: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rows_failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # Audit fields
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('entity', 'checksum', name='uq_import_jobs_entity_checksum'),
+    )
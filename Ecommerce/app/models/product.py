@@ -31,13 +31,16 @@ class Product(Base):
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)  # For optimistic locking
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
     
-    # Relationships
-    category: Mapped["Category"] = relationship("Category", back_populates="products", lazy="selectin")
-    skus: Mapped[List["SKU"]] = relationship("SKU", back_populates="product", lazy="selectin")
+    # Relationships (lazy="raise": load explicitly through app.services.loader_profile)
+    category: Mapped["Category"] = relationship("Category", back_populates="products", lazy="raise")
+    skus: Mapped[List["SKU"]] = relationship("SKU", back_populates="product", lazy="raise")
     
-    # Indexes
+    # Indexes (partial ones cover live rows; SQLite only uses a partial index
+    # when the query repeats its predicate, hence ``is_deleted = 0`` there)
     __table_args__ = (
-        Index('ix_products_name_not_deleted', 'name', postgresql_where=~is_deleted),
-        Index('ix_products_category_not_deleted', 'category_id', postgresql_where=~is_deleted),
+        Index('ix_products_name_not_deleted', 'name', postgresql_where=~is_deleted, sqlite_where=is_deleted == False),
+        Index('ix_products_category_not_deleted', 'category_id',
+              postgresql_where=~is_deleted, sqlite_where=is_deleted == False),
         Index('ix_products_created_at', 'created_at'),
+        Index('ix_products_keyset', 'is_deleted', 'created_at', 'id'),  # Keyset pagination
     )
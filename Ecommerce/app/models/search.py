@@ -0,0 +1,70 @@
+"""
+Full-text search structures attached to the products table.
+
+SQLite gets an external-content FTS5 table (``products_fts``) kept in sync by
+triggers; PostgreSQL gets a GIN index over the same ``to_tsvector``
+expression the search backend queries. Both are created and dropped together
+with ``products`` by ``Base.metadata``; ``install_search_schema`` adds them
+to databases created before they existed.
+"""
+from sqlalchemy import DDL, event
+from sqlalchemy.engine import Connection
+
+from app.models.product import Product
+
+# Expression shared by the PostgreSQL index and PostgresFTSBackend
+POSTGRES_DOCUMENT = "to_tsvector('simple', name || ' ' || coalesce(description, ''))"
+
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description, content='products', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+POSTGRES_FTS_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_products_search ON products USING gin ({POSTGRES_DOCUMENT})",
+]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(Product.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Product.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS products_fts").execute_if(dialect="sqlite")
+)
+for statement in POSTGRES_FTS_DDL:
+    event.listen(Product.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
+def install_search_schema(conn: Connection) -> None:
+    """Create missing full-text structures on an existing database."""
+    if conn.dialect.name == "sqlite":
+        for statement in SQLITE_FTS_DDL:
+            conn.exec_driver_sql(statement)
+        # Index rows that predate the triggers
+        conn.exec_driver_sql("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+    elif conn.dialect.name == "postgresql":
+        for statement in POSTGRES_FTS_DDL:
+            conn.exec_driver_sql(statement)
@@ -2,8 +2,10 @@
 Database models for SKUs.
 """
 from datetime import datetime
+from decimal import Decimal
 from typing import Dict, Any
-from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey, Index, JSON
+from sqlalchemy import String, Integer, Numeric, DateTime, Boolean, ForeignKey, Index, JSON, and_, inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -21,7 +23,11 @@ class SKU(Base):
     # Product relationship
     product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id"), nullable=False, index=True)
     
-    # Flexible attributes (JSON) - price, inventory, size, color, etc.
+    # Typed, indexed commercial fields
+    price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    inventory_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    
+    # Flexible attributes (JSON) - size, color, etc.
     attributes: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
     
     # Audit fields
@@ -30,12 +36,76 @@ class SKU(Base):
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)  # For optimistic locking
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
     
-    # Relationships
-    product: Mapped["Product"] = relationship("Product", back_populates="skus", lazy="selectin")
+    # Relationships (lazy="raise": load explicitly through app.services.loader_profile)
+    product: Mapped["Product"] = relationship("Product", back_populates="skus", lazy="raise")
     
     # Indexes
     __table_args__ = (
-        Index('ix_skus_code_not_deleted', 'sku_code', postgresql_where=~is_deleted),
-        Index('ix_skus_product_not_deleted', 'product_id', postgresql_where=~is_deleted),
+        # text_pattern_ops lets PostgreSQL serve LIKE 'prefix%' whatever the collation
+        Index('ix_skus_code_not_deleted', 'sku_code', postgresql_where=~is_deleted, sqlite_where=is_deleted == False,
+              postgresql_ops={'sku_code': 'text_pattern_ops'}),
+        Index('ix_skus_product_not_deleted', 'product_id',
+              postgresql_where=~is_deleted, sqlite_where=is_deleted == False),
         Index('ix_skus_created_at', 'created_at'),
+        # Price-ordered SKU search, per product and catalog-wide in stock
+        Index('ix_skus_product_price', 'product_id', 'price', 'id',
+              postgresql_where=~is_deleted, sqlite_where=is_deleted == False),
+        Index('ix_skus_price_in_stock', 'price', 'id',
+              postgresql_where=and_(~is_deleted, inventory_count > 0),
+              sqlite_where=and_(is_deleted == False, inventory_count > 0)),
     )
+
+
+# Databases created while price and inventory lived in ``attributes``
+SKU_COLUMNS_DDL = {
+    "price": "ALTER TABLE skus ADD COLUMN price NUMERIC(12, 2) NOT NULL DEFAULT 0",
+    "inventory_count": "ALTER TABLE skus ADD COLUMN inventory_count INTEGER NOT NULL DEFAULT 0",
+}
+
+SKU_BACKFILL_SQL = {
+    "sqlite": """
+        UPDATE skus SET
+            price = coalesce(CAST(json_extract(attributes, '$.price') AS NUMERIC), price),
+            inventory_count = coalesce(json_extract(attributes, '$.inventory_count'), inventory_count),
+            attributes = json_remove(attributes, '$.price', '$.inventory_count')
+        WHERE id > :low AND id <= :high
+          AND (json_type(attributes, '$.price') IS NOT NULL
+               OR json_type(attributes, '$.inventory_count') IS NOT NULL)
+    """,
+    "postgresql": """
+        UPDATE skus SET
+            price = coalesce((attributes ->> 'price')::numeric, price),
+            inventory_count = coalesce((attributes ->> 'inventory_count')::integer, inventory_count),
+            attributes = (attributes::jsonb - 'price' - 'inventory_count')::json
+        WHERE id > :low AND id <= :high
+          AND (attributes::jsonb ? 'price' OR attributes::jsonb ? 'inventory_count')
+    """,
+}
+
+
+def upgrade_sku_columns(conn: Connection, batch_size: int = 10000) -> int:
+    """
+    Add the typed ``price``/``inventory_count`` columns to an existing
+    ``skus`` table, move the values out of ``attributes`` in id-range
+    batches, create the SKU indexes and refresh statistics. Safe to re-run;
+    returns the number of rows backfilled.
+    """
+    existing = {column["name"] for column in inspect(conn).get_columns("skus")}
+    for name, statement in SKU_COLUMNS_DDL.items():
+        if name not in existing:
+            conn.exec_driver_sql(statement)
+
+    backfilled = 0
+    max_id = conn.exec_driver_sql("SELECT max(id) FROM skus").scalar() or 0
+    for low in range(0, max_id, batch_size):
+        result = conn.execute(
+            text(SKU_BACKFILL_SQL[conn.dialect.name]),
+            {"low": low, "high": low + batch_size}
+        )
+        backfilled += result.rowcount
+
+    for index in SKU.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    # Fresh statistics so the planner weighs the new indexes
+    conn.exec_driver_sql("ANALYZE skus")
+    return backfilled
@@ -0,0 +1,25 @@
+"""
+Schemas package initialization.
+"""
+from app.schemas.category import Category
+from app.schemas.product import (
+    Product,
+    ProductWithCategory,
+    ProductWithSKUs,
+    ProductWithAll,
+    ProductResponse,
+    ProductsResponse,
+)
+from app.schemas.sku import SKU, SKUWithProduct
+
+# Resolve forward references between product and SKU/category schemas
+_namespace = {"Category": Category, "Product": Product, "SKU": SKU}
+for _schema in (
+    ProductWithCategory,
+    ProductWithSKUs,
+    ProductWithAll,
+    SKUWithProduct,
+    ProductResponse,
+    ProductsResponse,
+):
+    _schema.model_rebuild(_types_namespace=_namespace)
@@ -0,0 +1,47 @@
+"""
+Pydantic schemas for bulk create/upsert requests.
+"""
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from app.schemas.product import ProductCreate
+from app.schemas.sku import SKUCreate
+
+
+class ProductBulkItem(ProductCreate):
+    """Product to create, or to update in place when ``id`` is given."""
+    id: Optional[int] = Field(None, ge=1, description="Existing product ID to update")
+
+
+class ProductBulkRequest(BaseModel):
+    """Schema for a bulk product upsert."""
+    items: List[ProductBulkItem] = Field(..., min_length=1, description="Products to create or update")
+
+
+class SKUBulkRequest(BaseModel):
+    """Schema for a bulk SKU upsert keyed on ``sku_code``."""
+    items: List[SKUCreate] = Field(..., min_length=1, description="SKUs to create or update")
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one bulk item, in request order."""
+    index: int = Field(..., description="Position of the item in the request")
+    status: Literal["created", "updated", "error"]
+    id: Optional[int] = Field(None, description="ID of the written row")
+    error: Optional[str] = Field(None, description="Why the item was rejected")
+
+
+class BulkResponse(BaseModel):
+    """Envelope response for bulk writes."""
+    status: str = "success"
+    data: List[BulkItemResult]
+    message: str = "Bulk write completed"
+    meta: Optional[dict] = None
+
+
+def bulk_response(results: List[BulkItemResult]) -> BulkResponse:
+    """Envelope bulk item results with per-status counts."""
+    counts = {"created": 0, "updated": 0, "error": 0}
+    for result in results:
+        counts[result.status] += 1
+    return BulkResponse(data=results, meta={"total": len(results), **counts})
@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.schemas.product import Product
+
 class CategoryBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=500)
@@ -21,6 +23,9 @@ class CategoryInDBBase(CategoryBase):
     id: int
     parent_id: Optional[int] = None
     path: str
+    level: int = 0
+    child_count: int = 0
+    product_count: int = 0
     created_at: datetime
     updated_at: datetime
     version: int = 1
@@ -31,14 +36,32 @@ class CategoryInDBBase(CategoryBase):
 class Category(CategoryInDBBase):
     pass
 
+class CategoryWithProducts(Category):
+    # Required so envelopes only pick this schema when products were expanded
+    products: List[Product]
+
+class CategoryTreeNode(BaseModel):
+    id: int
+    name: str
+    parent_id: Optional[int] = None
+    level: int
+    path: str
+    children: List["CategoryTreeNode"] = []
+
 class CategoryResponse(BaseModel):
     status: str = "success"
-    data: Category
+    data: Union[CategoryWithProducts, Category]
     message: str = "Category retrieved successfully"
     meta: Optional[dict] = None
 
 class CategoriesResponse(BaseModel):
     status: str = "success"
-    data: List[Category]
+    data: List[Union[CategoryWithProducts, Category]]
     message: str = "Categories retrieved successfully"
     meta: Optional[dict] = None
+
+class CategoryTreeResponse(BaseModel):
+    status: str = "success"
+    data: List[CategoryTreeNode]
+    message: str = "Category tree retrieved successfully"
+    meta: Optional[dict] = None
@@ -0,0 +1,52 @@
+"""
+Pydantic schemas for catalog imports.
+"""
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class ImportJob(BaseModel):
+    """Schema for an import checkpoint."""
+    id: int
+    entity: str
+    source: str
+    format: str
+    status: str
+    byte_offset: int
+    rows_processed: int
+    rows_failed: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ImportResult(BaseModel):
+    """Schema for the outcome of one import run."""
+    job_id: int
+    status: str
+    resumed_from: int = Field(0, description="Rows already processed by earlier runs")
+    rows_processed: int = Field(0, description="Rows processed in total, including earlier runs")
+    rows_written: int = Field(0, description="Rows created or updated by this run")
+    rows_failed: int = Field(0, description="Rows rejected by this run")
+    errors: List[str] = Field(default_factory=list, description="First rejected rows, with reasons")
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+
+
+class ImportResponse(BaseModel):
+    """Envelope response for an import run."""
+    status: str = "success"
+    data: ImportResult
+    message: str = "Import completed"
+    meta: Optional[dict] = None
+
+
+class ImportJobResponse(BaseModel):
+    """Envelope response for an import checkpoint."""
+    status: str = "success"
+    data: ImportJob
+    message: str = "Import job retrieved successfully"
+    meta: Optional[dict] = None
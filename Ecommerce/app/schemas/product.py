@@ -2,7 +2,7 @@
 Pydantic schemas for products.
 """
 from datetime import datetime
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Union, TYPE_CHECKING
 from pydantic import BaseModel, Field, ConfigDict
 
 if TYPE_CHECKING:
@@ -54,19 +54,24 @@ class ProductWithCategory(ProductInDBBase):
 
 class ProductWithSKUs(ProductInDBBase):
     """Schema for product response with SKUs."""
-    skus: List["SKU"] = []
+    skus: List["SKU"]
 
 
 class ProductWithAll(ProductInDBBase):
     """Schema for product response with category and SKUs."""
     category: "Category"
-    skus: List["SKU"] = []
+    skus: List["SKU"]
+
+
+# Expanded schemas come first; their relation fields are required so an
+# envelope only picks them when the relation was loaded.
+ProductData = Union[ProductWithAll, ProductWithCategory, ProductWithSKUs, Product]
 
 
 class ProductResponse(BaseModel):
     """Envelope response for product."""
     status: str = "success"
-    data: Product
+    data: ProductData
     message: str = "Product retrieved successfully"
     meta: Optional[dict] = None
 
@@ -74,11 +79,53 @@ class ProductResponse(BaseModel):
 class ProductsResponse(BaseModel):
     """Envelope response for products list."""
     status: str = "success"
-    data: List[Product]
+    data: List[ProductData]
+    message: str = "Products retrieved successfully"
+    meta: Optional[dict] = None
+
+
+class ProductSearchResult(Product):
+    """Schema for a ranked product search hit."""
+    score: Optional[float] = Field(None, description="Backend relevance score (higher ranks first)")
+    highlight: Optional[str] = Field(None, description="Matched text with <mark> tags")
+
+
+class ProductSearchResponse(BaseModel):
+    """Envelope response for product search results."""
+    status: str = "success"
+    data: List[ProductSearchResult]
     message: str = "Products retrieved successfully"
     meta: Optional[dict] = None
 
 
+class FacetValue(BaseModel):
+    """Number of matching products with one attribute value."""
+    value: str
+    count: int
+
+
+class CategoryFacet(BaseModel):
+    """Number of matching products in a category's subtree."""
+    id: int
+    name: str
+    count: int
+
+
+class ProductFacets(BaseModel):
+    """Facet counts for a product search."""
+    total: int = Field(..., description="Number of matching products")
+    categories: List[CategoryFacet] = Field(..., description="Counts per child category (or root)")
+    attributes: Dict[str, List[FacetValue]] = Field(..., description="Top value counts per facet key")
+
+
+class ProductFacetsResponse(BaseModel):
+    """Envelope response for product facet counts."""
+    status: str = "success"
+    data: ProductFacets
+    message: str = "Facets retrieved successfully"
+    meta: Optional[dict] = None
+
+
 class ProductSearchRequest(BaseModel):
     """Schema for product search request."""
     query: Optional[str] = Field(None, description="Search query for product name/description")
@@ -2,9 +2,9 @@
 Pydantic schemas for SKUs.
 """
 from datetime import datetime
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Literal, Dict, Any, TYPE_CHECKING
 from decimal import Decimal
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, condecimal, field_validator
 
 if TYPE_CHECKING:
     from app.schemas.product import Product
@@ -34,7 +34,7 @@ class SKUCreate(SKUBase):
 class SKUUpdate(BaseModel):
     """Schema for updating a SKU."""
     sku_code: Optional[str] = Field(None, min_length=1, max_length=50, description="Unique SKU code")
-    price: Optional[Decimal] = Field(None, ge=0, decimal_places=2, description="SKU price")
+    price: Optional[condecimal(ge=0, decimal_places=2)] = Field(None, description="SKU price")
     inventory_count: Optional[int] = Field(None, ge=0, description="Inventory count")
     attributes: Optional[Dict[str, Any]] = Field(None, description="Flexible SKU attributes")
     
@@ -75,6 +75,55 @@ class InventoryUpdate(BaseModel):
     adjustment_reason: Optional[str] = Field(None, max_length=255, description="Reason for adjustment")
 
 
+class InventoryAdjustment(BaseModel):
+    """Schema for a relative inventory adjustment."""
+    delta: int = Field(..., description="Units to add (negative to remove)")
+    adjustment_reason: Optional[str] = Field(None, max_length=255, description="Reason for adjustment")
+
+
+class InventoryBatchItem(BaseModel):
+    """One SKU's delta in a batch adjustment."""
+    sku_id: int = Field(..., description="SKU ID")
+    delta: int = Field(..., description="Units to add (negative to remove)")
+
+
+class InventoryBatchAdjustment(BaseModel):
+    """Schema for adjusting several SKUs at once."""
+    items: List[InventoryBatchItem] = Field(..., min_length=1, description="Deltas; repeated SKUs are summed")
+    atomic: bool = Field(True, description="Apply nothing unless every SKU can be adjusted")
+    adjustment_reason: Optional[str] = Field(None, max_length=255, description="Reason for adjustment")
+
+
+class InventoryLevel(BaseModel):
+    """Inventory count of a SKU after an adjustment."""
+    sku_id: int
+    inventory_count: int
+
+
+class InventoryAdjustResult(BaseModel):
+    """Outcome for one SKU of a batch adjustment."""
+    sku_id: int
+    status: Literal["adjusted", "error", "skipped"]
+    inventory_count: Optional[int] = Field(None, description="Count after the adjustment")
+    error: Optional[str] = Field(None, description="Why the SKU was not adjusted")
+
+
+class InventoryResponse(BaseModel):
+    """Envelope response for an inventory adjustment."""
+    status: str = "success"
+    data: InventoryLevel
+    message: str = "Inventory adjusted successfully"
+    meta: Optional[dict] = None
+
+
+class InventoryBatchResponse(BaseModel):
+    """Envelope response for a batch inventory adjustment."""
+    status: str = "success"
+    data: List[InventoryAdjustResult]
+    message: str = "Inventory adjusted successfully"
+    meta: Optional[dict] = None
+
+
 class SKUResponse(BaseModel):
     """Envelope response for SKU."""
     status: str = "success"
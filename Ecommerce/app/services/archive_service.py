@@ -0,0 +1,180 @@
+"""
+Soft-delete archival and restore.
+
+``archive`` moves rows soft-deleted more than ``ARCHIVE_RETENTION_DAYS``
+ago (by ``updated_at``, which the delete bumped) from the hot tables into
+the archive tables of ``app.models.archive``, ``ARCHIVE_BATCH_SIZE`` rows
+per transaction: SKUs first, then products without SKUs left, then
+categories without products or children left, so nothing in the hot tables
+points at an archived row. The newest row of each table is never archived,
+so SQLite cannot hand its id out again.
+
+``restore`` undeletes a row whether it is still in the hot table or
+already archived, provided its parent is live.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Type
+
+from sqlalchemy import and_, delete, exists, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import Base
+from app.models.archive import ARCHIVES
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+from app.services.category_hierarchy import category_hierarchy
+from app.services.search.facets import product_facets
+from app.services.search.trigram import product_search_index
+
+# Archived in this order; each model's parent (column, model) must be live to restore
+ARCHIVE_ORDER = (SKU, Product, Category)
+PARENTS = {
+    SKU: ("product_id", Product),
+    Product: ("category_id", Category),
+    Category: ("parent_id", Category),
+}
+
+
+class ArchiveService:
+    """Service class for moving soft-deleted rows to the archive and back."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.db = db
+        self.retention_days = settings.ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+        self.batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+
+    async def archive(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Archive every eligible row in batches; returns rows moved per table."""
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=self.retention_days)
+        moved: Dict[str, int] = {}
+        for model in ARCHIVE_ORDER:
+            total = 0
+            # Archiving children can free their parents, so run until a batch is empty
+            while True:
+                count = await self._archive_batch(model, cutoff, now)
+                if not count:
+                    break
+                total += count
+            moved[model.__tablename__] = total
+
+        if moved[Category.__tablename__]:
+            category_hierarchy.invalidate()
+            await cache.invalidate(prefixes=("categories:list:",))
+        return moved
+
+    async def restore(self, model: Type[Base], entity_id: int) -> Optional[Base]:
+        """
+        Undelete a category, product or SKU, moving it back from the archive
+        if needed. Returns None when the id is unknown.
+        """
+        table, archive = model.__table__, ARCHIVES[model]
+        row = (await self.db.execute(select(table.c.is_deleted).where(table.c.id == entity_id))).first()
+        if row is None:
+            archived = await self.db.execute(select(archive.c.id).where(archive.c.id == entity_id))
+            if archived.first() is None:
+                return None
+        elif not row.is_deleted:
+            raise ValueError(f"{model.__name__} is not deleted")
+
+        await self._check_parent(model, entity_id, table if row is not None else archive)
+        try:
+            if row is None:
+                columns = [column.name for column in table.columns]
+                await self.db.execute(insert(table).from_select(
+                    columns, select(*(archive.c[name] for name in columns)).where(archive.c.id == entity_id)
+                ))
+                await self.db.execute(delete(archive).where(archive.c.id == entity_id))
+            # Undeleting in the hot table lets the triggers count the row again
+            await self.db.execute(
+                update(table).where(table.c.id == entity_id)
+                .values(is_deleted=False, version=table.c.version + 1, updated_at=datetime.utcnow())
+            )
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError(f"{model.__name__} conflicts with a newer one (name or code taken)")
+
+        restored = (await self.db.execute(
+            select(model).where(model.id == entity_id).execution_options(populate_existing=True)
+        )).scalar_one()
+        await self._after_restore(restored)
+        return restored
+
+    # Private helper methods
+
+    async def _archive_batch(self, model: Type[Base], cutoff: datetime, now: datetime) -> int:
+        """Move one batch of eligible rows; returns how many moved."""
+        table, archive = model.__table__, ARCHIVES[model]
+        conditions = [
+            table.c.is_deleted == True,
+            table.c.updated_at < cutoff,
+            table.c.id < select(func.max(table.c.id)).scalar_subquery(),
+        ]
+        for column in self._references(model):
+            conditions.append(~exists().where(column == table.c.id))
+
+        ids = list((await self.db.execute(
+            select(table.c.id).where(and_(*conditions)).order_by(table.c.id).limit(self.batch_size)
+        )).scalars())
+        if not ids:
+            return 0
+
+        columns = [column.name for column in table.columns]
+        await self.db.execute(insert(archive).from_select(
+            [*columns, "archived_at"],
+            select(*table.columns, literal(now, archive.c.archived_at.type)).where(table.c.id.in_(ids))
+        ))
+        await self.db.execute(delete(table).where(table.c.id.in_(ids)))
+        await self.db.commit()
+        return len(ids)
+
+    @staticmethod
+    def _references(model: Type[Base]):
+        """Columns of hot rows that would point at an archived ``model`` row."""
+        # Aliased so a self-reference (category parents) correlates to the outer row
+        return [
+            child.__table__.alias().c[column]
+            for child, (column, parent) in PARENTS.items()
+            if parent is model
+        ]
+
+    async def _check_parent(self, model: Type[Base], entity_id: int, source) -> None:
+        """Refuse to restore under a deleted or archived parent."""
+        column, parent = PARENTS[model]
+        parent_id = (await self.db.execute(
+            select(source.c[column]).where(source.c.id == entity_id)
+        )).scalar()
+        if parent_id is None:
+            return
+        live = await self.db.execute(
+            select(parent.id).where(and_(parent.id == parent_id, parent.is_deleted == False))
+        )
+        if live.first() is None:
+            raise ValueError(f"Cannot restore {model.__name__.lower()} under a deleted {parent.__name__.lower()}")
+
+    async def _after_restore(self, restored: Base) -> None:
+        """Patch the in-process indexes and caches that skip deleted rows."""
+        if isinstance(restored, Category):
+            category_hierarchy.put(restored)
+            category_ids = [restored.id] if restored.parent_id is None else [restored.id, restored.parent_id]
+            await cache.invalidate(
+                keys=tuple(f"category:{category_id}" for category_id in category_ids),
+                prefixes=("categories:list:",)
+            )
+        elif isinstance(restored, Product):
+            # The category's cached row (and its ETag) carries product_count
+            product_search_index.put(restored)
+            product_facets.put(restored)
+            await cache.invalidate(keys=(f"category:{restored.category_id}",), prefixes=("categories:list:",))
+        elif isinstance(restored, SKU):
+            await product_facets.refresh_skus(self.db, [restored.product_id])
@@ -0,0 +1,106 @@
+"""
+Attribute filters over the attribute index.
+
+``attr.<key>=<value>`` query parameters select products or SKUs whose JSON
+attributes hold that scalar value. Each filter is answered from the
+``(key, value, entity_id)`` primary key of the matching side table in
+``app.models.attribute_index``, never by decoding documents.
+
+How the filters join the listing depends on how many rows they match. One
+round trip counts each filter's matches, capped at
+``ATTRIBUTE_FILTER_DRIVE_LIMIT``:
+
+- if the rarest filter is under the cap, its index entries drive the query
+  (``id IN (...)``) and the other filters are probed per candidate, rarest
+  first;
+- if every filter is common, the listing keeps walking its own sort index
+  and each row is probed with a correlated ``EXISTS`` per filter, so a page
+  is found after a few rows instead of materializing every match.
+"""
+from typing import Any, Dict, Iterable, List, Tuple, Type
+
+from sqlalchemy import and_, exists, false, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.attribute_index import ProductAttribute, SKUAttribute
+from app.models.product import Product
+from app.models.sku import SKU
+
+ATTRIBUTE_PREFIX = "attr."
+
+_SIDE_TABLES: Dict[Type[Base], Type[Base]] = {
+    Product: ProductAttribute,
+    SKU: SKUAttribute,
+}
+
+
+def parse_attribute_filters(params: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """``key -> value`` for the ``attr.<key>=<value>`` pairs among ``params``."""
+    filters: Dict[str, str] = {}
+    for name, value in params:
+        if not name.startswith(ATTRIBUTE_PREFIX):
+            continue
+        key = name[len(ATTRIBUTE_PREFIX):]
+        if not key:
+            raise ValueError("Attribute filters need a key, e.g. attr.color=red")
+        if key in filters:
+            raise ValueError(f"Attribute filter attr.{key} is given more than once")
+        filters[key] = value
+    if len(filters) > settings.ATTRIBUTE_FILTER_MAX_KEYS:
+        raise ValueError(f"At most {settings.ATTRIBUTE_FILTER_MAX_KEYS} attribute filters are allowed")
+    return filters
+
+
+class AttributeFilter:
+    """Turns attribute filters into indexed SQL conditions on one model."""
+
+    def __init__(self, db: AsyncSession, model: Type[Base]):
+        self.db = db
+        self.model = model
+        self.side = _SIDE_TABLES[model]
+
+    async def condition(self, filters: Dict[str, str], entity: Any = None) -> ColumnElement:
+        """
+        Condition on ``entity`` rows (default the model) matching every filter,
+        one query to plan it.
+        """
+        entity_id = (self.model if entity is None else entity).id
+        counts = await self._match_counts(filters)
+        ordered = [item for _, item in sorted(zip(counts, filters.items()), key=lambda pair: pair[0])]
+        if min(counts) == 0:
+            return false()
+
+        if min(counts) < settings.ATTRIBUTE_FILTER_DRIVE_LIMIT:
+            (key, value), rest = ordered[0], ordered[1:]
+            driver = aliased(self.side)
+            candidates = select(driver.entity_id).where(and_(driver.key == key, driver.value == value))
+            for key, value in rest:
+                candidates = candidates.where(self._has(driver.entity_id, key, value))
+            return entity_id.in_(candidates)
+
+        return and_(*(self._has(entity_id, key, value) for key, value in ordered))
+
+    # Private helper methods
+
+    def _has(self, entity_id: ColumnElement, key: str, value: str) -> ColumnElement:
+        probe = aliased(self.side)
+        return exists().where(and_(probe.entity_id == entity_id, probe.key == key, probe.value == value))
+
+    async def _match_counts(self, filters: Dict[str, str]) -> List[int]:
+        """Index entries per filter, counted no further than the drive limit."""
+        side = self.side
+        counts = []
+        for key, value in filters.items():
+            matches = (
+                select(literal(1))
+                .where(and_(side.key == key, side.value == value))
+                .limit(settings.ATTRIBUTE_FILTER_DRIVE_LIMIT)
+                .subquery()
+            )
+            counts.append(select(func.count()).select_from(matches).scalar_subquery())
+        result = await self.db.execute(select(*counts))
+        return list(result.one())
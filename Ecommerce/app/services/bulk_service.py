@@ -0,0 +1,253 @@
+"""
+Bulk create/upsert service for products and SKUs.
+
+A batch is validated in one pass: foreign keys and existing keys are looked
+up with one ``IN`` query per chunk instead of per item, and rows are written
+``BULK_CHUNK_SIZE`` at a time: multi-row ``INSERT`` (``ON CONFLICT DO
+UPDATE`` for SKU codes) and, for product updates, one ``UPDATE`` with a
+``CASE`` per column. Invalid items are reported individually and never
+block the rest of the batch; the valid items are committed together.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, case, insert, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+from app.schemas.bulk import BulkItemResult, ProductBulkItem
+from app.schemas.sku import SKUCreate
+from app.services.search.facets import product_facets
+from app.services.search.trigram import product_search_index
+
+
+def _chunks(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class BulkService:
+    """Service class for bulk product and SKU writes."""
+
+    def __init__(self, db: AsyncSession, chunk_size: Optional[int] = None):
+        self.db = db
+        self.chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+
+    async def upsert_products(self, items: List[ProductBulkItem]) -> List[BulkItemResult]:
+        """
+        Create products without an ``id`` and update those with one.
+
+        Items fail individually when their category is missing or deleted, or
+        when the product to update is missing, deleted or repeated.
+        """
+        self._check_batch_size(items)
+        results: List[Optional[BulkItemResult]] = [None] * len(items)
+
+        live_categories = await self._live_ids(Category, {item.category_id for item in items})
+        live_products = await self._live_ids(Product, {item.id for item in items if item.id is not None})
+
+        creates: List[Tuple[int, ProductBulkItem]] = []
+        updates: List[Tuple[int, ProductBulkItem]] = []
+        seen: Set[int] = set()
+        for index, item in enumerate(items):
+            if item.category_id not in live_categories:
+                results[index] = self._error(index, "Category not found")
+            elif item.id is None:
+                creates.append((index, item))
+            elif item.id not in live_products:
+                results[index] = self._error(index, "Product not found")
+            elif item.id in seen:
+                results[index] = self._error(index, "Duplicate product id in batch")
+            else:
+                seen.add(item.id)
+                updates.append((index, item))
+
+        now = datetime.utcnow()
+        table = Product.__table__
+        written: List[Dict[str, Any]] = []
+
+        for chunk in _chunks(creates, self.chunk_size):
+            rows = [self._product_row(item, now) for _, item in chunk]
+            result = await self.db.execute(insert(table).values(rows).returning(table.c.id))
+            # Ids are assigned in VALUES order; RETURNING order is not guaranteed
+            for (index, _), row, product_id in zip(chunk, rows, sorted(result.scalars())):
+                results[index] = BulkItemResult(index=index, status="created", id=product_id)
+                written.append({**row, "id": product_id})
+
+        for chunk in _chunks(updates, self.chunk_size):
+            # An UPDATE, not an upsert: rows hard-deleted or archived since
+            # validation must not come back
+            values = {
+                column: self._per_row(table.c[column], {item.id: getattr(item, column) for _, item in chunk})
+                for column in ("name", "description", "category_id", "attributes")
+            }
+            statement = (
+                update(table)
+                .where(and_(table.c.id.in_([item.id for _, item in chunk]), table.c.is_deleted == False))
+                .values(**values, updated_at=now, version=table.c.version + 1)
+                .returning(*table.columns)
+            )
+            # The stored rows, created_at included, patch the search indexes
+            updated = {row["id"]: dict(row) for row in (await self.db.execute(statement)).mappings()}
+            for index, item in chunk:
+                if item.id in updated:
+                    results[index] = BulkItemResult(index=index, status="updated", id=item.id)
+                    written.append(updated[item.id])
+                else:
+                    # Deleted after validation
+                    results[index] = self._error(index, "Product not found")
+
+        await self.db.commit()
+
+        if written:
+            # Category product counts moved with the products
+            await cache.invalidate(prefixes=("category:", "categories:list:"))
+        for row in written:
+            product = Product(**row)
+            product_search_index.put(product)
+            product_facets.put(product)
+        return results
+
+    async def upsert_skus(self, items: List[SKUCreate]) -> List[BulkItemResult]:
+        """
+        Create or update SKUs keyed on ``sku_code``.
+
+        Items fail individually when their product is missing or deleted, when
+        the code is repeated in the batch, or when it already belongs to a
+        deleted SKU or to another product.
+        """
+        self._check_batch_size(items)
+        results: List[Optional[BulkItemResult]] = [None] * len(items)
+
+        live_products = await self._live_ids(Product, {item.product_id for item in items})
+        existing = await self._existing_skus({item.sku_code for item in items})
+
+        valid: List[Tuple[int, SKUCreate]] = []
+        seen: Set[str] = set()
+        for index, item in enumerate(items):
+            current = existing.get(item.sku_code)
+            if item.product_id not in live_products:
+                results[index] = self._error(index, "Product not found")
+            elif item.sku_code in seen:
+                results[index] = self._error(index, "Duplicate SKU code in batch")
+            elif current is not None and current[2]:
+                results[index] = self._error(index, "SKU code belongs to a deleted SKU")
+            elif current is not None and current[1] != item.product_id:
+                results[index] = self._error(index, "SKU code already used by another product")
+            else:
+                seen.add(item.sku_code)
+                valid.append((index, item))
+
+        now = datetime.utcnow()
+        table = SKU.__table__
+        for chunk in _chunks(valid, self.chunk_size):
+            statement = self._insert(table).values([self._sku_row(item, now) for _, item in chunk])
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.sku_code],
+                set_={
+                    "price": statement.excluded.price,
+                    "inventory_count": statement.excluded.inventory_count,
+                    "attributes": statement.excluded.attributes,
+                    "updated_at": statement.excluded.updated_at,
+                    "version": table.c.version + 1,
+                },
+                # Never take over a code claimed by another product meanwhile
+                where=and_(
+                    table.c.product_id == statement.excluded.product_id,
+                    table.c.is_deleted == False
+                )
+            ).returning(table.c.id, table.c.sku_code)
+            written = dict((code, sku_id) for sku_id, code in (await self.db.execute(statement)).all())
+            for index, item in chunk:
+                sku_id = written.get(item.sku_code)
+                if sku_id is None:
+                    results[index] = self._error(index, "SKU code already used by another product")
+                else:
+                    status = "updated" if item.sku_code in existing else "created"
+                    results[index] = BulkItemResult(index=index, status=status, id=sku_id)
+
+        await self.db.commit()
+
+        await product_facets.refresh_skus(self.db, {item.product_id for _, item in valid})
+        return results
+
+    # Private helper methods
+
+    def _check_batch_size(self, items: Sequence) -> None:
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise ValueError(f"Bulk requests are limited to {settings.BULK_MAX_ITEMS} items")
+
+    def _insert(self, table):
+        """Dialect ``insert`` supporting ``on_conflict_do_update``."""
+        dialect = self.db.bind.dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(table)
+        if dialect == "sqlite":
+            return sqlite.insert(table)
+        raise ValueError(f"Bulk upserts are not supported on {dialect}")
+
+    @staticmethod
+    def _per_row(column, values: Dict[int, Any]):
+        """``CASE`` over the row id giving ``column`` its value per updated row."""
+        return case(
+            {row_id: literal(value, column.type) for row_id, value in values.items()},
+            value=column.table.c.id
+        )
+
+    async def _live_ids(self, model, ids: Iterable[int]) -> Set[int]:
+        """The subset of ``ids`` naming rows that exist and are not deleted."""
+        found: Set[int] = set()
+        for chunk in _chunks(list(ids), self.chunk_size):
+            result = await self.db.execute(
+                select(model.id).where(and_(model.id.in_(chunk), model.is_deleted == False))
+            )
+            found.update(result.scalars())
+        return found
+
+    async def _existing_skus(self, codes: Iterable[str]) -> Dict[str, Tuple[int, int, bool]]:
+        """``sku_code -> (id, product_id, is_deleted)`` for codes already taken."""
+        existing: Dict[str, Tuple[int, int, bool]] = {}
+        for chunk in _chunks(list(codes), self.chunk_size):
+            result = await self.db.execute(
+                select(SKU.sku_code, SKU.id, SKU.product_id, SKU.is_deleted)
+                .where(SKU.sku_code.in_(chunk))
+            )
+            for code, sku_id, product_id, is_deleted in result.all():
+                existing[code] = (sku_id, product_id, is_deleted)
+        return existing
+
+    @staticmethod
+    def _product_row(item: ProductBulkItem, now: datetime) -> Dict[str, Any]:
+        return {
+            "name": item.name,
+            "description": item.description,
+            "category_id": item.category_id,
+            "attributes": item.attributes,
+            "created_at": now,
+            "updated_at": now,
+            "version": 1,
+            "is_deleted": False,
+        }
+
+    @staticmethod
+    def _sku_row(item: SKUCreate, now: datetime) -> Dict[str, Any]:
+        return {
+            "sku_code": item.sku_code,
+            "product_id": item.product_id,
+            "price": item.price,
+            "inventory_count": item.inventory_count,
+            "attributes": item.attributes or {},
+            "created_at": now,
+            "updated_at": now,
+            "version": 1,
+            "is_deleted": False,
+        }
+
+    @staticmethod
+    def _error(index: int, message: str) -> BulkItemResult:
+        return BulkItemResult(index=index, status="error", error=message)
@@ -0,0 +1,249 @@
+"""
+In-process snapshot of the category hierarchy.
+
+Category trees are small and read on almost every category write, so the
+service answers parent, ancestor, cycle and children-count questions from an
+immutable snapshot instead of the database. The snapshot stores the tree as
+compact slot-indexed arrays (parent slot, level, path, name) plus a children
+adjacency index, so every lookup walks at most ``depth`` slots.
+
+Writes made through ``CategoryService`` patch the snapshot (create, delete) or
+invalidate it (rename, move). Invalidation bumps a generation counter so a
+rebuild that started before the write is discarded instead of published.
+Writes from other processes are picked up once the snapshot is older than
+``CATEGORY_HIERARCHY_TTL_SECONDS``.
+"""
+import asyncio
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.category import Category
+
+
+class HierarchyNode(NamedTuple):
+    """One category as seen by the hierarchy snapshot."""
+    id: int
+    parent_id: Optional[int]
+    level: int
+    path: str
+    name: str
+    is_deleted: bool
+
+
+class HierarchySnapshot:
+    """Immutable id -> parent/level/path arrays with a children index."""
+
+    __slots__ = ("_slots", "_ids", "_parents", "_levels", "_deleted", "_paths", "_names", "_children")
+
+    def __init__(self, nodes: Iterable[HierarchyNode]):
+        nodes = sorted(nodes, key=lambda node: node.id)
+        self._slots: Dict[int, int] = {node.id: slot for slot, node in enumerate(nodes)}
+        self._ids = array("q", (node.id for node in nodes))
+        self._parents = array("q", (self._slots.get(node.parent_id, -1) for node in nodes))
+        self._levels = array("i", (node.level for node in nodes))
+        self._deleted = array("b", (node.is_deleted for node in nodes))
+        self._paths: Tuple[str, ...] = tuple(node.path for node in nodes)
+        self._names: Tuple[str, ...] = tuple(node.name for node in nodes)
+
+        # Children index only links live (non-deleted) categories
+        children: List[List[int]] = [[] for _ in nodes]
+        for slot, parent in enumerate(self._parents):
+            if parent >= 0 and not self._deleted[slot]:
+                children[parent].append(slot)
+        self._children: Tuple[Tuple[int, ...], ...] = tuple(tuple(c) for c in children)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, category_id: int) -> bool:
+        return category_id in self._slots
+
+    def get(self, category_id: int) -> Optional[HierarchyNode]:
+        """Node for a category id, deleted or not."""
+        slot = self._slots.get(category_id)
+        return None if slot is None else self._node(slot)
+
+    def nodes(self) -> List[HierarchyNode]:
+        """All nodes, ordered by id."""
+        return [self._node(slot) for slot in range(len(self._ids))]
+
+    def ancestors(self, category_id: int) -> List[int]:
+        """Ancestor ids, nearest parent first."""
+        slot = self._slots.get(category_id)
+        ancestors = []
+        if slot is None:
+            return ancestors
+        parent = self._parents[slot]
+        # Bounded by the snapshot size in case stored data contains a loop
+        while parent >= 0 and len(ancestors) < len(self._ids):
+            ancestors.append(self._ids[parent])
+            parent = self._parents[parent]
+        return ancestors
+
+    def is_descendant(self, category_id: int, ancestor_id: int) -> bool:
+        """Whether ``category_id`` sits somewhere below ``ancestor_id``."""
+        return ancestor_id in self.ancestors(category_id)
+
+    def would_create_cycle(self, category_id: int, new_parent_id: int) -> bool:
+        """Whether moving ``category_id`` under ``new_parent_id`` makes a loop."""
+        return new_parent_id == category_id or self.is_descendant(new_parent_id, category_id)
+
+    def children(self, category_id: int) -> List[int]:
+        """Ids of live direct children."""
+        slot = self._slots.get(category_id)
+        return [] if slot is None else [self._ids[child] for child in self._children[slot]]
+
+    def children_count(self, category_id: int) -> int:
+        """Number of live direct children."""
+        slot = self._slots.get(category_id)
+        return 0 if slot is None else len(self._children[slot])
+
+    def has_children(self, category_id: int) -> bool:
+        """Whether any category, deleted or not, has ``category_id`` as parent."""
+        slot = self._slots.get(category_id)
+        return slot is not None and slot in self._parents
+
+    def descendants(self, category_id: int) -> List[int]:
+        """Ids of all live descendants, breadth first."""
+        slot = self._slots.get(category_id)
+        if slot is None:
+            return []
+        result = []
+        frontier = list(self._children[slot])
+        while frontier:
+            result.extend(self._ids[child] for child in frontier)
+            frontier = [grandchild for child in frontier for grandchild in self._children[child]]
+        return result
+
+    def tree(self, root_id: Optional[int] = None, max_depth: int = 3) -> List[Dict[str, Any]]:
+        """
+        Nested tree of live categories.
+
+        Starts at ``root_id`` (or every live root) and includes at most
+        ``max_depth`` levels.
+        """
+        if root_id is None:
+            roots = [
+                slot for slot in range(len(self._ids))
+                if self._parents[slot] < 0 and not self._deleted[slot]
+            ]
+        else:
+            slot = self._slots.get(root_id)
+            roots = [] if slot is None or self._deleted[slot] else [slot]
+        roots.sort(key=lambda slot: self._names[slot])
+        return [self._subtree(slot, max_depth) for slot in roots]
+
+    def with_node(self, node: HierarchyNode) -> "HierarchySnapshot":
+        """New snapshot with ``node`` added or replaced."""
+        nodes = [existing for existing in self.nodes() if existing.id != node.id]
+        nodes.append(node)
+        return HierarchySnapshot(nodes)
+
+    def without_node(self, category_id: int) -> "HierarchySnapshot":
+        """New snapshot with a category removed."""
+        return HierarchySnapshot(node for node in self.nodes() if node.id != category_id)
+
+    def _node(self, slot: int) -> HierarchyNode:
+        parent = self._parents[slot]
+        return HierarchyNode(
+            id=self._ids[slot],
+            parent_id=self._ids[parent] if parent >= 0 else None,
+            level=self._levels[slot],
+            path=self._paths[slot],
+            name=self._names[slot],
+            is_deleted=bool(self._deleted[slot]),
+        )
+
+    def _subtree(self, slot: int, depth: int) -> Dict[str, Any]:
+        parent = self._parents[slot]
+        children = sorted(self._children[slot], key=lambda child: self._names[child]) if depth > 1 else []
+        return {
+            "id": self._ids[slot],
+            "name": self._names[slot],
+            "parent_id": self._ids[parent] if parent >= 0 else None,
+            "level": self._levels[slot],
+            "path": self._paths[slot],
+            "children": [self._subtree(child, depth - 1) for child in children],
+        }
+
+
+class CategoryHierarchy:
+    """Holder of the current snapshot with version-based invalidation."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._snapshot: Optional[HierarchySnapshot] = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> HierarchySnapshot:
+        """Current snapshot, rebuilt from the database when missing or stale."""
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._fresh()
+            if snapshot is not None:
+                return snapshot
+
+            version = self.version
+            result = await db.execute(
+                select(
+                    Category.id,
+                    Category.parent_id,
+                    Category.level,
+                    Category.path,
+                    Category.name,
+                    Category.is_deleted,
+                )
+            )
+            snapshot = HierarchySnapshot(HierarchyNode(*row) for row in result.all())
+
+            # A write during the rebuild makes this snapshot outdated already
+            if version == self.version:
+                self._publish(snapshot)
+            return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next read rebuilds it."""
+        self.version += 1
+        self._snapshot = None
+
+    def put(self, category: Category) -> None:
+        """Patch a created or soft-deleted category into the snapshot."""
+        self.version += 1
+        if self._snapshot is not None:
+            self._publish(self._snapshot.with_node(HierarchyNode(
+                id=category.id,
+                parent_id=category.parent_id,
+                level=category.level,
+                path=category.path,
+                name=category.name,
+                is_deleted=category.is_deleted,
+            )), keep_age=True)
+
+    def remove(self, category_id: int) -> None:
+        """Patch a hard-deleted category out of the snapshot."""
+        self.version += 1
+        if self._snapshot is not None:
+            self._publish(self._snapshot.without_node(category_id), keep_age=True)
+
+    def _fresh(self) -> Optional[HierarchySnapshot]:
+        if self._snapshot is None or time.monotonic() - self._built_at > self.ttl_seconds:
+            return None
+        return self._snapshot
+
+    def _publish(self, snapshot: HierarchySnapshot, keep_age: bool = False) -> None:
+        self._snapshot = snapshot
+        if not keep_age:
+            self._built_at = time.monotonic()
+
+
+category_hierarchy = CategoryHierarchy(ttl_seconds=settings.CATEGORY_HIERARCHY_TTL_SECONDS)
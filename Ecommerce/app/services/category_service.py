@@ -1,13 +1,26 @@
 """
 Category service for business logic operations.
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import FrozenSet, Iterable, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_, or_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, delete, and_, exists, func, tuple_, literal
+from sqlalchemy.orm import QueryableAttribute, aliased
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
 
+from app.core.cache import cache, row_of
+from app.models.archive import with_archive
 from app.models.category import Category
+from app.schemas.bulk import BulkItemResult
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services.category_hierarchy import HierarchyNode, HierarchySnapshot, category_hierarchy
+from app.services.loader_profile import CATEGORY_PROFILE
+from app.services.pagination import decode_cursor, encode_cursor
+
+DUPLICATE_NAME = "Category with this name already exists"
 
 
 class CategoryService:
@@ -17,62 +30,142 @@ class CategoryService:
         self.db = db
     
     async def create(self, category_data: CategoryCreate) -> Category:
-        """Create a new category."""
-        # Validate parent exists if provided
-        if category_data.parent_id:
-            parent = await self._get_by_id(category_data.parent_id)
-            if not parent:
-                raise ValueError("Parent category not found")
-            if parent.is_deleted:
-                raise ValueError("Cannot create category under deleted parent")
-        
-        # Check for duplicate name at same level
-        existing = await self._get_by_name_and_parent(
-            category_data.name, 
-            category_data.parent_id
-        )
-        if existing:
-            raise ValueError("Category with this name already exists at this level")
-        
-        # Create category
-        category = Category(
-            name=category_data.name,
-            description=category_data.description,
-            parent_id=category_data.parent_id,
-            attributes=category_data.attributes or {}
-        )
+        """
+        Create a new category with one ``INSERT ... RETURNING``.
+        
+        Path and depth are computed from the parent row inside the statement,
+        which inserts nothing unless the parent exists and is live; the unique
+        name is enforced by the database. A refusal costs one more round trip
+        to report why.
+        """
+        try:
+            category = await self._insert_one(category_data)
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError(DUPLICATE_NAME)
         
-        # Set materialized path
-        if category_data.parent_id:
-            parent = await self._get_by_id(category_data.parent_id)
-            category.path = f"{parent.path}.{category_data.name}"
-        else:
-            category.path = category_data.name
-        
-        self.db.add(category)
         await self.db.commit()
-        await self.db.refresh(category)
-        
+        await self._after_create([category])
         return category
     
-    async def get_by_id(self, category_id: int) -> Optional[Category]:
-        """Get category by ID."""
+    async def create_many(self, items: List[CategoryCreate]) -> List[BulkItemResult]:
+        """
+        Create categories in order, as ``create`` does, in one transaction.
+        
+        Later items may name earlier ones as their parent. Items fail
+        individually (taken name, missing or deleted parent) without blocking
+        the rest; the written ones commit together with whatever else the
+        session has pending.
+        """
+        # Without ON CONFLICT a taken name raises, so each item gets a savepoint
+        guarded = self.db.bind.dialect.name not in ("postgresql", "sqlite")
+        results: List[BulkItemResult] = []
+        created: List[Category] = []
+        for index, item in enumerate(items):
+            try:
+                if guarded:
+                    async with self.db.begin_nested():
+                        category = await self._insert_one(item)
+                else:
+                    category = await self._insert_one(item)
+            except IntegrityError:
+                results.append(BulkItemResult(index=index, status="error", error=DUPLICATE_NAME))
+            except ValueError as e:
+                results.append(BulkItemResult(index=index, status="error", error=str(e)))
+            else:
+                created.append(category)
+                results.append(BulkItemResult(index=index, status="created", id=category.id))
+        
+        await self.db.commit()
+        await self._after_create(created)
+        return results
+    
+    async def get_by_id(
+        self,
+        category_id: int,
+        expand: FrozenSet[str] = frozenset()
+    ) -> Optional[Category]:
+        """
+        Get category by ID, loading only the expanded relations.
+        
+        Unexpanded reads go through the cache and may return a transient
+        (session-less) instance built from the cached row.
+        """
+        cache_key = f"category:{category_id}"
+        if not expand:
+            row = await cache.get(cache_key)
+            if row is not None:
+                return Category(**row)
+        
         query = select(Category).where(
             and_(Category.id == category_id, Category.is_deleted == False)
-        )
+        ).options(*CATEGORY_PROFILE.options(expand))
         
         result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        category = result.scalar_one_or_none()
+        if category and not expand:
+            await cache.set(cache_key, row_of(category))
+        return category
+    
+    async def get_many(
+        self,
+        category_ids: List[int],
+        expand: FrozenSet[str] = frozenset()
+    ) -> List[Category]:
+        """
+        Get live categories by ID in the order given, skipping unknown ones.
+        
+        Unexpanded reads take what they can from the cache and fetch the rest
+        with one ``IN`` query, caching them in turn.
+        """
+        found = {}
+        if not expand:
+            for category_id in category_ids:
+                row = await cache.get(f"category:{category_id}")
+                if row is not None:
+                    found[category_id] = Category(**row)
+        
+        missing = [category_id for category_id in category_ids if category_id not in found]
+        if missing:
+            result = await self.db.execute(
+                select(Category).where(
+                    and_(Category.id.in_(missing), Category.is_deleted == False)
+                ).options(*CATEGORY_PROFILE.options(expand))
+            )
+            for category in result.scalars().all():
+                found[category.id] = category
+                if not expand:
+                    await cache.set(f"category:{category.id}", row_of(category))
+        return [found[category_id] for category_id in category_ids if category_id in found]
     
     async def get_all(
         self, 
         parent_id: Optional[int] = None,
         include_deleted: bool = False,
         page: int = 1,
-        size: int = 20
+        size: int = 20,
+        expand: FrozenSet[str] = frozenset(),
+        cursor: Optional[str] = None
     ) -> List[Category]:
-        """Get all categories with optional filtering."""
-        query = select(Category)
+        """
+        Get all categories with optional filtering.
+        
+        When ``cursor`` is given, rows after the cursor's ``(name, id)`` key are
+        returned and ``page`` is ignored. Unexpanded pages are cached per
+        parent, so writes only invalidate the listings they can affect.
+        """
+        cache_key = (
+            f"categories:list:{'all' if parent_id is None else parent_id}:"
+            f"{include_deleted}:{page}:{size}:{cursor}"
+        )
+        if not expand:
+            rows = await cache.get(cache_key)
+            if rows is not None:
+                return [Category(**row) for row in rows]
+        
+        # Deleted rows may have been moved to the archive table
+        entity = with_archive(Category) if include_deleted else Category
+        query = select(entity).options(*CATEGORY_PROFILE.options(expand, entity))
         
         # Apply filters
         conditions = []
@@ -80,245 +173,359 @@ class CategoryService:
             conditions.append(Category.is_deleted == False)
         
         if parent_id is not None:
-            conditions.append(Category.parent_id == parent_id)
+            conditions.append(entity.parent_id == parent_id)
+        
+        if cursor is not None:
+            name, last_id = decode_cursor(cursor, (str, int))
+            conditions.append(tuple_(entity.name, entity.id) > (name, last_id))
         
         if conditions:
             query = query.where(and_(*conditions))
         
         # Apply pagination
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
+        if cursor is None:
+            query = query.offset((page - 1) * size)
+        query = query.limit(size)
         
-        # Order by name
-        query = query.order_by(Category.name)
+        # Order by name, with id as tie-breaker for a stable keyset
+        query = query.order_by(entity.name, entity.id)
         
         result = await self.db.execute(query)
-        return list(result.scalars().all())
-    
-    # async def get_tree method removed for simplification
+        categories = list(result.scalars().all())
+        if not expand:
+            await cache.set(cache_key, [row_of(category) for category in categories])
+        return categories
     
-    async def update(self, category_id: int, category_data: CategoryUpdate) -> Optional[Category]:
-        """Update category."""
-        category = await self._get_by_id(category_id)
-        if not category:
+    @staticmethod
+    def next_cursor(categories: List[Category], size: int) -> Optional[str]:
+        """Cursor for the page after ``categories``, or None on the last page."""
+        if len(categories) < size:
             return None
-        
-        # Check optimistic locking if version provided
-        if category_data.version is not None and category.version != category_data.version:
-            raise ValueError("Category has been modified by another user")
-        
-        # Validate parent change
-        if category_data.parent_id is not None and category_data.parent_id != category.parent_id:
-            if category_data.parent_id == category_id:
-                raise ValueError("Category cannot be its own parent")
-            
-            # Check for circular reference
-            if await self._would_create_cycle(category_id, category_data.parent_id):
-                raise ValueError("Moving category would create a circular reference")
-            
-            # Validate parent exists
-            if category_data.parent_id:
-                parent = await self._get_by_id(category_data.parent_id)
-                if not parent:
-                    raise ValueError("Parent category not found")
-                if parent.is_deleted:
-                    raise ValueError("Cannot move category under deleted parent")
-        
-        # Check for duplicate name at same level
-        if category_data.name and category_data.name != category.name:
-            existing = await self._get_by_name_and_parent(
-                category_data.name,
-                category_data.parent_id if category_data.parent_id is not None else category.parent_id
-            )
-            if existing and existing.id != category_id:
-                raise ValueError("Category with this name already exists at this level")
-        
-        # Update fields
-        update_data = {}
-        if category_data.name is not None:
-            update_data["name"] = category_data.name
-        if category_data.description is not None:
-            update_data["description"] = category_data.description
-        if category_data.parent_id is not None:
-            update_data["parent_id"] = category_data.parent_id
-        if category_data.attributes is not None:
-            update_data["attributes"] = category_data.attributes
-        
-        # Update version for optimistic locking
-        update_data["version"] = category.version + 1
-        
-        if update_data:
-            stmt = update(Category).where(Category.id == category_id).values(**update_data)
-            await self.db.execute(stmt)
-            
-            # Update materialized path if name or parent changed
-            if "name" in update_data or "parent_id" in update_data:
-                await self._update_materialized_path(category_id)
-            
-            await self.db.commit()
+        last = categories[-1]
+        return encode_cursor(last.name, last.id)
+    
+    async def get_tree(self, root_id: Optional[int] = None, max_depth: int = 3) -> List[dict]:
+        """Get category hierarchy tree from the in-process snapshot."""
+        hierarchy = await category_hierarchy.get(self.db)
+        if root_id is not None:
+            root = hierarchy.get(root_id)
+            if not root or root.is_deleted:
+                raise ValueError("Root category not found")
+        return hierarchy.tree(root_id=root_id, max_depth=max_depth)
+    
+    async def update(
+        self,
+        category_id: int,
+        category_data: CategoryUpdate,
+        partial: bool = False
+    ) -> Optional[Category]:
+        """
+        Update category with one compare-and-swap statement.
+        
+        By default (PUT) fields left null keep their value; with ``partial``
+        (PATCH) exactly the fields sent are changed, so a null ``parent_id``
+        moves the category to the root. A given ``version`` must match the
+        stored one.
+        
+        Round trips: one ``UPDATE ... WHERE id AND version RETURNING``, plus
+        one rewriting descendant paths when a category with children is
+        renamed or moved. Misses cost one more to tell 404, a conflict and a
+        missing, deleted or descendant parent apart.
+        """
+        if partial:
+            changes = category_data.model_dump(exclude_unset=True)
+        else:
+            changes = category_data.model_dump(exclude_none=True)
+        expected_version = changes.pop("version", None)
+        if "name" in changes and changes["name"] is None:
+            raise ValueError("Category name cannot be null")
+        
+        # A stale hierarchy snapshot fails the path guard; retry once on a fresh one
+        for attempt in range(2):
+            hierarchy = await category_hierarchy.get(self.db)
+            node = hierarchy.get(category_id)
+            if node is not None:
+                category = await self._compare_and_swap(node, changes, expected_version, hierarchy)
+                if category is not None:
+                    return category
             
-            # Refresh and return updated category
-            await self.db.refresh(category)
-        
-        return category
+            current = (await self.db.execute(
+                select(Category.version, Category.is_deleted, Category.path).where(Category.id == category_id)
+            )).first()
+            if current is None or current.is_deleted:
+                return None
+            if expected_version is not None and current.version != expected_version:
+                raise ValueError("Category has been modified by another user")
+            parent_id = changes.get("parent_id")
+            if parent_id is not None:
+                parent = await self._check_parent(parent_id, "move category under")
+                if parent.path.startswith(f"{current.path}."):
+                    raise ValueError("Moving category would create a circular reference")
+            category_hierarchy.invalidate()
+        raise ValueError("Category has been modified by another user")
     
     async def delete(self, category_id: int, force: bool = False) -> bool:
-        """Delete category (soft delete by default)."""
-        category = await self._get_by_id(category_id)
-        if not category:
-            return False
-        
-        # Check if category has children
-        children_count = await self._count_children(category_id)
-        if children_count > 0:
-            raise ValueError("Cannot delete category with children")
-        
-        # Check if category has products
-        products_count = await self._count_products(category_id)
-        if products_count > 0:
-            raise ValueError("Cannot delete category with products")
-        
+        """
+        Delete category (soft delete by default).
+        
+        One guarded statement: the counters kept by triggers must be zero.
+        Refusals cost one more round trip to report why.
+        """
+        unused = and_(
+            Category.id == category_id,
+            Category.child_count == 0,
+            Category.product_count == 0
+        )
         if force:
             # Hard delete
-            stmt = delete(Category).where(Category.id == category_id)
-            await self.db.execute(stmt)
+            stmt = delete(Category).where(unused).returning(Category.id, Category.parent_id)
         else:
             # Soft delete
-            stmt = update(Category).where(Category.id == category_id).values(
+            stmt = update(Category).where(unused).values(
                 is_deleted=True,
-                version=category.version + 1
+                version=Category.version + 1
+            ).returning(Category).execution_options(populate_existing=True)
+        deleted = (await self.db.execute(stmt)).first()
+        
+        if deleted is None:
+            result = await self.db.execute(
+                select(Category.child_count, Category.product_count).where(Category.id == category_id)
             )
-            await self.db.execute(stmt)
+            counters = result.first()
+            if counters is None:
+                return False
+            if counters.child_count > 0:
+                raise ValueError("Cannot delete category with children")
+            raise ValueError("Cannot delete category with products")
         
         await self.db.commit()
+        
+        if force:
+            parent_id = deleted.parent_id
+            category_hierarchy.remove(category_id)
+        else:
+            category = deleted[0]
+            parent_id = category.parent_id
+            category_hierarchy.put(category)
+        await self._invalidate_cache(
+            category_ids=[category_id, *self._ids(parent_id)],
+            parent_ids=[parent_id]
+        )
         return True
     
     async def move(self, category_id: int, new_parent_id: Optional[int]) -> Optional[Category]:
         """Move category to a new parent."""
         category_update = CategoryUpdate(parent_id=new_parent_id)
-        return await self.update(category_id, category_update)
+        # Partial, so moving to the root (None) is a change too
+        return await self.update(category_id, category_update, partial=True)
     
     # Private helper methods
     
-    async def _get_by_id(self, category_id: int) -> Optional[Category]:
-        """Get category by ID without deleted filter."""
-        result = await self.db.execute(
-            select(Category).where(Category.id == category_id)
+    async def _invalidate_cache(
+        self,
+        category_ids: Iterable[int] = (),
+        parent_ids: Iterable[Optional[int]] = (),
+        all_listings: bool = False
+    ) -> None:
+        """Drop cached categories and the listings that may contain them."""
+        if all_listings:
+            prefixes = ("categories:list:",)
+        else:
+            # The unfiltered listing contains every category
+            prefixes = ("categories:list:all:", *(
+                f"categories:list:{parent_id}:" for parent_id in set(parent_ids) if parent_id is not None
+            ))
+        await cache.invalidate(
+            keys=tuple(f"category:{category_id}" for category_id in category_ids),
+            prefixes=prefixes
         )
-        return result.scalar_one_or_none()
     
-    async def _get_by_name_and_parent(self, name: str, parent_id: Optional[int]) -> Optional[Category]:
-        """Get category by name and parent."""
-        result = await self.db.execute(
-            select(Category).where(
-                and_(
-                    Category.name == name,
-                    Category.parent_id == parent_id,
-                    Category.is_deleted == False
-                )
-            )
+    async def _insert_one(self, category_data: CategoryCreate) -> Category:
+        """Insert one category without committing; a ValueError says why nothing was written."""
+        now = datetime.utcnow()
+        values = dict(
+            name=category_data.name,
+            description=category_data.description,
+            parent_id=category_data.parent_id,
+            attributes=category_data.attributes or {},
+            created_at=now,
+            updated_at=now
         )
-        return result.scalar_one_or_none()
-    
-    async def _would_create_cycle(self, category_id: int, new_parent_id: int) -> bool:
-        """Check if moving category would create a circular reference."""
-        # Get the path of the category being moved
-        category = await self._get_by_id(category_id)
-        if not category:
-            return False
-        
-        # Get the new parent
-        new_parent = await self._get_by_id(new_parent_id)
-        if not new_parent:
-            return False
-        
-        # Check if new parent is a descendant of category
-        return new_parent.path.startswith(f"{category.path}.")
-    
-    async def _count_children(self, category_id: int) -> int:
-        """Count non-deleted children of category."""
-        result = await self.db.execute(
-            select(func.count(Category.id)).where(
-                and_(
-                    Category.parent_id == category_id,
-                    Category.is_deleted == False
-                )
+        if category_data.parent_id:
+            parent = aliased(Category)
+            columns = dict(
+                values,
+                parent_id=parent.id,
+                path=parent.path + "." + literal(category_data.name),
+                level=parent.level + 1
             )
-        )
-        return result.scalar() or 0
-    
-    async def _count_products(self, category_id: int) -> int:
-        """Count non-deleted products in category."""
-        from app.models.product import Product
+            rows = select(*(
+                column if isinstance(column, (ColumnElement, QueryableAttribute))
+                else literal(column, Category.__table__.c[name].type)
+                for name, column in columns.items()
+            )).where(and_(parent.id == category_data.parent_id, parent.is_deleted == False))
+            statement = self._insert_new(rows, list(columns))
+        else:
+            statement = self._insert_new(dict(values, path=category_data.name, level=0))
         
         result = await self.db.execute(
-            select(func.count(Product.id)).where(
-                and_(
-                    Product.category_id == category_id,
-                    Product.is_deleted == False
-                )
-            )
+            statement.returning(Category).execution_options(populate_existing=True)
         )
-        return result.scalar() or 0
+        category = result.scalar_one_or_none()
+        if category is None:
+            # Nothing was written: a missing or deleted parent, or a taken name
+            await self._check_parent(category_data.parent_id, "create category under")
+            raise ValueError(DUPLICATE_NAME)
+        return category
     
-    async def _update_materialized_path(self, category_id: int) -> None:
-        """Update materialized path for category and its descendants."""
-        category = await self._get_by_id(category_id)
-        if not category:
+    async def _after_create(self, categories: List[Category]) -> None:
+        """Add committed categories to the snapshot and drop their parents' cached rows."""
+        if not categories:
             return
-        
-        # Calculate new path
-        if category.parent_id:
-            parent = await self._get_by_id(category.parent_id)
-            new_path = f"{parent.path}.{category.name}"
+        for category in categories:
+            category_hierarchy.put(category)
+        # The parents' child_count changed too
+        parent_ids = [category.parent_id for category in categories]
+        await self._invalidate_cache(category_ids=self._ids(*set(parent_ids)), parent_ids=parent_ids)
+    
+    def _insert_new(self, values, columns: Optional[List[str]] = None):
+        """
+        ``INSERT`` of one category (``values``, or the ``columns`` of a
+        select) that skips, rather than fails on, a taken name.
+        """
+        dialect = self.db.bind.dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(Category)
+        elif dialect == "sqlite":
+            statement = sqlite.insert(Category)
         else:
-            new_path = category.name
-        
-        old_path = category.path
-        
-        # Update category path
-        await self.db.execute(
-            update(Category)
-            .where(Category.id == category_id)
-            .values(path=new_path)
-        )
-        
-        # Update descendant paths
-        if old_path != new_path:
-            old_path_pattern = f"{old_path}.%"
-            
-            # Get all descendants
+            # Elsewhere the IntegrityError is mapped instead
+            statement = insert(Category)
+        if columns is None:
+            statement = statement.values(values)
+        else:
+            statement = statement.from_select(columns, values)
+        if dialect in ("postgresql", "sqlite"):
+            statement = statement.on_conflict_do_nothing(index_elements=["name"])
+        return statement
+    
+    async def _check_parent(self, parent_id: Optional[int], action: str) -> Optional[Row]:
+        """The live parent row, or a ValueError saying why it cannot be used."""
+        if parent_id is None:
+            return None
+        parent = (await self.db.execute(
+            select(Category.path, Category.is_deleted).where(Category.id == parent_id)
+        )).first()
+        if parent is None:
+            raise ValueError("Parent category not found")
+        if parent.is_deleted:
+            raise ValueError(f"Cannot {action} deleted parent")
+        return parent
+    
+    async def _compare_and_swap(
+        self,
+        node: HierarchyNode,
+        changes: dict,
+        expected_version: Optional[int],
+        hierarchy: HierarchySnapshot
+    ) -> Optional[Category]:
+        """
+        Apply ``changes`` to a category if it is live, at ``expected_version``
+        and (for renames and moves) still where the snapshot has it, under a
+        live parent that is not its own descendant. Returns the updated
+        category, or None when a guard missed.
+        """
+        category_id = node.id
+        conditions = [Category.id == category_id, Category.is_deleted == False]
+        if expected_version is not None:
+            conditions.append(Category.version == expected_version)
+        
+        values = dict(changes, version=Category.version + 1)
+        name = changes.get("name", node.name)
+        parent_id = changes.get("parent_id", node.parent_id)
+        moved = parent_id != node.parent_id
+        renamed = name != node.name
+        if moved and parent_id == category_id:
+            raise ValueError("Category cannot be its own parent")
+        
+        if moved or renamed:
+            if parent_id is None:
+                values["path"] = name
+                values["level"] = 0
+            else:
+                # Path and depth come from the parent row as stored, which must
+                # be live and outside this category's subtree
+                parent = aliased(Category)
+                live_parent = and_(
+                    parent.id == parent_id,
+                    parent.is_deleted == False,
+                    func.substr(parent.path, 1, func.length(Category.path) + 1) != Category.path + "."
+                )
+                values["path"] = select(parent.path + "." + literal(name)).where(live_parent).scalar_subquery()
+                values["level"] = select(parent.level + 1).where(live_parent).scalar_subquery()
+                conditions.append(exists().where(live_parent))
+        if "name" in changes or "parent_id" in changes:
+            # Whether this is a rename or move at all was decided from the
+            # snapshot, and descendants are rewritten from its path; names are
+            # unique, so the path pins both the stored name and parent
+            conditions.append(Category.path == node.path)
+        
+        try:
             result = await self.db.execute(
-                select(Category).where(Category.path.like(old_path_pattern))
+                update(Category).where(and_(*conditions)).values(**values)
+                .returning(Category).execution_options(populate_existing=True)
             )
-            descendants = list(result.scalars().all())
-            
-            for descendant in descendants:
-                descendant_new_path = descendant.path.replace(old_path, new_path, 1)
-                await self.db.execute(
-                    update(Category)
-                    .where(Category.id == descendant.id)
-                    .values(path=descendant_new_path)
-                )
+            category = result.scalar_one_or_none()
+            if category is None:
+                return None
+            # The snapshot may not know children added by another worker yet
+            if (moved or renamed) and (category.child_count or hierarchy.has_children(category_id)):
+                await self._rewrite_descendants(node, category)
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError(DUPLICATE_NAME)
+        
+        if moved or renamed:
+            category_hierarchy.invalidate()
+            # Every descendant path changed, so drop them, both parents
+            # (their child_count) and all listings
+            await self._invalidate_cache(
+                category_ids=[
+                    category_id,
+                    *hierarchy.descendants(category_id),
+                    *self._ids(node.parent_id, parent_id)
+                ],
+                all_listings=True
+            )
+        else:
+            await self._invalidate_cache(category_ids=[category_id], parent_ids=[node.parent_id])
+        return category
     
-    def _build_tree(self, categories: List[Category], root_id: Optional[int] = None) -> List[Category]:
-        """Build hierarchical tree structure from flat list."""
-        category_map = {cat.id: cat for cat in categories}
-        
-        # Clear existing children relationships
-        for cat in categories:
-            cat.children = []
-        
-        # Build parent-child relationships
-        roots = []
-        for cat in categories:
-            if cat.parent_id and cat.parent_id in category_map:
-                parent = category_map[cat.parent_id]
-                parent.children.append(cat)
-            elif cat.parent_id is None:
-                if root_id is None or cat.id == root_id:
-                    roots.append(cat)
-            elif root_id and cat.id == root_id:
-                roots.append(cat)
-        
-        return roots
+    @staticmethod
+    def _ids(*category_ids: Optional[int]) -> List[int]:
+        """The given category ids that are set."""
+        return [category_id for category_id in category_ids if category_id is not None]
+    
+    async def _rewrite_descendants(self, node: HierarchyNode, category: Category) -> None:
+        """
+        Move the materialized paths and levels of a renamed or moved
+        category's descendants after it.
+        
+        The whole subtree is rewritten by one set-based UPDATE that swaps the
+        old path prefix for the new one, so the cost is a single round trip
+        regardless of subtree size.
+        """
+        old_path = node.path
+        # Prefix substitution: new_path || substr(path, len(old_path) + 1)
+        await self.db.execute(
+            update(Category)
+            .where(Category.path.startswith(f"{old_path}.", autoescape=True))
+            .values(
+                path=literal(category.path) + func.substr(Category.path, len(old_path) + 1),
+                level=Category.level + (category.level - node.level),
+                # Descendants change too, so their ETags must change with them
+                version=Category.version + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,128 @@
+"""
+Streaming catalog export service.
+
+Tables are read through a server-side cursor (``AsyncSession.stream`` with
+``yield_per``) as plain row tuples, bypassing ORM instances and the identity
+map, and encoded one partition at a time as NDJSON or CSV. Memory stays
+bounded by ``EXPORT_BATCH_SIZE`` rows however large the table is. Output can
+be gzip-compressed on the fly.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Type
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.archive import all_rows
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+
+
+class ExportEntity(str, Enum):
+    """Exportable tables."""
+    categories = "categories"
+    products = "products"
+    skus = "skus"
+
+
+class ExportFormat(str, Enum):
+    """Export encodings."""
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+_MODELS: Dict[ExportEntity, Type[Base]] = {
+    ExportEntity.categories: Category,
+    ExportEntity.products: Product,
+    ExportEntity.skus: SKU,
+}
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot export value of type {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    """Flatten one value into a CSV cell."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default, separators=(",", ":"))
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    """Service class for streaming table exports."""
+
+    def __init__(self, db: AsyncSession, batch_size: Optional[int] = None):
+        self.db = db
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+
+    async def stream(
+        self,
+        entity: ExportEntity,
+        format: ExportFormat = ExportFormat.ndjson,
+        include_deleted: bool = False,
+        gzip: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Encoded export of ``entity``, one chunk per cursor partition."""
+        model = _MODELS[entity]
+        keys = [column.key for column in model.__table__.columns]
+
+        if include_deleted:
+            # Archived tombstones are deleted rows too
+            rows = all_rows(model)
+            query = select(*rows.columns).order_by(rows.c.id)
+        else:
+            table = model.__table__
+            query = select(*table.columns).where(table.c.is_deleted == False).order_by(table.c.id)
+
+        compressor = zlib.compressobj(wbits=31) if gzip else None  # 31: gzip container
+
+        if format == ExportFormat.csv:
+            yield self._emit(compressor, self._csv([keys]))
+
+        result = await self.db.stream(query.execution_options(yield_per=self.batch_size))
+        async for partition in result.partitions():
+            if format == ExportFormat.csv:
+                yield self._emit(compressor, self._csv(partition))
+            else:
+                yield self._emit(compressor, self._ndjson(keys, partition))
+
+        if compressor is not None:
+            yield compressor.flush()
+
+    @staticmethod
+    def _emit(compressor, chunk: str) -> bytes:
+        data = chunk.encode()
+        return compressor.compress(data) if compressor is not None else data
+
+    @staticmethod
+    def _ndjson(keys: List[str], rows: Sequence[Sequence[Any]]) -> str:
+        dumps = json.JSONEncoder(default=_json_default, separators=(",", ":")).encode
+        return "".join(dumps(dict(zip(keys, row))) + "\n" for row in rows)
+
+    @staticmethod
+    def _csv(rows: Sequence[Sequence[Any]]) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        return buffer.getvalue()
@@ -0,0 +1,338 @@
+"""
+Resumable, pipelined catalog import.
+
+An import runs as three stages joined by bounded queues, so file reads,
+validation and database writes overlap while at most ``IMPORT_QUEUE_SIZE``
+chunks are held in memory:
+
+    read (aiofiles, 1 MiB blocks) -> validate (Pydantic) -> write (one transaction)
+
+Each chunk of ``IMPORT_CHUNK_SIZE`` rows is written in one transaction that
+also advances the file's ``ImportJob`` checkpoint (byte offset and row count).
+Jobs are keyed by entity and file checksum: running the same file again
+resumes after the last committed chunk instead of starting over.
+
+Rows are validated with ``CategoryCreate``, ``ProductBulkItem`` (a
+``ProductCreate`` that may carry an ``id`` to update) and ``SKUCreate``.
+Products and SKUs are written through ``BulkService``; categories go through
+``CategoryService.create_many``, one statement per row because each needs
+its parent's path, but still in the chunk's transaction.
+CSV files need a header row; an ``attributes`` column holds JSON.
+"""
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import aiofiles
+from pydantic import ValidationError
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.import_job import ImportJob
+from app.schemas.bulk import ProductBulkItem
+from app.schemas.category import CategoryCreate
+from app.schemas.import_job import ImportResult
+from app.schemas.sku import SKUCreate
+from app.services.bulk_service import BulkService
+from app.services.category_service import CategoryService
+from app.services.export_service import ExportEntity as ImportEntity, ExportFormat as ImportFormat
+
+BLOCK_SIZE = 1 << 20
+MAX_REPORTED_ERRORS = 100
+
+_SCHEMAS = {
+    ImportEntity.categories: CategoryCreate,
+    ImportEntity.products: ProductBulkItem,
+    ImportEntity.skus: SKUCreate,
+}
+
+# (row number, parsed record or parse error)
+Record = Tuple[int, Any]
+
+
+class _Chunk:
+    """Rows of one transaction, with the file offset just past them."""
+
+    __slots__ = ("records", "end_offset", "items", "errors")
+
+    def __init__(self, records: List[Record], end_offset: int):
+        self.records = records
+        self.end_offset = end_offset
+        self.items: List[Tuple[int, Any]] = []
+        self.errors: List[str] = []
+
+
+def detect_format(path: str) -> ImportFormat:
+    """Import format from a file name."""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension in ("ndjson", "jsonl"):
+        return ImportFormat.ndjson
+    if extension == "csv":
+        return ImportFormat.csv
+    raise ValueError(f"Cannot infer import format from '{path}'")
+
+
+async def file_checksum(path: str) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    async with aiofiles.open(path, "rb") as f:
+        while block := await f.read(BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def _lines(f, offset: int) -> AsyncIterator[Tuple[bytes, int]]:
+    """Lines from ``offset`` on, each with the file offset just past it."""
+    await f.seek(offset)
+    pending = b""
+    while block := await f.read(BLOCK_SIZE):
+        pending += block
+        lines = pending.split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            offset += len(line) + 1
+            yield line, offset
+    if pending:
+        yield pending, offset + len(pending)
+
+
+def _csv_row(header: List[str], values: List[str]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    for key, value in zip(header, values):
+        if value == "":
+            value = None
+        elif key == "attributes":
+            value = json.loads(value)
+        row[key] = value
+    return row
+
+
+class ImportService:
+    """Service class for chunked, resumable catalog imports."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        chunk_size: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ):
+        self.db = db
+        # Bulk writes refuse batches over BULK_MAX_ITEMS
+        self.chunk_size = min(chunk_size or settings.IMPORT_CHUNK_SIZE, settings.BULK_MAX_ITEMS)
+        self.queue_size = queue_size or settings.IMPORT_QUEUE_SIZE
+
+    async def run(
+        self,
+        path: str,
+        entity: ImportEntity,
+        format: Optional[ImportFormat] = None,
+        source: Optional[str] = None,
+        restart: bool = False,
+        on_progress: Optional[Callable[[ImportResult], None]] = None
+    ) -> ImportResult:
+        """
+        Import ``path``, resuming an unfinished run of the same file.
+
+        A completed file is not imported again unless ``restart`` is set,
+        which also discards an unfinished checkpoint.
+        """
+        format = format or detect_format(source or path)
+        job = await self._job(entity, await file_checksum(path), source or os.path.basename(path), format)
+        if restart:
+            job.byte_offset = job.rows_processed = job.rows_failed = 0
+        elif job.status == "completed":
+            return ImportResult(job_id=job.id, status=job.status, resumed_from=job.rows_processed,
+                                rows_processed=job.rows_processed)
+        job.status = "running"
+        job.error = None
+        await self.db.commit()
+
+        result = ImportResult(job_id=job.id, status="running", resumed_from=job.rows_processed,
+                              rows_processed=job.rows_processed)
+        started = time.perf_counter()
+
+        read_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        stages = [
+            asyncio.create_task(self._read(path, format, job.byte_offset, job.rows_processed, read_queue)),
+            asyncio.create_task(self._validate(entity, read_queue, write_queue)),
+        ]
+        try:
+            while (chunk := await write_queue.get()) is not None:
+                await self._write(entity, job, chunk, result)
+                result.elapsed_seconds = time.perf_counter() - started
+                result.rows_per_second = (result.rows_processed - result.resumed_from) / result.elapsed_seconds
+                if on_progress is not None:
+                    on_progress(result)
+            # Surface reader/validator failures after their partial output is written
+            await asyncio.gather(*stages)
+        except Exception as e:
+            for stage in stages:
+                stage.cancel()
+            await self.db.rollback()
+            job.status = "failed"
+            job.error = str(e)[:2000]
+            await self.db.commit()
+            raise
+
+        job.status = result.status = "completed"
+        await self.db.commit()
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
+
+    async def get_job(self, job_id: int) -> Optional[ImportJob]:
+        """Get an import checkpoint by ID."""
+        return await self.db.get(ImportJob, job_id)
+
+    # Pipeline stages
+
+    async def _read(
+        self,
+        path: str,
+        format: ImportFormat,
+        offset: int,
+        row_number: int,
+        queue: asyncio.Queue
+    ) -> None:
+        """Split the file from ``offset`` into records and queue them in chunks."""
+        try:
+            async with aiofiles.open(path, "rb") as f:
+                header: Optional[List[str]] = None
+                if format == ImportFormat.csv:
+                    header_line = (await f.readline()).decode("utf-8-sig").rstrip("\r\n")
+                    header = next(csv.reader([header_line]))
+                    offset = max(offset, await f.tell())
+
+                rows: List[int] = []
+                raw: List[bytes] = []
+                record = b""
+                end_offset = offset
+                async for line, end_offset in _lines(f, offset):
+                    record += line
+                    # A CSV record continues while a quoted field is open
+                    if header is not None and record.count(b'"') % 2:
+                        record += b"\n"
+                        continue
+                    if record.strip():
+                        row_number += 1
+                        rows.append(row_number)
+                        raw.append(record.rstrip(b"\r"))
+                    record = b""
+                    if len(rows) >= self.chunk_size:
+                        await queue.put(self._parse(header, rows, raw, end_offset))
+                        rows, raw = [], []
+                if record.strip():
+                    # Unterminated quoted field at end of file
+                    rows.append(row_number + 1)
+                    raw.append(record)
+                if rows:
+                    await queue.put(self._parse(header, rows, raw, end_offset))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    async def _validate(self, entity: ImportEntity, source: asyncio.Queue, sink: asyncio.Queue) -> None:
+        """Validate queued chunks against the entity's create schema."""
+        schema = _SCHEMAS[entity]
+        while (chunk := await source.get()) is not None:
+            for row_number, record in chunk.records:
+                if isinstance(record, Exception):
+                    chunk.errors.append(f"row {row_number}: {record}")
+                    continue
+                try:
+                    chunk.items.append((row_number, schema.model_validate(record)))
+                except ValidationError as e:
+                    reasons = "; ".join(
+                        f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+                    )
+                    chunk.errors.append(f"row {row_number}: {reasons}")
+            await sink.put(chunk)
+        await sink.put(None)
+
+    async def _write(self, entity: ImportEntity, job: ImportJob, chunk: _Chunk, result: ImportResult) -> None:
+        """Write one chunk and advance the checkpoint in the same transaction."""
+        errors = list(chunk.errors)
+        rows_written = 0
+
+        # The write commits, taking the checkpoint with it. Item errors are
+        # only known afterwards and land with the next chunk.
+        job.byte_offset = chunk.end_offset
+        job.rows_processed += len(chunk.records)
+        job.rows_failed += len(errors)
+        items = [item for _, item in chunk.items]
+        if entity == ImportEntity.categories:
+            # One by one, since each needs its parent's path, but in one transaction
+            outcomes = await CategoryService(self.db).create_many(items)
+        else:
+            service = BulkService(self.db, chunk_size=self.chunk_size)
+            if entity == ImportEntity.products:
+                outcomes = await service.upsert_products(items)
+            else:
+                outcomes = await service.upsert_skus(items)
+        for (row_number, _), outcome in zip(chunk.items, outcomes):
+            if outcome.status == "error":
+                errors.append(f"row {row_number}: {outcome.error}")
+                job.rows_failed += 1
+            else:
+                rows_written += 1
+
+        result.rows_processed = job.rows_processed
+        result.rows_written += rows_written
+        result.rows_failed += len(errors)
+        result.errors.extend(errors[:MAX_REPORTED_ERRORS - len(result.errors)])
+
+    # Private helper methods
+
+    @staticmethod
+    def _parse(
+        header: Optional[List[str]],
+        rows: List[int],
+        raw: List[bytes],
+        end_offset: int
+    ) -> _Chunk:
+        """Decode a chunk's records; malformed rows carry their error instead."""
+        texts: List[Optional[str]] = []
+        parsed: List[Record] = []
+        for row_number, data in zip(rows, raw):
+            try:
+                texts.append(data.decode("utf-8"))
+            except UnicodeDecodeError:
+                texts.append(None)
+                parsed.append((row_number, ValueError("invalid UTF-8")))
+
+        decoded = [(row_number, text) for row_number, text in zip(rows, texts) if text is not None]
+        if header is None:
+            for row_number, text in decoded:
+                try:
+                    parsed.append((row_number, json.loads(text)))
+                except json.JSONDecodeError as e:
+                    parsed.append((row_number, ValueError(f"invalid JSON: {e.msg}")))
+        else:
+            values = csv.reader(text for _, text in decoded)
+            for (row_number, _), row in zip(decoded, values):
+                try:
+                    parsed.append((row_number, _csv_row(header, row)))
+                except json.JSONDecodeError as e:
+                    parsed.append((row_number, ValueError(f"invalid attributes JSON: {e.msg}")))
+        parsed.sort(key=lambda record: record[0])
+        return _Chunk(parsed, end_offset)
+
+    async def _job(self, entity: ImportEntity, checksum: str, source: str, format: ImportFormat) -> ImportJob:
+        """The checkpoint for this file, created on first import."""
+        result = await self.db.execute(
+            select(ImportJob).where(and_(ImportJob.entity == entity.value, ImportJob.checksum == checksum))
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            job = ImportJob(entity=entity.value, checksum=checksum, source=source[:255], format=format.value)
+            self.db.add(job)
+            await self.db.flush()
+        return job
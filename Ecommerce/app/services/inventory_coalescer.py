@@ -0,0 +1,208 @@
+"""
+Write coalescing for high-frequency inventory adjustments.
+
+With ``INVENTORY_COALESCE`` on, single-SKU adjustments are queued here
+instead of each running its own transaction on the hot row. A background
+task flushes the queue every ``INVENTORY_COALESCE_INTERVAL_MS``, or as soon
+as ``INVENTORY_COALESCE_MAX_EVENTS`` adjustments are waiting, with one
+guarded ``InventoryService.apply`` over the summed delta per SKU and one
+commit. Callers wait for the flush that contains their adjustment, so a
+response is only sent once its delta is durable (group commit).
+
+The summed delta is applied only if no prefix of the SKU's adjustments, in
+arrival order, takes its count below zero (the guard checks the lowest
+running sum, not just the total). Otherwise that SKU's adjustments are
+replayed one by one in arrival order within the same transaction, so each
+is accepted or refused exactly as it would have been unbatched. Accepted
+adjustments report the SKU's count after the whole flush.
+
+``read`` returns the stored count plus deltas still queued, and waits out a
+flush in progress so nothing is counted twice. Queues are per worker
+process; the app lifespan starts the flusher and drains the queue on
+shutdown.
+"""
+import asyncio
+import time
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import Histogram
+from app.services.inventory_service import InsufficientInventory, InventoryService
+
+# (delta, future resolved with the new count)
+Event = Tuple[int, asyncio.Future]
+
+
+class InventoryCoalescer:
+    """Per-process buffer batching inventory deltas into periodic UPDATEs."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        interval_ms: int,
+        max_events: int
+    ):
+        self.session_factory = session_factory
+        self.interval = interval_ms / 1000
+        self.max_events = max_events
+        self._pending: Dict[int, List[Event]] = {}
+        self._pending_events = 0
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        # Metrics
+        self.events = 0
+        self.flushes = 0
+        self.rows_updated = 0
+        self.replayed_events = 0
+        self.failed_flushes = 0
+        self.flush_latency = Histogram()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flusher on the running event loop."""
+        if not self.running:
+            self._full = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the flusher and write everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def adjust(self, sku_id: int, delta: int) -> Optional[int]:
+        """
+        Queue a delta and wait until it is committed.
+
+        Returns the SKU's count after the flush, or None when the SKU is
+        missing or deleted; raises ``InsufficientInventory`` when the delta
+        would take the count below zero.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(sku_id, []).append((delta, future))
+        self._pending_events += 1
+        self.events += 1
+        if not self.running:
+            await self.flush()
+        elif self._pending_events >= self.max_events:
+            self._full.set()
+        return await future
+
+    def pending_delta(self, sku_id: int) -> int:
+        """Sum of queued, not yet flushed deltas for ``sku_id``."""
+        return sum(delta for delta, _ in self._pending.get(sku_id, ()))
+
+    async def read(self, db: AsyncSession, sku_id: int) -> Optional[int]:
+        """Stored count of a live SKU with its queued deltas applied."""
+        async with self._flush_lock:
+            stored = await InventoryService(db).get_count(sku_id)
+            if stored is None:
+                return None
+            return stored + self.pending_delta(sku_id)
+
+    async def flush(self) -> None:
+        """Write all queued deltas in one transaction and resolve their callers."""
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            self._pending_events = 0
+            self._full.clear()
+            if not batch:
+                return
+
+            started = time.perf_counter()
+            try:
+                outcomes = await self._write(batch)
+            except Exception as e:
+                self.failed_flushes += 1
+                for events in batch.values():
+                    for _, future in events:
+                        if not future.done():
+                            future.set_exception(e)
+                return
+            finally:
+                self.flush_latency.observe(time.perf_counter() - started)
+
+            self.flushes += 1
+            self.rows_updated += len(batch)
+            for events, results in zip(batch.values(), outcomes):
+                for (_, future), result in zip(events, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Coalescing counters for the metrics endpoint."""
+        return {
+            "running": self.running,
+            "events": self.events,
+            "flushes": self.flushes,
+            "rows_updated": self.rows_updated,
+            "coalescing_ratio": round(self.events / self.rows_updated, 2) if self.rows_updated else None,
+            "replayed_events": self.replayed_events,
+            "failed_flushes": self.failed_flushes,
+            "pending_events": self._pending_events,
+            "flush_seconds": self.flush_latency.snapshot(),
+        }
+
+    # Private helper methods
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            # Cancelling the flusher must not abandon a batch mid-write
+            await asyncio.shield(self.flush())
+
+    async def _write(self, batch: Dict[int, List[Event]]) -> List[List[Any]]:
+        """Apply the batch; per SKU, one result (count, None or error) per event."""
+        async with self.session_factory() as db:
+            service = InventoryService(db)
+            counts = await service.apply(
+                {sku_id: sum(delta for delta, _ in events) for sku_id, events in batch.items()},
+                floors={sku_id: min(accumulate(delta for delta, _ in events)) for sku_id, events in batch.items()}
+            )
+            rejected = [sku_id for sku_id in batch if sku_id not in counts]
+            reasons = await service.rejections(rejected) if rejected else {}
+
+            results: Dict[int, List[Any]] = {}
+            for sku_id, events in batch.items():
+                if sku_id in counts:
+                    results[sku_id] = [counts[sku_id]] * len(events)
+                elif reasons[sku_id] == "SKU not found":
+                    results[sku_id] = [None] * len(events)
+                else:
+                    # Some running sum overdraws: decide each event in arrival order
+                    self.replayed_events += len(events)
+                    replayed = []
+                    for delta, _ in events:
+                        count = (await service.apply({sku_id: delta})).get(sku_id)
+                        replayed.append(InsufficientInventory("Insufficient inventory") if count is None else count)
+                    final = next((r for r in reversed(replayed) if not isinstance(r, Exception)), None)
+                    results[sku_id] = [r if isinstance(r, Exception) else final for r in replayed]
+            await db.commit()
+        return [results[sku_id] for sku_id in batch]
+
+
+inventory_coalescer = InventoryCoalescer(
+    AsyncSessionLocal,
+    interval_ms=settings.INVENTORY_COALESCE_INTERVAL_MS,
+    max_events=settings.INVENTORY_COALESCE_MAX_EVENTS
+)
@@ -0,0 +1,139 @@
+"""
+Atomic inventory adjustments.
+
+An adjustment is one conditional ``UPDATE ... RETURNING`` that adds a
+relative delta to the stored count in the database itself, guarded so the
+count never drops below zero. No row is read first, so concurrent
+adjustments of the same SKU queue on the row lock instead of overwriting
+each other's read-modify-write. A batch is the same statement with a
+``CASE`` over the SKU ids; a second query runs only to explain items the
+guard rejected.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, case, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.models.sku import SKU
+from app.schemas.sku import InventoryAdjustResult, InventoryBatchItem
+
+
+class InsufficientInventory(ValueError):
+    """The adjustment would take the inventory count below zero."""
+
+
+class InventoryService:
+    """Service class for atomic inventory adjustments."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.table = SKU.__table__
+
+    async def adjust(self, sku_id: int, delta: int) -> Optional[int]:
+        """
+        Add ``delta`` to a SKU's inventory count and return the new count.
+
+        Returns None when the SKU is missing or deleted and raises
+        ``InsufficientInventory`` when the count would drop below zero.
+        """
+        results = await self.apply({sku_id: delta})
+        await self.db.commit()
+        if sku_id in results:
+            return results[sku_id]
+        reason = (await self.rejections([sku_id]))[sku_id]
+        if reason == "SKU not found":
+            return None
+        raise InsufficientInventory(reason)
+
+    async def adjust_many(self, items: Sequence[InventoryBatchItem], atomic: bool = True) -> List[InventoryAdjustResult]:
+        """
+        Apply a batch of deltas in one statement.
+
+        Deltas for the same SKU are summed. With ``atomic`` nothing is applied
+        unless every SKU can be adjusted; otherwise the valid ones are kept.
+        """
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise ValueError(f"Bulk requests are limited to {settings.BULK_MAX_ITEMS} items")
+        deltas: Dict[int, int] = {}
+        for item in items:
+            deltas[item.sku_id] = deltas.get(item.sku_id, 0) + item.delta
+
+        counts = await self.apply(deltas)
+        rejected = [sku_id for sku_id in deltas if sku_id not in counts]
+        reasons = await self.rejections(rejected) if rejected else {}
+        if atomic and rejected:
+            await self.db.rollback()
+        else:
+            await self.db.commit()
+
+        results = []
+        for sku_id in deltas:
+            if sku_id in reasons:
+                results.append(InventoryAdjustResult(sku_id=sku_id, status="error", error=reasons[sku_id]))
+            elif atomic and rejected:
+                results.append(InventoryAdjustResult(sku_id=sku_id, status="skipped",
+                                                     error="Batch rejected"))
+            else:
+                results.append(InventoryAdjustResult(sku_id=sku_id, status="adjusted",
+                                                     inventory_count=counts[sku_id]))
+        return results
+
+    async def apply(self, deltas: Dict[int, int], floors: Optional[Dict[int, int]] = None) -> Dict[int, int]:
+        """
+        Run the guarded UPDATE without committing; ``sku_id -> new count``
+        for the rows it changed.
+
+        A row is changed only if its count plus its ``floors`` entry (the
+        delta itself by default) stays at or above zero.
+        """
+        table = self.table
+        delta_expr = self._per_sku(deltas)
+        floor_expr = delta_expr if floors is None else self._per_sku(floors)
+        current = table.c.inventory_count
+        statement = (
+            update(table)
+            .where(and_(
+                table.c.id.in_(list(deltas)),
+                table.c.is_deleted == False,
+                current + floor_expr >= 0
+            ))
+            .values(
+                inventory_count=current + delta_expr,
+                version=table.c.version + 1,
+                updated_at=datetime.utcnow()
+            )
+            .returning(table.c.id, table.c.inventory_count)
+        )
+        result = await self.db.execute(statement)
+        return dict(result.all())
+
+    async def rejections(self, sku_ids: List[int]) -> Dict[int, str]:
+        """Why the guarded UPDATE skipped each of ``sku_ids``."""
+        table = self.table
+        result = await self.db.execute(
+            select(table.c.id).where(and_(table.c.id.in_(sku_ids), table.c.is_deleted == False))
+        )
+        live = set(result.scalars())
+        return {
+            sku_id: "Insufficient inventory" if sku_id in live else "SKU not found"
+            for sku_id in sku_ids
+        }
+
+    async def get_count(self, sku_id: int) -> Optional[int]:
+        """Stored inventory count of a live SKU."""
+        table = self.table
+        result = await self.db.execute(
+            select(table.c.inventory_count).where(and_(table.c.id == sku_id, table.c.is_deleted == False))
+        )
+        return result.scalar_one_or_none()
+
+    # Private helper methods
+
+    def _per_sku(self, values: Dict[int, int]) -> ColumnElement:
+        """A literal, or a ``CASE`` over the SKU id when values differ per SKU."""
+        if len(values) == 1:
+            return literal(next(iter(values.values())))
+        return case(values, value=self.table.c.id)
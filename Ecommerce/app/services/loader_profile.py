@@ -0,0 +1,63 @@
+"""
+Loader profiles mapping ``expand=`` query values to explicit relationship loaders.
+
+Relationships on the models are declared ``lazy="raise"`` so nothing is loaded
+unless a caller asks for it. Each profile lists the relations a resource may
+expand and the loader strategy used for them.
+"""
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+
+
+class LoaderProfile:
+    """Set of expandable relations for one resource."""
+
+    def __init__(self, model: Any, loaders: Dict[str, Callable[[Any], LoaderOption]]):
+        self.model = model
+        self.loaders = loaders
+
+    @property
+    def names(self) -> List[str]:
+        """Expandable relation names, sorted."""
+        return sorted(self.loaders)
+
+    def parse(self, expand: Optional[str]) -> FrozenSet[str]:
+        """Parse a comma-separated ``expand`` value into relation names."""
+        if not expand:
+            return frozenset()
+
+        relations = frozenset(part.strip() for part in expand.split(",") if part.strip())
+        unknown = relations - self.loaders.keys()
+        if unknown:
+            raise ValueError(
+                f"Cannot expand {', '.join(sorted(unknown))}; "
+                f"allowed values: {', '.join(self.names)}"
+            )
+        return relations
+
+    def options(self, expand: FrozenSet[str], entity: Any = None) -> List[LoaderOption]:
+        """Build loader options for the requested relations of ``entity`` (default the model)."""
+        entity = self.model if entity is None else entity
+        return [self.loaders[name](entity) for name in sorted(expand)]
+
+
+# Collections use selectinload (one extra IN query) and skip soft-deleted
+# children; many-to-one uses joinedload
+CATEGORY_PROFILE = LoaderProfile(Category, {
+    "products": lambda entity: selectinload(entity.products.and_(Product.is_deleted == False)),
+})
+
+PRODUCT_PROFILE = LoaderProfile(Product, {
+    "category": lambda entity: joinedload(entity.category),
+    "skus": lambda entity: selectinload(entity.skus.and_(SKU.is_deleted == False)),
+})
+
+SKU_PROFILE = LoaderProfile(SKU, {
+    "product": lambda entity: joinedload(entity.product),
+})
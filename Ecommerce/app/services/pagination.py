@@ -0,0 +1,34 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque URL-safe token holding the sort key of the last row of a
+page, e.g. ``(name, id)`` for categories or ``(created_at, id)`` for products.
+The next page is read with a row-value comparison against that key, which the
+matching composite index answers without scanning skipped rows.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence, Tuple, Type
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort key values into an opaque cursor token."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, types: Sequence[Type]) -> Tuple[Any, ...]:
+    """Decode a cursor token into sort key values of the given types."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for value, type_ in zip(payload, types)
+        )
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
@@ -0,0 +1,230 @@
+"""
+Product service for business logic operations.
+"""
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func, tuple_
+
+from app.core.config import settings
+from app.models.archive import with_archive
+from app.models.product import Product
+from app.schemas.product import ProductSearchRequest
+from app.services.attribute_filter import AttributeFilter
+from app.services.category_hierarchy import HierarchySnapshot, category_hierarchy
+from app.services.loader_profile import PRODUCT_PROFILE
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.search.backends import SearchHit, get_search_backend, highlight
+from app.services.search.bitmap import Bitmap
+from app.services.search.facets import product_facets
+from app.services.search.trigram import product_search_index
+
+
+class ProductService:
+    """Service class for product operations."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(
+        self,
+        product_id: int,
+        expand: FrozenSet[str] = frozenset()
+    ) -> Optional[Product]:
+        """Get product by ID, loading only the expanded relations."""
+        query = select(Product).where(
+            and_(Product.id == product_id, Product.is_deleted == False)
+        ).options(*PRODUCT_PROFILE.options(expand))
+
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_many(
+        self,
+        product_ids: List[int],
+        expand: FrozenSet[str] = frozenset()
+    ) -> List[Product]:
+        """Get live products by ID in the order given, skipping unknown ones."""
+        if not product_ids:
+            return []
+        result = await self.db.execute(
+            select(Product).where(
+                and_(Product.id.in_(product_ids), Product.is_deleted == False)
+            ).options(*PRODUCT_PROFILE.options(expand))
+        )
+        by_id = {product.id: product for product in result.scalars().all()}
+        return [by_id[product_id] for product_id in product_ids if product_id in by_id]
+
+    async def get_all(
+        self,
+        category_id: Optional[int] = None,
+        include_deleted: bool = False,
+        page: int = 1,
+        size: int = 20,
+        expand: FrozenSet[str] = frozenset(),
+        cursor: Optional[str] = None,
+        attributes: Optional[Dict[str, str]] = None
+    ) -> List[Product]:
+        """
+        Get all products with optional filtering, newest first.
+
+        When ``cursor`` is given, rows after the cursor's ``(created_at, id)`` key
+        are returned and ``page`` is ignored. ``attributes`` filters go through
+        the attribute index (one extra query).
+        """
+        # Deleted rows may have been moved to the archive table
+        entity = with_archive(Product) if include_deleted else Product
+        query = select(entity).options(*PRODUCT_PROFILE.options(expand, entity))
+
+        # Apply filters
+        conditions = []
+        if not include_deleted:
+            conditions.append(Product.is_deleted == False)
+
+        if category_id is not None:
+            conditions.append(entity.category_id == category_id)
+
+        if attributes:
+            conditions.append(await AttributeFilter(self.db, Product).condition(attributes, entity))
+
+        if cursor is not None:
+            created_at, last_id = decode_cursor(cursor, (datetime, int))
+            conditions.append(tuple_(entity.created_at, entity.id) < (created_at, last_id))
+
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        # Apply pagination
+        if cursor is None:
+            query = query.offset((page - 1) * size)
+        query = query.limit(size)
+
+        # Newest first, with id as tie-breaker for a stable keyset
+        query = query.order_by(entity.created_at.desc(), entity.id.desc())
+
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def search(self, search: ProductSearchRequest) -> Tuple[List[Tuple[Product, SearchHit]], int]:
+        """
+        Case-insensitive partial name search (FR-009) combinable with a
+        category filter (FR-023), served by the ``SEARCH_BACKEND`` backend.
+
+        Returns one page of ranked ``(product, hit)`` pairs and the total match
+        count. An empty query lists the category (or all products) instead.
+        """
+        if not search.query or not search.query.strip():
+            products = await self.get_all(
+                category_id=search.category_id,
+                page=search.page,
+                size=search.size
+            )
+            hits = [(product, SearchHit(product.id, None, None)) for product in products]
+            return hits, await self._count(search.category_id)
+
+        backend = await get_search_backend(self.db)
+        hits, total = await backend.search(
+            self.db,
+            search.query,
+            category_id=search.category_id,
+            page=search.page,
+            size=search.size
+        )
+        products = await self.get_many([hit.product_id for hit in hits])
+        by_id = {hit.product_id: hit for hit in hits}
+
+        results = []
+        for product in products:
+            hit = by_id[product.id]
+            if hit.highlight is None:
+                # Backends without snippets get the name match highlighted
+                hit = hit._replace(highlight=highlight(product.name, search.query))
+            results.append((product, hit))
+        return results, total
+
+    async def facets(
+        self,
+        query: Optional[str] = None,
+        category_id: Optional[int] = None,
+        attributes: Optional[Dict[str, str]] = None,
+        top: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Facet counts for the live products matching a search.
+
+        ``category_id`` covers its whole subtree and ``attributes`` must name
+        facet keys. Category counts roll up to the children of ``category_id``
+        (or to the root categories); each facet key lists its ``top`` values.
+        Answered from the in-process facet and trigram indexes, so a warm
+        worker runs no SQL.
+        """
+        index = await product_facets.get(self.db)
+        hierarchy = await category_hierarchy.get(self.db)
+        top = top or settings.FACET_TOP_VALUES
+
+        sets: List[Bitmap] = []
+        if category_id is not None:
+            members = [category_id, *hierarchy.descendants(category_id)]
+            sets.append(Bitmap.union(index.category(member) for member in members))
+        for key, value in (attributes or {}).items():
+            if key not in index.keys:
+                raise ValueError(f"attr.{key} is not a facet (facets: {', '.join(index.keys) or 'none'})")
+            sets.append(index.value(key, value))
+        if query and query.strip():
+            search_index = await product_search_index.get(self.db)
+            sets.append(Bitmap(search_index.matching(query)))
+        matches = index.match(sets) if sets else None
+
+        return {
+            "total": len(index) if matches is None else len(matches),
+            "categories": self._category_facets(hierarchy, index.category_counts(matches), category_id),
+            "attributes": {
+                key: [{"value": value, "count": count} for value, count in index.value_counts(key, matches, top)]
+                for key in index.keys
+            },
+        }
+
+    @staticmethod
+    def next_cursor(products: List[Product], size: int) -> Optional[str]:
+        """Cursor for the page after ``products``, or None on the last page."""
+        if len(products) < size:
+            return None
+        last = products[-1]
+        return encode_cursor(last.created_at, last.id)
+
+    # Private helper methods
+
+    @staticmethod
+    def _category_facets(
+        hierarchy: HierarchySnapshot,
+        counts: Dict[int, int],
+        focus: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Roll per-category counts up to the children of ``focus`` (or the roots)."""
+        totals: Dict[int, int] = {}
+        for category_id, count in counts.items():
+            # Nearest parent first, so the bucket sits just before ``focus``
+            chain = [category_id, *hierarchy.ancestors(category_id)]
+            if focus is None:
+                bucket = chain[-1]
+            elif focus in chain[1:]:
+                bucket = chain[chain.index(focus) - 1]
+            else:
+                continue
+            totals[bucket] = totals.get(bucket, 0) + count
+
+        facets = []
+        for category_id, count in totals.items():
+            node = hierarchy.get(category_id)
+            if node is not None and not node.is_deleted:
+                facets.append({"id": category_id, "name": node.name, "count": count})
+        facets.sort(key=lambda facet: (-facet["count"], facet["name"]))
+        return facets
+
+    async def _count(self, category_id: Optional[int] = None) -> int:
+        """Count live products, optionally within a category."""
+        query = select(func.count(Product.id)).where(Product.is_deleted == False)
+        if category_id is not None:
+            query = query.where(Product.category_id == category_id)
+        result = await self.db.execute(query)
+        return result.scalar() or 0
@@ -0,0 +1,3 @@
+"""
+Product search package.
+"""
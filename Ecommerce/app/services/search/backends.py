@@ -0,0 +1,191 @@
+"""
+Product search backends.
+
+``SEARCH_BACKEND`` selects how ``ProductService.search`` finds products:
+
+* ``trigram`` - the in-process trigram index (substring matching)
+* ``fts`` - the database's full-text engine: SQLite FTS5 with BM25 ranking or
+  PostgreSQL ``tsvector`` with ``ts_rank_cd``; every query word is a prefix
+  match. Falls back to ``like`` when neither is available.
+* ``like`` - plain case-insensitive ``LIKE '%term%'``
+
+Every backend returns hits as ``(product_id, score, highlight)`` with higher
+scores ranking first and matches wrapped in ``<mark>`` tags.
+"""
+import re
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, func, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.product import Product
+from app.models.search import POSTGRES_DOCUMENT
+from app.services.search.trigram import product_search_index
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchHit(NamedTuple):
+    """One ranked search result."""
+    product_id: int
+    score: Optional[float]
+    highlight: Optional[str]
+
+
+def highlight(text_value: str, term: str) -> Optional[str]:
+    """Wrap the first case-insensitive occurrence of ``term`` in <mark> tags."""
+    position = text_value.casefold().find(term.strip().casefold())
+    if position < 0:
+        return None
+    end = position + len(term.strip())
+    return f"{text_value[:position]}<mark>{text_value[position:end]}</mark>{text_value[end:]}"
+
+
+class SearchBackend(ABC):
+    """Interface for product search backends."""
+
+    name = "base"
+
+    @abstractmethod
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        category_id: Optional[int],
+        page: int,
+        size: int
+    ) -> Tuple[List[SearchHit], int]:
+        """One page of hits plus the total number of matches."""
+
+
+class TrigramBackend(SearchBackend):
+    """Substring search through the in-process trigram index."""
+
+    name = "trigram"
+
+    async def search(self, db, query, category_id, page, size):
+        index = await product_search_index.get(db)
+        product_ids, total = index.search(query, category_id=category_id, page=page, size=size)
+        return [SearchHit(product_id, None, None) for product_id in product_ids], total
+
+
+class LikeBackend(SearchBackend):
+    """Case-insensitive LIKE scan; always available."""
+
+    name = "like"
+
+    async def search(self, db, query, category_id, page, size):
+        conditions = [
+            Product.is_deleted == False,
+            func.lower(Product.name).contains(query.strip().lower(), autoescape=True),
+        ]
+        if category_id is not None:
+            conditions.append(Product.category_id == category_id)
+
+        result = await db.execute(
+            select(Product.id)
+            .where(and_(*conditions))
+            .order_by(Product.name, Product.id)
+            .offset((page - 1) * size)
+            .limit(size)
+        )
+        total = await db.execute(select(func.count(Product.id)).where(and_(*conditions)))
+        return [SearchHit(product_id, None, None) for product_id in result.scalars()], total.scalar() or 0
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """FTS5 search over the trigger-maintained ``products_fts`` table."""
+
+    name = "sqlite_fts5"
+
+    @staticmethod
+    def match_expression(query: str) -> Optional[str]:
+        """Quote each word and make it a prefix query, ANDed together."""
+        words = _WORD.findall(query)
+        return " ".join(f'"{word}"*' for word in words) if words else None
+
+    async def search(self, db, query, category_id, page, size):
+        match = self.match_expression(query)
+        if match is None:
+            return [], 0
+
+        where = "products_fts MATCH :match AND p.is_deleted = 0"
+        params = {"match": match}
+        if category_id is not None:
+            where += " AND p.category_id = :category_id"
+            params["category_id"] = category_id
+
+        # bm25() is lower-is-better; names weigh ten times descriptions
+        result = await db.execute(text(f"""
+            SELECT p.id,
+                   -bm25(products_fts, 10.0, 1.0) AS score,
+                   snippet(products_fts, -1, '<mark>', '</mark>', '…', 12) AS highlight
+            FROM products_fts JOIN products p ON p.id = products_fts.rowid
+            WHERE {where}
+            ORDER BY score DESC, p.id
+            LIMIT :limit OFFSET :offset
+        """), {**params, "limit": size, "offset": (page - 1) * size})
+        total = await db.execute(text(f"""
+            SELECT count(*) FROM products_fts JOIN products p ON p.id = products_fts.rowid
+            WHERE {where}
+        """), params)
+        return [SearchHit(*row) for row in result.all()], total.scalar() or 0
+
+
+class PostgresFTSBackend(SearchBackend):
+    """``tsvector`` search served by the ``ix_products_search`` GIN index."""
+
+    name = "postgresql_fts"
+
+    async def search(self, db, query, category_id, page, size):
+        words = _WORD.findall(query)
+        if not words:
+            return [], 0
+
+        document = literal_column(POSTGRES_DOCUMENT)
+        ts_query = func.to_tsquery("simple", " & ".join(f"{word}:*" for word in words))
+        conditions = [Product.is_deleted == False, document.op("@@")(ts_query)]
+        if category_id is not None:
+            conditions.append(Product.category_id == category_id)
+
+        score = func.ts_rank_cd(document, ts_query).label("score")
+        result = await db.execute(
+            select(
+                Product.id,
+                score,
+                func.ts_headline(
+                    "simple", Product.name, ts_query, "StartSel=<mark>, StopSel=</mark>"
+                ),
+            )
+            .where(and_(*conditions))
+            .order_by(score.desc(), Product.id)
+            .offset((page - 1) * size)
+            .limit(size)
+        )
+        total = await db.execute(select(func.count(Product.id)).where(and_(*conditions)))
+        return [SearchHit(*row) for row in result.all()], total.scalar() or 0
+
+
+_fts_available = {}
+
+
+async def get_search_backend(db: AsyncSession) -> SearchBackend:
+    """Backend configured by ``SEARCH_BACKEND`` for this session's database."""
+    if settings.SEARCH_BACKEND == "trigram":
+        return TrigramBackend()
+    if settings.SEARCH_BACKEND == "fts":
+        dialect = db.bind.dialect.name
+        if dialect == "postgresql":
+            return PostgresFTSBackend()
+        if dialect == "sqlite":
+            url = str(db.bind.url)
+            if url not in _fts_available:
+                result = await db.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+                ))
+                _fts_available[url] = result.scalar() is not None
+            if _fts_available[url]:
+                return SQLiteFTSBackend()
+    return LikeBackend()
@@ -0,0 +1,199 @@
+"""
+Compressed integer bitmaps for in-process facet counting.
+
+Ids are split into chunks of 65536 by their high bits (as in Roaring
+bitmaps). A chunk holding few ids is a sorted ``array("H")`` of their low
+16 bits, two bytes per id; once it passes ``ARRAY_LIMIT`` ids it becomes a
+plain int used as a 65536-bit set, at most 8 KiB. A category of a few
+hundred products scattered over a million ids therefore costs a few hundred
+bytes instead of a 125 KiB flat bitmap, while a value shared by a tenth of
+the catalog is a handful of dense chunks that intersect with one C-level
+``&`` and one popcount each.
+"""
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Union
+
+CHUNK_BITS = 16
+LOW_MASK = (1 << CHUNK_BITS) - 1
+ARRAY_LIMIT = 4096
+
+Container = Union[array, int]
+
+
+def _popcount(bits: int) -> int:
+    # int.bit_count needs Python 3.10; counting the binary digits is also C-level
+    return bin(bits).count("1")
+
+
+def _count(container: Container) -> int:
+    return len(container) if isinstance(container, array) else _popcount(container)
+
+
+def _to_int(*sources: Iterable[int]) -> int:
+    # Set bits in a bytearray: OR-ing into a growing int copies it every time
+    buffer = bytearray(1 << (CHUNK_BITS - 3))
+    for values in sources:
+        for value in values:
+            buffer[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _members(bits: int) -> Iterator[int]:
+    # Scanning the binary digits is far cheaper than peeling bits one by one
+    digits = bin(bits)[:1:-1]
+    i = digits.find("1")
+    while i >= 0:
+        yield i
+        i = digits.find("1", i + 1)
+
+
+def _container(lows: List[int]) -> Container:
+    """Container for a chunk's distinct low bits."""
+    if len(lows) > ARRAY_LIMIT:
+        return _to_int(lows)
+    return array("H", sorted(lows))
+
+
+def _intersect(a: Container, b: Container) -> Container:
+    if isinstance(a, int) and isinstance(b, int):
+        return a & b
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return array("H", (value for value in a if b >> value & 1))
+    if len(a) > len(b):
+        a, b = b, a
+    other = set(b)
+    return array("H", (value for value in a if value in other))
+
+
+def _intersection_count(a: Container, b: Container) -> int:
+    if isinstance(a, int) and isinstance(b, int):
+        return _popcount(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return sum(b >> value & 1 for value in a)
+    if len(a) > len(b):
+        a, b = b, a
+    return len(set(a).intersection(b))
+
+
+class Bitmap:
+    """Set of non-negative ints stored as per-chunk arrays or bitsets."""
+
+    __slots__ = ("_chunks", "_count")
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._chunks: Dict[int, Container] = {}
+        self._count = 0
+        lows: Dict[int, set] = {}
+        for value in values:
+            lows.setdefault(value >> CHUNK_BITS, set()).add(value & LOW_MASK)
+        for high, chunk in lows.items():
+            self._chunks[high] = _container(list(chunk))
+            self._count += len(chunk)
+
+    @classmethod
+    def union(cls, bitmaps: Iterable["Bitmap"]) -> "Bitmap":
+        """Union of many bitmaps, merging each chunk once."""
+        parts: Dict[int, List[Container]] = {}
+        for bitmap in bitmaps:
+            for high, container in bitmap._chunks.items():
+                parts.setdefault(high, []).append(container)
+        result = cls()
+        for high, containers in parts.items():
+            if sum(_count(container) for container in containers) <= ARRAY_LIMIT and \
+                    all(isinstance(container, array) for container in containers):
+                merged = _container(list(set().union(*containers)))
+            else:
+                merged = _to_int(*(container for container in containers if isinstance(container, array)))
+                for container in containers:
+                    if isinstance(container, int):
+                        merged |= container
+            result._chunks[high] = merged
+            result._count += _count(merged)
+        return result
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, value: int) -> bool:
+        container = self._chunks.get(value >> CHUNK_BITS)
+        if container is None:
+            return False
+        low = value & LOW_MASK
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        i = bisect_left(container, low)
+        return i < len(container) and container[i] == low
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self._chunks):
+            container = self._chunks[high]
+            base = high << CHUNK_BITS
+            lows = container if isinstance(container, array) else _members(container)
+            for low in lows:
+                yield base | low
+
+    def add(self, value: int) -> None:
+        high, low = value >> CHUNK_BITS, value & LOW_MASK
+        container = self._chunks.get(high)
+        if container is None:
+            self._chunks[high] = array("H", (low,))
+        elif isinstance(container, int):
+            if container >> low & 1:
+                return
+            self._chunks[high] = container | 1 << low
+        else:
+            i = bisect_left(container, low)
+            if i < len(container) and container[i] == low:
+                return
+            container.insert(i, low)
+            if len(container) > ARRAY_LIMIT:
+                self._chunks[high] = _to_int(container)
+        self._count += 1
+
+    def discard(self, value: int) -> None:
+        high, low = value >> CHUNK_BITS, value & LOW_MASK
+        container = self._chunks.get(high)
+        if container is None or value not in self:
+            return
+        if isinstance(container, int):
+            container &= ~(1 << low)
+            if _popcount(container) <= ARRAY_LIMIT // 2:
+                container = array("H", _members(container))
+            self._chunks[high] = container
+        else:
+            del container[bisect_left(container, low)]
+        if not _count(self._chunks[high]):
+            del self._chunks[high]
+        self._count -= 1
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        result = Bitmap()
+        small, large = (self, other) if len(self._chunks) <= len(other._chunks) else (other, self)
+        for high, container in small._chunks.items():
+            match = large._chunks.get(high)
+            if match is None:
+                continue
+            common = _intersect(container, match)
+            count = _count(common)
+            if count:
+                result._chunks[high] = common
+                result._count += count
+        return result
+
+    def intersection_count(self, other: "Bitmap") -> int:
+        """``len(self & other)`` without building the intersection."""
+        small, large = (self, other) if len(self._chunks) <= len(other._chunks) else (other, self)
+        total = 0
+        for high, container in small._chunks.items():
+            match = large._chunks.get(high)
+            if match is not None:
+                total += _intersection_count(container, match)
+        return total
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap.union((self, other))
@@ -0,0 +1,294 @@
+"""
+In-process facet counts for product search.
+
+Admin search screens show counts next to the results ("Electronics
+(1,204)", "brand: Acme (310)"). Aggregating them with ``GROUP BY`` over the
+filtered products on every keystroke is the most expensive query we would
+run, so each worker keeps a ``FacetIndex`` instead: one compressed
+``Bitmap`` of product ids per category and per attribute value of the
+configured facet keys (``FACET_PRODUCT_ATTRIBUTES`` from the product,
+``FACET_SKU_ATTRIBUTES`` from any of its live SKUs), plus the bitmap of all
+live products.
+
+Unfiltered counts are the bitmaps' sizes. A filtered request intersects the
+bitmaps of its filters (smallest first) into the match set, and each
+attribute value's count is an intersection count against it. Category
+counts are tallied per product when the match set is smaller than the
+category bitmaps are to scan.
+
+Like the trigram index, the facet index is built on first use (values come
+from the attribute index tables, so no JSON is decoded), patched by bulk
+product and SKU writes made in the same process, and rebuilt when the
+products or SKUs watermark moves (checked every
+``SEARCH_INDEX_REFRESH_SECONDS``, see ``watermark``).
+"""
+import asyncio
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.attribute_index import ProductAttribute, SKUAttribute
+from app.models.product import Product
+from app.models.sku import SKU
+from app.services.search.bitmap import Bitmap
+from app.services.search.watermark import Watermark
+
+# (attribute key, value as text)
+Pair = Tuple[str, str]
+
+
+def facet_value(value: Any) -> Optional[str]:
+    """Text form of a scalar attribute value, as stored in the attribute index."""
+    if isinstance(value, bool):
+        text = "true" if value else "false"
+    elif isinstance(value, (str, int, float)):
+        text = str(value)
+    else:
+        return None
+    return text if len(text) <= 255 else None
+
+
+def facet_pairs(attributes: Optional[Dict[str, Any]], keys: Sequence[str]) -> FrozenSet[Pair]:
+    """``(key, value)`` pairs of the scalar ``keys`` entries in ``attributes``."""
+    pairs = set()
+    for key in keys:
+        text = facet_value((attributes or {}).get(key))
+        if text is not None:
+            pairs.add((key, text))
+    return frozenset(pairs)
+
+
+class FacetIndex:
+    """Per-category and per-attribute-value bitmaps of live product ids."""
+
+    def __init__(self, product_keys: Sequence[str], sku_keys: Sequence[str]):
+        self.product_keys = list(product_keys)
+        self.sku_keys = list(sku_keys)
+        self.keys = list(dict.fromkeys([*self.product_keys, *self.sku_keys]))
+        self.products = Bitmap()
+        self._categories: Dict[int, Bitmap] = {}
+        self._values: Dict[str, Dict[str, Bitmap]] = {key: {} for key in self.keys}
+        # product id -> (category id, pairs from the product, pairs from its SKUs)
+        self._records: Dict[int, Tuple[int, FrozenSet[Pair], FrozenSet[Pair]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def load(self, records: Dict[int, Tuple[int, FrozenSet[Pair], FrozenSet[Pair]]]) -> None:
+        """Replace the contents with ``records``, building each bitmap in one pass."""
+        categories: Dict[int, List[int]] = {}
+        values: Dict[Pair, List[int]] = {}
+        for product_id, (category_id, product_pairs, sku_pairs) in records.items():
+            categories.setdefault(category_id, []).append(product_id)
+            for pair in product_pairs | sku_pairs:
+                values.setdefault(pair, []).append(product_id)
+
+        self._records = records
+        self.products = Bitmap(records)
+        self._categories = {category_id: Bitmap(ids) for category_id, ids in categories.items()}
+        self._values = {key: {} for key in self.keys}
+        for (key, value), ids in values.items():
+            self._values[key][value] = Bitmap(ids)
+
+    def put(self, product_id: int, category_id: int, attributes: Optional[Dict[str, Any]]) -> None:
+        """Index a live product's category and attributes, keeping its SKU values."""
+        previous = self._records.get(product_id)
+        sku_pairs = previous[2] if previous else frozenset()
+        self._update(product_id, (category_id, facet_pairs(attributes, self.product_keys), sku_pairs))
+
+    def put_skus(self, product_id: int, pairs: Iterable[Pair]) -> None:
+        """Replace the ``(key, value)`` pairs an indexed product gets from its SKUs."""
+        previous = self._records.get(product_id)
+        if previous is None:
+            return
+        self._update(product_id, (previous[0], previous[1], frozenset(pairs)))
+
+    def remove(self, product_id: int) -> None:
+        """Drop a deleted product."""
+        self._update(product_id, None)
+
+    def category(self, category_id: int) -> Bitmap:
+        return self._categories.get(category_id) or Bitmap()
+
+    def value(self, key: str, value: str) -> Bitmap:
+        return self._values.get(key, {}).get(value) or Bitmap()
+
+    def match(self, sets: List[Bitmap]) -> Bitmap:
+        """Intersection of ``sets``, smallest first (all products when empty)."""
+        if not sets:
+            return self.products
+        sets = sorted(sets, key=len)
+        result = sets[0]
+        for other in sets[1:]:
+            if not result:
+                break
+            result = result & other
+        return result
+
+    def category_counts(self, matches: Optional[Bitmap]) -> Dict[int, int]:
+        """Products per (direct) category among ``matches`` (all when None)."""
+        if matches is None:
+            return {category_id: len(ids) for category_id, ids in self._categories.items()}
+        # Tally the matches one by one, or intersect every category bitmap
+        if len(matches) <= len(self._categories) * 8:
+            return dict(Counter(self._records[product_id][0] for product_id in matches))
+        counts = {category_id: matches.intersection_count(ids) for category_id, ids in self._categories.items()}
+        return {category_id: count for category_id, count in counts.items() if count}
+
+    def value_counts(self, key: str, matches: Optional[Bitmap], top: int) -> List[Tuple[str, int]]:
+        """The ``top`` most frequent values of ``key`` among ``matches``."""
+        counts = []
+        for value, ids in self._values.get(key, {}).items():
+            count = len(ids) if matches is None else matches.intersection_count(ids)
+            if count:
+                counts.append((value, count))
+        counts.sort(key=lambda item: (-item[1], item[0]))
+        return counts[:top]
+
+    # Private helper methods
+
+    def _update(self, product_id: int, record: Optional[Tuple[int, FrozenSet[Pair], FrozenSet[Pair]]]) -> None:
+        previous = self._records.pop(product_id, None)
+        old_category, old_pairs = (previous[0], previous[1] | previous[2]) if previous else (None, frozenset())
+        new_category, new_pairs = (record[0], record[1] | record[2]) if record else (None, frozenset())
+
+        if old_category != new_category:
+            if old_category is not None:
+                self._discard(self._categories, old_category, product_id)
+            if new_category is not None:
+                self._categories.setdefault(new_category, Bitmap()).add(product_id)
+        for key, value in old_pairs - new_pairs:
+            self._discard(self._values[key], value, product_id)
+        for key, value in new_pairs - old_pairs:
+            self._values[key].setdefault(value, Bitmap()).add(product_id)
+
+        if record is None:
+            self.products.discard(product_id)
+        else:
+            self.products.add(product_id)
+            self._records[product_id] = record
+
+    @staticmethod
+    def _discard(bitmaps: Dict, key, product_id: int) -> None:
+        ids = bitmaps.get(key)
+        if ids is None:
+            return
+        ids.discard(product_id)
+        if not ids:
+            del bitmaps[key]
+
+
+class ProductFacets:
+    """Holder building the worker's facet index on first use."""
+
+    def __init__(
+        self,
+        product_keys: Sequence[str],
+        sku_keys: Sequence[str],
+        batch_size: int = 10000,
+        refresh_seconds: float = settings.SEARCH_INDEX_REFRESH_SECONDS
+    ):
+        self.product_keys = product_keys
+        self.sku_keys = sku_keys
+        self.batch_size = batch_size
+        self.watermark = Watermark((Product, SKU), refresh_seconds)
+        self._index: Optional[FacetIndex] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    async def get(self, db: AsyncSession) -> FacetIndex:
+        """The index, built from live products and the attribute index when first requested or stale."""
+        if self._index is not None and not self.watermark.due():
+            return self._index
+
+        async with self._lock:
+            if self._index is not None and self.watermark.due() and await self.watermark.changed(db):
+                self._index = None
+            if self._index is None:
+                mark = await self.watermark.read(db)
+                index = FacetIndex(self.product_keys, self.sku_keys)
+                categories: Dict[int, int] = {}
+                async for partition in await self._stream(
+                    db, select(Product.id, Product.category_id).where(Product.is_deleted == False)
+                ):
+                    categories.update(partition)
+
+                product_pairs = await self._pairs(db, self._product_values(index.product_keys))
+                sku_pairs = await self._pairs(db, self._sku_values(index.sku_keys))
+                index.load({
+                    product_id: (
+                        category_id,
+                        frozenset(product_pairs.get(product_id, ())),
+                        frozenset(sku_pairs.get(product_id, ())),
+                    )
+                    for product_id, category_id in categories.items()
+                })
+                self._index = index
+                self.watermark.record(mark)
+            return self._index
+
+    def put(self, product: Product) -> None:
+        """Index a created or updated product (removes it when soft-deleted)."""
+        if self._index is None:
+            return
+        if product.is_deleted:
+            self._index.remove(product.id)
+        else:
+            self._index.put(product.id, product.category_id, product.attributes)
+
+    def remove(self, product_id: int) -> None:
+        """Drop a deleted product."""
+        if self._index is not None:
+            self._index.remove(product_id)
+
+    async def refresh_skus(self, db: AsyncSession, product_ids: Iterable[int]) -> None:
+        """Re-read the SKU values of products whose SKUs were written (one query)."""
+        product_ids = list(product_ids)
+        if self._index is None or not self._index.sku_keys or not product_ids:
+            return
+        pairs = await self._pairs(
+            db, self._sku_values(self._index.sku_keys).where(SKU.product_id.in_(product_ids))
+        )
+        for product_id in product_ids:
+            self._index.put_skus(product_id, pairs.get(product_id, ()))
+
+    def invalidate(self) -> None:
+        """Forget the index; the next request rebuilds it."""
+        self._index = None
+
+    # Private helper methods
+
+    @staticmethod
+    def _product_values(keys: Sequence[str]):
+        """``(product id, key, value)`` of indexed product attributes."""
+        return select(ProductAttribute.entity_id, ProductAttribute.key, ProductAttribute.value).where(
+            ProductAttribute.key.in_(keys)
+        )
+
+    @staticmethod
+    def _sku_values(keys: Sequence[str]):
+        """``(product id, key, value)`` of indexed attributes of live SKUs."""
+        return select(SKU.product_id, SKUAttribute.key, SKUAttribute.value).join(
+            SKU, SKU.id == SKUAttribute.entity_id
+        ).where(and_(SKUAttribute.key.in_(keys), SKU.is_deleted == False))
+
+    async def _stream(self, db: AsyncSession, query):
+        result = await db.stream(query.execution_options(yield_per=self.batch_size))
+        return result.partitions()
+
+    async def _pairs(self, db: AsyncSession, query) -> Dict[int, Set[Pair]]:
+        """Product id -> distinct ``(key, value)`` pairs selected by ``query``."""
+        pairs: Dict[int, Set[Pair]] = {}
+        async for partition in await self._stream(db, query):
+            for product_id, key, value in partition:
+                pairs.setdefault(product_id, set()).add((key, value))
+        return pairs
+
+
+product_facets = ProductFacets(settings.facet_product_attributes, settings.facet_sku_attributes)
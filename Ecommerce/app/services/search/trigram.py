@@ -0,0 +1,246 @@
+"""
+In-process trigram index for case-insensitive substring search on products.
+
+``ILIKE '%term%'`` cannot use a B-tree index, so every search scans the
+products table. This index keeps an inverted list per trigram (three-character
+substring of the casefolded text) holding sorted product ids. A query's
+trigram lists are intersected smallest first, optionally together with the
+category's id list (FR-023), and the surviving candidates are verified with a
+real substring check before ranking:
+
+    exact name > name prefix > word prefix in name > substring in name
+    > description only
+
+Terms shorter than three characters have no trigrams and fall back to
+verifying every indexed product.
+
+Each worker holds its own index, built from the database on first use and
+patched by product writes made in the same process. Other workers' writes
+are picked up by a rebuild once the products table's watermark moves, checked
+every ``SEARCH_INDEX_REFRESH_SECONDS`` (see ``watermark``).
+"""
+import asyncio
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.product import Product
+from app.services.search.watermark import Watermark
+
+_EMPTY = array("i")
+
+
+def trigrams(text: str) -> Set[str]:
+    """Distinct trigrams of already casefolded text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _contains(postings: array, product_id: int) -> bool:
+    i = bisect_left(postings, product_id)
+    return i < len(postings) and postings[i] == product_id
+
+
+def _intersect(postings: List[array]) -> Iterable[int]:
+    """Ids present in every posting list."""
+    postings = sorted(postings, key=len)
+    result: Iterable[int] = postings[0]
+    for other in postings[1:]:
+        candidates = len(result)
+        if not candidates:
+            break
+        if candidates * 16 < len(other):
+            # Few candidates: binary search each one in the long list
+            result = [product_id for product_id in result if _contains(other, product_id)]
+        else:
+            result = set(result).intersection(other)
+    return result
+
+
+class TrigramIndex:
+    """Trigram inverted index over product names (and optionally descriptions)."""
+
+    def __init__(self, index_description: bool = False):
+        self.index_description = index_description
+        self._names: Dict[int, str] = {}
+        self._descriptions: Dict[int, str] = {}
+        self._categories: Dict[int, int] = {}
+        self._postings: Dict[str, array] = {}
+        self._category_postings: Dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._names
+
+    def add(
+        self,
+        product_id: int,
+        name: str,
+        category_id: int,
+        description: Optional[str] = None
+    ) -> None:
+        """Index a product, replacing any previous entry for it."""
+        if product_id in self._names:
+            self.remove(product_id)
+
+        self._names[product_id] = name.casefold()
+        self._categories[product_id] = category_id
+        if self.index_description and description:
+            self._descriptions[product_id] = description.casefold()
+
+        for gram in self._grams(product_id):
+            self._insert(self._postings, gram, product_id)
+        self._insert(self._category_postings, category_id, product_id)
+
+    def remove(self, product_id: int) -> None:
+        """Drop a product from the index."""
+        if product_id not in self._names:
+            return
+
+        for gram in self._grams(product_id):
+            self._discard(self._postings, gram, product_id)
+        self._discard(self._category_postings, self._categories[product_id], product_id)
+
+        del self._names[product_id]
+        del self._categories[product_id]
+        self._descriptions.pop(product_id, None)
+
+    def search(
+        self,
+        query: str,
+        category_id: Optional[int] = None,
+        page: int = 1,
+        size: int = 20
+    ) -> Tuple[List[int], int]:
+        """Ranked product ids for one page of matches, plus the total count."""
+        ranked = self._ranked(query, category_id)
+        start = (page - 1) * size
+        return [product_id for _, _, product_id in ranked[start:start + size]], len(ranked)
+
+    def matching(self, query: str, category_id: Optional[int] = None) -> List[int]:
+        """Ids of every product matching ``query``, unranked."""
+        return [product_id for _, _, product_id in self._ranked(query, category_id, ordered=False)]
+
+    def _ranked(self, query: str, category_id: Optional[int], ordered: bool = True) -> List[Tuple[int, int, int]]:
+        """``(rank, name length, product_id)`` for every match, best first when ``ordered``."""
+        term = query.strip().casefold()
+
+        postings = [self._postings.get(gram, _EMPTY) for gram in trigrams(term)]
+        if category_id is not None:
+            postings.append(self._category_postings.get(category_id, _EMPTY))
+        candidates = _intersect(postings) if postings else self._names.keys()
+
+        # Inlined ranking: this loop runs once per candidate
+        names = self._names
+        descriptions = self._descriptions
+        word_term = f" {term}"
+        ranked = []
+        append = ranked.append
+        for product_id in candidates:
+            name = names[product_id]
+            position = name.find(term)
+            if position == 0:
+                rank = 0 if len(name) == len(term) else 1
+            elif position > 0:
+                # Word prefix anywhere in the name beats a mid-word match
+                rank = 2 if word_term in name else 3
+            elif descriptions and term in descriptions.get(product_id, ""):
+                rank = 4
+            else:
+                continue
+            append((rank, len(name), product_id))
+        if ordered:
+            ranked.sort()
+        return ranked
+
+    def _grams(self, product_id: int) -> Set[str]:
+        return trigrams(self._names[product_id]) | trigrams(self._descriptions.get(product_id, ""))
+
+    @staticmethod
+    def _insert(postings: Dict, key, product_id: int) -> None:
+        ids = postings.get(key)
+        if ids is None:
+            postings[key] = array("i", (product_id,))
+        elif ids[-1] < product_id:
+            # Bulk loads arrive in id order, so this is the common case
+            ids.append(product_id)
+        else:
+            insort(ids, product_id)
+
+    @staticmethod
+    def _discard(postings: Dict, key, product_id: int) -> None:
+        ids = postings.get(key)
+        if ids is None:
+            return
+        i = bisect_left(ids, product_id)
+        if i < len(ids) and ids[i] == product_id:
+            del ids[i]
+        if not ids:
+            del postings[key]
+
+
+class ProductSearchIndex:
+    """Holder building the worker's trigram index on first use."""
+
+    def __init__(
+        self,
+        index_description: bool = False,
+        batch_size: int = 10000,
+        refresh_seconds: float = settings.SEARCH_INDEX_REFRESH_SECONDS
+    ):
+        self.index_description = index_description
+        self.batch_size = batch_size
+        self.watermark = Watermark((Product,), refresh_seconds)
+        self._index: Optional[TrigramIndex] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> TrigramIndex:
+        """The index, built from live products when first requested or after other workers wrote."""
+        if self._index is not None and not self.watermark.due():
+            return self._index
+
+        async with self._lock:
+            if self._index is not None and self.watermark.due() and await self.watermark.changed(db):
+                self._index = None
+            if self._index is None:
+                # Read before building, so writes made meanwhile trigger the next rebuild
+                mark = await self.watermark.read(db)
+                index = TrigramIndex(index_description=self.index_description)
+                result = await db.stream(
+                    select(Product.id, Product.name, Product.category_id, Product.description)
+                    .where(Product.is_deleted == False)
+                    .order_by(Product.id)
+                    .execution_options(yield_per=self.batch_size)
+                )
+                async for partition in result.partitions():
+                    for product_id, name, category_id, description in partition:
+                        index.add(product_id, name, category_id, description)
+                self._index = index
+                self.watermark.record(mark)
+            return self._index
+
+    def put(self, product: Product) -> None:
+        """Index a created or updated product (removes it when soft-deleted)."""
+        if self._index is None:
+            return
+        if product.is_deleted:
+            self._index.remove(product.id)
+        else:
+            self._index.add(product.id, product.name, product.category_id, product.description)
+
+    def remove(self, product_id: int) -> None:
+        """Drop a deleted product."""
+        if self._index is not None:
+            self._index.remove(product_id)
+
+    def invalidate(self) -> None:
+        """Forget the index; the next search rebuilds it."""
+        self._index = None
+
+
+product_search_index = ProductSearchIndex(index_description=settings.SEARCH_INDEX_DESCRIPTION)
@@ -0,0 +1,52 @@
+"""
+Change detection for the in-process search indexes.
+
+The trigram and facet indexes are patched by writes made in their own
+worker but cannot see other workers' writes. ``Watermark`` bounds that
+staleness: at most once every ``SEARCH_INDEX_REFRESH_SECONDS`` a read of the
+index runs one aggregate query (row count and ``max(updated_at)`` per
+watched table) and the index is rebuilt when the result moved since it was
+built. Every write bumps ``updated_at`` and hard deletes (including
+archival) lower the count, so another worker's write shows up in this
+worker's index at most one interval (plus one rebuild) later.
+"""
+import time
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class Watermark:
+    """Row count and newest ``updated_at`` of some tables, checked on an interval."""
+
+    def __init__(self, models: Sequence[type], interval_seconds: float):
+        self.models = models
+        self.interval_seconds = interval_seconds
+        self._mark: Optional[Tuple] = None
+        self._checked_at = 0.0
+
+    def due(self) -> bool:
+        """Whether the last check is older than the interval."""
+        return time.monotonic() - self._checked_at > self.interval_seconds
+
+    async def read(self, db: AsyncSession) -> Tuple:
+        """The tables' current watermark (one query)."""
+        columns = []
+        for model in self.models:
+            columns.append(select(func.count()).select_from(model).scalar_subquery())
+            columns.append(select(func.max(model.updated_at)).scalar_subquery())
+        return tuple((await db.execute(select(*columns))).one())
+
+    def record(self, mark: Tuple) -> None:
+        """Remember ``mark`` as the state the index was built from."""
+        self._mark = mark
+        self._checked_at = time.monotonic()
+
+    async def changed(self, db: AsyncSession) -> bool:
+        """Whether the tables moved since the recorded mark; restarts the interval if not."""
+        mark = await self.read(db)
+        if mark != self._mark:
+            return True
+        self._checked_at = time.monotonic()
+        return False
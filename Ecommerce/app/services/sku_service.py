@@ -0,0 +1,95 @@
+"""
+SKU service for business logic operations.
+"""
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func
+
+from app.models.sku import SKU
+from app.schemas.sku import SKUSearchRequest
+from app.services.attribute_filter import AttributeFilter
+from app.services.loader_profile import SKU_PROFILE
+
+
+class SKUService:
+    """Service class for SKU operations."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_many(
+        self,
+        sku_ids: List[int],
+        expand: FrozenSet[str] = frozenset()
+    ) -> List[SKU]:
+        """Get live SKUs by ID in the order given, skipping unknown ones."""
+        if not sku_ids:
+            return []
+        result = await self.db.execute(
+            select(SKU).where(
+                and_(SKU.id.in_(sku_ids), SKU.is_deleted == False)
+            ).options(*SKU_PROFILE.options(expand))
+        )
+        by_id = {sku.id: sku for sku in result.scalars().all()}
+        return [by_id[sku_id] for sku_id in sku_ids if sku_id in by_id]
+
+    async def search(
+        self,
+        search: SKUSearchRequest,
+        attributes: Optional[Dict[str, str]] = None
+    ) -> Tuple[List[SKU], int]:
+        """
+        Filter live SKUs entirely in SQL, cheapest first.
+
+        Every filter maps to an indexed column: ``sku_code`` is a prefix match
+        on the code index (see ``_code_prefix``), ``product_id`` plus the price bounds walk
+        ``ix_skus_product_price`` and ``in_stock`` without a product walks
+        ``ix_skus_price_in_stock``; ``attributes`` filters go through the
+        attribute index. Returns one page and the total match count.
+        """
+        conditions = self._conditions(search)
+        if attributes:
+            conditions.append(await AttributeFilter(self.db, SKU).condition(attributes))
+        query = (
+            select(SKU)
+            .where(and_(*conditions))
+            .order_by(SKU.price, SKU.id)
+            .offset((search.page - 1) * search.size)
+            .limit(search.size)
+        )
+        result = await self.db.execute(query)
+        skus = list(result.scalars().all())
+
+        # A short first page is the whole result; skip the COUNT
+        if search.page == 1 and len(skus) < search.size:
+            return skus, len(skus)
+        total = await self.db.execute(select(func.count(SKU.id)).where(and_(*conditions)))
+        return skus, total.scalar() or 0
+
+    # Private helper methods
+
+    def _conditions(self, search: SKUSearchRequest) -> list:
+        conditions = [SKU.is_deleted == False]
+        if search.sku_code:
+            conditions.append(self._code_prefix(search.sku_code))
+        if search.product_id is not None:
+            conditions.append(SKU.product_id == search.product_id)
+        if search.min_price is not None:
+            conditions.append(SKU.price >= search.min_price)
+        if search.max_price is not None:
+            conditions.append(SKU.price <= search.max_price)
+        if search.in_stock is True:
+            conditions.append(SKU.inventory_count > 0)
+        elif search.in_stock is False:
+            conditions.append(SKU.inventory_count == 0)
+        return conditions
+
+    def _code_prefix(self, prefix: str):
+        """``sku_code`` starts with ``prefix`` (case-sensitive), in a form the code index serves."""
+        if self.db.bind.dialect.name == "sqlite":
+            # SQLite compares TEXT by code point (BINARY collation), so the
+            # range is exact and walks the index; its LIKE ignores ASCII case
+            return and_(SKU.sku_code >= prefix, SKU.sku_code < prefix + "\U0010ffff")
+        # A range is only exact under code-point collation; an escaped LIKE
+        # always is and uses ix_skus_code_not_deleted (text_pattern_ops)
+        return SKU.sku_code.startswith(prefix, autoescape=True)
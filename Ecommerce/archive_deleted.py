@@ -0,0 +1,35 @@
+"""
+Soft-delete archival script.
+
+Moves categories, products and SKUs soft-deleted longer ago than the
+retention window from the hot tables into their archive tables, in batches
+of one transaction each, and reports how many rows moved. Safe to run
+repeatedly, e.g. nightly from cron.
+
+Usage:
+    python archive_deleted.py [--retention-days N] [--batch-size N]
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.database import AsyncSessionLocal, engine
+from app.services.archive_service import ArchiveService
+
+
+async def archive(retention_days: int = None, batch_size: int = None):
+    """Archive every eligible tombstone."""
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        moved = await ArchiveService(session, retention_days=retention_days, batch_size=batch_size).archive()
+    await engine.dispose()
+    summary = ", ".join(f"{count} {table}" for table, count in moved.items())
+    print(f"Archived {summary} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move old soft-deleted rows to the archive tables.")
+    parser.add_argument("--retention-days", type=int, help="archive rows deleted longer ago than this")
+    parser.add_argument("--batch-size", type=int, help="rows per transaction")
+    args = parser.parse_args()
+    asyncio.run(archive(args.retention_days, args.batch_size))
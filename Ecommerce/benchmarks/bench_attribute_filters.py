@@ -0,0 +1,81 @@
+"""
+Attribute filter microbenchmarks on a generated catalog.
+
+Times one page of ``GET /products/``-style listings filtered on product
+attributes, once through the attribute index (``ProductService.get_all``
+with ``attributes``) and once as the JSON scan it replaces
+(``json_extract(attributes, '$.<key>') = <value>`` on every row), for a
+common filter, a rare value and a combination. Reports p50/p95/p99 per
+shape and saves them with ``benchmarks.results``.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_attribute_filters --catalog bench.db --repeat 50
+"""
+import argparse
+import asyncio
+import os
+from dataclasses import asdict
+from typing import Dict
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.product import Product
+from app.services.product_service import ProductService
+from benchmarks.bench_category_service import sample
+from benchmarks.catalog import add_spec_arguments, ensure_catalog, spec_from_args
+from benchmarks.results import save, summarize
+
+# label -> filters; values as they arrive in the query string
+SHAPES = {
+    "brand (1 in 10)": {"brand": "Acme"},
+    "weight (1 in 5000)": {"weight_g": "1234"},
+    "brand + material + weight": {"brand": "Acme", "material": "steel", "weight_g": "1234"},
+}
+
+
+async def json_scan(db: AsyncSession, filters: Dict[str, str]) -> None:
+    """The unindexed equivalent: decode every document until a page matches."""
+    conditions = [Product.is_deleted == False]
+    for key, value in filters.items():
+        extracted = func.json_extract(Product.attributes, f"$.{key}")
+        conditions.append(extracted == (int(value) if value.isdigit() else value))
+    await db.execute(
+        select(Product).where(and_(*conditions))
+        .order_by(Product.created_at.desc(), Product.id.desc()).limit(20)
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    spec = spec_from_args(args)
+    url = await ensure_catalog(os.path.abspath(args.catalog), spec)
+    engine = create_async_engine(url)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    async with Session() as db:
+        service = ProductService(db)
+        for label, filters in SHAPES.items():
+            indexed = summarize(await sample(lambda i: service.get_all(attributes=filters), args.repeat))
+            scanned = summarize(await sample(lambda i: json_scan(db, filters), args.repeat))
+            results[label] = {"indexed": indexed, "json_scan": scanned}
+            print(f"{label:<28} indexed p50 {indexed['p50_ms']:8.2f} ms  p95 {indexed['p95_ms']:8.2f} ms   "
+                  f"json scan p50 {scanned['p50_ms']:8.2f} ms  p95 {scanned['p95_ms']:8.2f} ms")
+
+    await engine.dispose()
+    path = save("attribute_filters", {"repeat": args.repeat, "catalog": asdict(spec)}, results, args.output)
+    print(f"saved {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog", default="bench.db", help="Catalog database file, created if missing")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per filter shape and strategy")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
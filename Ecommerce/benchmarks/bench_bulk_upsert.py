@@ -0,0 +1,118 @@
+"""
+Bulk upsert vs one-row-per-request SKU loading benchmark.
+
+Loads a generated supplier feed of SKUs into a scratch SQLite database twice:
+once the way the single-item write path does it (validation queries, one
+INSERT and one commit per SKU) and once through ``BulkService.upsert_skus``
+in request-sized batches. A second bulk pass re-submits the feed so every row
+takes the ON CONFLICT update path. Reports rows per second.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_bulk_upsert --rows 20000 200000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+from app.schemas.sku import SKUCreate
+from app.services.bulk_service import BulkService
+
+PRODUCTS = 1000
+BATCH_SIZE = 5000
+
+
+async def populate(engine) -> None:
+    """Create the schema plus one category of products to hang SKUs on."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        now = datetime(2025, 1, 1)
+        await conn.execute(insert(Category), [{
+            "name": "category", "path": "category", "level": 0, "version": 1,
+            "is_deleted": False, "created_at": now, "updated_at": now
+        }])
+        await conn.execute(insert(Product), [
+            {"name": f"product-{i}", "category_id": 1, "version": 1,
+             "is_deleted": False, "created_at": now, "updated_at": now}
+            for i in range(PRODUCTS)
+        ])
+
+
+def feed(rows: int, price: str = "9.99"):
+    return [
+        SKUCreate(sku_code=f"SKU-{i:07d}", product_id=i % PRODUCTS + 1,
+                  price=Decimal(price), inventory_count=i % 50, attributes={"size": "M"})
+        for i in range(rows)
+    ]
+
+
+async def load_row_by_row(db: AsyncSession, items) -> None:
+    """The single-item write path: two validation queries and a commit per SKU."""
+    for item in items:
+        product = await db.execute(
+            select(Product.id).where(and_(Product.id == item.product_id, Product.is_deleted == False))
+        )
+        assert product.scalar() is not None
+        duplicate = await db.execute(select(SKU.id).where(SKU.sku_code == item.sku_code))
+        assert duplicate.scalar() is None
+        db.add(SKU(sku_code=item.sku_code, product_id=item.product_id, price=item.price,
+                   inventory_count=item.inventory_count, attributes=item.attributes))
+        await db.commit()
+
+
+async def load_bulk(db: AsyncSession, items) -> None:
+    service = BulkService(db)
+    for start in range(0, len(items), BATCH_SIZE):
+        await service.upsert_skus(items[start:start + BATCH_SIZE])
+
+
+async def timed(engine, label: str, loader, items) -> None:
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with Session() as db:
+        started = time.perf_counter()
+        await loader(db, items)
+        elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {elapsed:8.2f} s   {len(items) / elapsed:>10,.0f} rows/s")
+
+
+async def run_rows(rows: int, row_by_row_max: int) -> None:
+    print(f"{rows:,} SKUs:")
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'single.db')}")
+        await populate(engine)
+        # The per-row path is linear but slow; time a prefix of the feed
+        await timed(engine, "one row per request", load_row_by_row, feed(min(rows, row_by_row_max)))
+        await engine.dispose()
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bulk.db')}")
+        await populate(engine)
+        await timed(engine, "bulk insert", load_bulk, feed(rows))
+        await timed(engine, "bulk upsert (all conflicts)", load_bulk, feed(rows, price="10.49"))
+        await engine.dispose()
+
+
+async def run(rows_list, row_by_row_max: int) -> None:
+    for rows in rows_list:
+        await run_rows(rows, row_by_row_max)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000, 200_000])
+    parser.add_argument("--row-by-row-max", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.row_by_row_max))
+
+
+if __name__ == "__main__":
+    main()
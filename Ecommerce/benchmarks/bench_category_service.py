@@ -0,0 +1,122 @@
+"""
+CategoryService microbenchmarks on a generated catalog.
+
+Times each ``CategoryService`` operation on its own against a catalog from
+``benchmarks.catalog`` (generated once and reused). Reads run with the
+response cache cleared before every call so they measure the database path;
+the category hierarchy snapshot stays warm as it does in a running worker.
+Writes touch categories near the leaves; created categories are deleted
+and moves are reversed, so the reused catalog keeps its shape. Reports p50/p95/p99 per
+operation and saves them with ``benchmarks.results``.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_category_service --catalog bench.db --repeat 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from dataclasses import asdict
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.cache import cache
+from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services.category_service import CategoryService
+from benchmarks.catalog import add_spec_arguments, ensure_catalog, spec_from_args
+from benchmarks.results import save, summarize
+
+
+async def sample(call: Callable[[int], Awaitable[None]], repeat: int, warmup: int = 5) -> List[float]:
+    """Wall times of ``call(i)`` in milliseconds, after ``warmup`` untimed calls."""
+    for i in range(warmup):
+        await call(i)
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        await call(warmup + i)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def run(args: argparse.Namespace) -> None:
+    spec = spec_from_args(args)
+    url = await ensure_catalog(os.path.abspath(args.catalog), spec)
+    engine = create_async_engine(url)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rng = random.Random(spec.seed)
+    leaves = spec.leaves
+    inner = range(1, leaves.start)
+    results: Dict[str, Dict[str, float]] = {}
+
+    def uncached(call):
+        async def wrapped(i: int) -> None:
+            await cache.clear()
+            await call(i)
+        return wrapped
+
+    async with Session() as db:
+        service = CategoryService(db)
+        ids = [rng.randrange(1, spec.categories + 1) for _ in range(args.repeat + 5)]
+        parents = [rng.choice(inner) for _ in range(args.repeat + 5)]
+        moves = [(rng.choice(leaves), rng.choice(inner)) for _ in range(args.repeat + 5)]
+
+        created: List[int] = []
+
+        async def create_leaf(i: int) -> None:
+            category = await service.create(CategoryCreate(name=f"bench-{i}", parent_id=parents[i]))
+            created.append(category.id)
+
+        async def move_and_back(i: int) -> None:
+            category_id, new_parent_id = moves[i]
+            category = await service.get_by_id(category_id)
+            old_parent_id = category.parent_id
+            await service.move(category_id, new_parent_id)
+            await service.move(category_id, old_parent_id)
+
+        operations = {
+            "get_by_id": uncached(lambda i: service.get_by_id(ids[i])),
+            "get_by_id_expand_products": uncached(
+                lambda i: service.get_by_id(ids[i], expand=frozenset({"products"}))
+            ),
+            "get_all_children": uncached(lambda i: service.get_all(parent_id=parents[i], size=20)),
+            "get_all_deep_page": uncached(lambda i: service.get_all(page=100, size=20)),
+            "get_tree_root": uncached(lambda i: service.get_tree(root_id=(i % spec.roots) + 1, max_depth=3)),
+            "get_tree_all": uncached(lambda i: service.get_tree(max_depth=2)),
+            "create_leaf": create_leaf,
+            "update_description": lambda i: service.update(
+                ids[i], CategoryUpdate(description=f"Updated {i}")
+            ),
+            # Two moves per sample, so halve the figure for one move
+            "move_leaf_and_back": move_and_back,
+        }
+        selected = args.only or list(operations)
+        for name in selected:
+            samples = await sample(operations[name], args.repeat)
+            results[name] = summarize(samples)
+            print(f"{name:<28} p50 {results[name]['p50_ms']:8.2f} ms   "
+                  f"p95 {results[name]['p95_ms']:8.2f} ms   p99 {results[name]['p99_ms']:8.2f} ms")
+
+        for category_id in created:
+            await service.delete(category_id, force=True)
+
+    await engine.dispose()
+    path = save("category_service", {"repeat": args.repeat, "catalog": asdict(spec)}, results, args.output)
+    print(f"saved {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog", default="bench.db", help="Catalog database file, created if missing")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--only", nargs="+", help="Run only these operations")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
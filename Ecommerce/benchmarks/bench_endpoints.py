@@ -0,0 +1,157 @@
+"""
+In-process ASGI load driver for the read endpoints.
+
+Serves the app through ``httpx.AsyncClient(app=...)`` against a catalog from
+``benchmarks.catalog`` and, for each concurrency level of the sweep, keeps
+that many clients issuing a fixed, seeded mix of GET requests until
+``--requests`` have completed. Reports throughput plus p50/p95/p99 latency
+overall and per route, flags levels whose p95 breaks the 500 ms target of
+NFR-005, and saves everything with ``benchmarks.results``.
+
+Client and server share one event loop and process, so absolute numbers
+include client overhead and exclude network and multi-worker effects; they
+are meant for comparing runs of this driver against each other.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_endpoints --catalog bench.db --concurrency 1 8 32 64
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from collections import defaultdict
+from dataclasses import asdict
+from typing import Dict, List, Tuple
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.cache import cache
+from app.core.database import engine_options, get_db, get_read_db
+from app.main import app
+from benchmarks.catalog import CatalogSpec, add_spec_arguments, ensure_catalog, spec_from_args
+from benchmarks.results import save, summarize
+
+TARGET_P95_MS = 500  # NFR-005
+
+# (route label, weight)
+MIX = [
+    ("GET /categories/{id}", 15),
+    ("GET /categories/?parent_id", 10),
+    ("GET /categories/tree", 5),
+    ("GET /products/", 15),
+    ("GET /products/?category_id", 15),
+    ("GET /products/{id}", 25),
+    ("GET /products/{id}?expand=category", 5),
+    ("GET /products/search", 10),
+]
+
+SEARCH_TERMS = ["headphones", "kettle", "acme lamp", "rugged tent", "smart watch", "backpack"]
+
+
+def request_plan(spec: CatalogSpec, count: int, seed: int) -> List[Tuple[str, str]]:
+    """``count`` seeded ``(route label, URL)`` pairs following ``MIX``."""
+    rng = random.Random(seed)
+    labels = rng.choices([label for label, _ in MIX], weights=[weight for _, weight in MIX], k=count)
+    inner = range(1, spec.leaves.start)
+    plan = []
+    for label in labels:
+        category_id = rng.randrange(1, spec.categories + 1)
+        product_id = rng.randrange(1, spec.products + 1)
+        url = {
+            "GET /categories/{id}": f"/api/v1/categories/{category_id}",
+            "GET /categories/?parent_id": f"/api/v1/categories/?parent_id={rng.choice(inner)}",
+            "GET /categories/tree": f"/api/v1/categories/tree?root_id={rng.randrange(1, spec.roots + 1)}",
+            "GET /products/": f"/api/v1/products/?page={rng.randint(1, 5)}",
+            "GET /products/?category_id": f"/api/v1/products/?category_id={rng.choice(spec.leaves)}",
+            "GET /products/{id}": f"/api/v1/products/{product_id}",
+            "GET /products/{id}?expand=category": f"/api/v1/products/{product_id}?expand=category",
+            "GET /products/search": f"/api/v1/products/search?query={rng.choice(SEARCH_TERMS)}",
+        }[label]
+        plan.append((label, url))
+    return plan
+
+
+async def drive(client: AsyncClient, plan: List[Tuple[str, str]], concurrency: int) -> Dict:
+    """Run ``plan`` with ``concurrency`` concurrent clients; latency and throughput stats."""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    pending = iter(plan)
+
+    async def worker() -> None:
+        for label, url in pending:
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies[label].append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 500:
+                errors[label] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    overall = summarize([sample for samples in latencies.values() for sample in samples])
+    return {
+        "throughput_rps": round(len(plan) / elapsed, 1),
+        "errors": sum(errors.values()),
+        "meets_nfr_005": overall["p95_ms"] < TARGET_P95_MS,
+        "overall": overall,
+        "routes": {label: {**summarize(samples), "errors": errors[label]} for label, samples in latencies.items()},
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    spec = spec_from_args(args)
+    url = await ensure_catalog(os.path.abspath(args.catalog), spec)
+    # The app's own pool settings, so pool waits show up at high concurrency
+    engine = create_async_engine(url, **engine_options(url))
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def bench_db() -> AsyncSession:
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = bench_db
+    app.dependency_overrides[get_read_db] = bench_db
+
+    results = {}
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        # Warm the hierarchy snapshot and connection pool outside the timings
+        await drive(client, request_plan(spec, 50, args.seed + 1), max(args.concurrency))
+        for concurrency in args.concurrency:
+            if args.cold_cache:
+                await cache.clear()
+            level = await drive(client, request_plan(spec, args.requests, args.seed), concurrency)
+            results[f"c{concurrency}"] = level
+            overall = level["overall"]
+            print(f"concurrency {concurrency:>3}: {level['throughput_rps']:8.1f} req/s   "
+                  f"p50 {overall['p50_ms']:7.2f} ms   p95 {overall['p95_ms']:7.2f} ms   "
+                  f"p99 {overall['p99_ms']:7.2f} ms   errors {level['errors']}"
+                  f"{'' if level['meets_nfr_005'] else '   p95 over 500 ms'}")
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    path = save("endpoints", {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "cold_cache": args.cold_cache,
+        "catalog": asdict(spec),
+    }, results, args.output)
+    print(f"saved {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog", default="bench.db", help="Catalog database file, created if missing")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--cold-cache", action="store_true", help="Clear the response cache before each level")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Streaming export vs paged ORM export benchmark.
+
+Fills a scratch SQLite database with products, then exports the table as
+NDJSON twice: by paging through ``ProductService.get_all`` and serializing
+ORM instances (what a client-side export does today), and through
+``ExportService.stream``. Reports wall time, throughput and the peak Python
+heap measured with tracemalloc.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_export --rows 100000 1000000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.schemas.product import Product as ProductSchema
+from app.services.export_service import ExportEntity, ExportService
+from app.services.product_service import ProductService
+from benchmarks.bench_product_search import populate
+
+PAGE_SIZE = 100
+
+
+async def paged_export(db: AsyncSession) -> int:
+    """Page through get_all, serializing every page through the response schema."""
+    written, page = 0, 1
+    while True:
+        products = await ProductService(db).get_all(page=page, size=PAGE_SIZE)
+        if not products:
+            return written
+        for product in products:
+            written += len(ProductSchema.model_validate(product).model_dump_json()) + 1
+        page += 1
+
+
+async def streamed_export(db: AsyncSession) -> int:
+    written = 0
+    async for chunk in ExportService(db).stream(ExportEntity.products):
+        written += len(chunk)
+    return written
+
+
+async def measure(Session, label: str, export, rows: int) -> None:
+    async with Session() as db:
+        tracemalloc.start()
+        started = time.perf_counter()
+        size = await export(db)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"  {label:<20} {elapsed:8.2f} s   {rows / elapsed:>9,.0f} rows/s   "
+          f"peak heap {peak / 2**20:7.1f} MiB   {size / 2**20:7.1f} MiB written")
+
+
+async def run_rows(rows: int) -> None:
+    print(f"{rows:,} products:")
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        await populate(engine, rows)
+        Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await measure(Session, "paged get_all", paged_export, rows)
+        await measure(Session, "streaming export", streamed_export, rows)
+        await engine.dispose()
+
+
+async def run(rows_list) -> None:
+    for rows in rows_list:
+        await run_rows(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    asyncio.run(run(args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Facet count microbenchmarks on a generated catalog.
+
+Times the facet counts of a product search (categories plus the top values
+of every facet key) for a few search shapes, once from the in-process
+bitmap index (``ProductService.facets`` on a warm worker) and once as the
+SQL it replaces: one ``GROUP BY`` per facet over the matching products,
+grouped through the attribute index tables. Also reports how long the cold
+index build takes. Saves p50/p95/p99 with ``benchmarks.results``.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_facets --catalog bench.db --repeat 20
+"""
+import argparse
+import asyncio
+import os
+import time
+from dataclasses import asdict
+from typing import Any, Dict
+
+from sqlalchemy import and_, distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models.attribute_index import ProductAttribute, SKUAttribute
+from app.models.product import Product
+from app.models.sku import SKU
+from app.services.category_hierarchy import category_hierarchy
+from app.services.product_service import ProductService
+from app.services.search.facets import product_facets
+from app.services.search.trigram import product_search_index
+from benchmarks.bench_category_service import sample
+from benchmarks.catalog import add_spec_arguments, ensure_catalog, spec_from_args
+from benchmarks.results import save, summarize
+
+# label -> ProductService.facets arguments
+SHAPES: Dict[str, Dict[str, Any]] = {
+    "all products": {},
+    "query 'jacket'": {"query": "jacket"},
+    "root category subtree": {"category_id": 1},
+    "query + brand + color": {"query": "jacket", "attributes": {"brand": "Acme", "color": "red"}},
+}
+
+
+async def group_by(db: AsyncSession, query: str = None, category_id: int = None,
+                   attributes: Dict[str, str] = None) -> None:
+    """The SQL equivalent: filter the products, then one GROUP BY per facet."""
+    conditions = [Product.is_deleted == False]
+    if category_id is not None:
+        hierarchy = await category_hierarchy.get(db)
+        conditions.append(Product.category_id.in_([category_id, *hierarchy.descendants(category_id)]))
+    if query:
+        conditions.append(Product.name.ilike(f"%{query}%"))
+    for key, value in (attributes or {}).items():
+        side, owner = (SKUAttribute, SKU.product_id) if key in settings.facet_sku_attributes else \
+            (ProductAttribute, Product.id)
+        matches = select(side.entity_id).where(and_(side.key == key, side.value == value))
+        if side is SKUAttribute:
+            matches = select(SKU.product_id).where(and_(SKU.id.in_(matches), SKU.is_deleted == False))
+        conditions.append(Product.id.in_(matches))
+    matched = select(Product.id).where(and_(*conditions))
+
+    await db.execute(
+        select(Product.category_id, func.count()).where(Product.id.in_(matched)).group_by(Product.category_id)
+    )
+    for key in settings.facet_product_attributes:
+        count = func.count().label("n")
+        await db.execute(
+            select(ProductAttribute.value, count)
+            .where(and_(ProductAttribute.key == key, ProductAttribute.entity_id.in_(matched)))
+            .group_by(ProductAttribute.value).order_by(count.desc()).limit(settings.FACET_TOP_VALUES)
+        )
+    for key in settings.facet_sku_attributes:
+        count = func.count(distinct(SKU.product_id)).label("n")
+        await db.execute(
+            select(SKUAttribute.value, count)
+            .join(SKU, SKU.id == SKUAttribute.entity_id)
+            .where(and_(SKUAttribute.key == key, SKU.is_deleted == False, SKU.product_id.in_(matched)))
+            .group_by(SKUAttribute.value).order_by(count.desc()).limit(settings.FACET_TOP_VALUES)
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    spec = spec_from_args(args)
+    url = await ensure_catalog(os.path.abspath(args.catalog), spec)
+    engine = create_async_engine(url)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    results: Dict[str, Any] = {}
+    async with Session() as db:
+        started = time.perf_counter()
+        await product_facets.get(db)
+        await product_search_index.get(db)
+        results["cold_build_s"] = time.perf_counter() - started
+        print(f"facet + trigram index build: {results['cold_build_s']:.1f} s")
+
+        service = ProductService(db)
+        for label, kwargs in SHAPES.items():
+            bitmaps = summarize(await sample(lambda i: service.facets(**kwargs), args.repeat))
+            grouped = summarize(await sample(lambda i: group_by(db, **kwargs), args.repeat, warmup=1))
+            results[label] = {"bitmaps": bitmaps, "group_by": grouped}
+            print(f"{label:<24} bitmaps p50 {bitmaps['p50_ms']:8.2f} ms  p95 {bitmaps['p95_ms']:8.2f} ms   "
+                  f"GROUP BY p50 {grouped['p50_ms']:8.2f} ms  p95 {grouped['p95_ms']:8.2f} ms")
+
+    await engine.dispose()
+    path = save("facets", {"repeat": args.repeat, "catalog": asdict(spec)}, results, args.output)
+    print(f"saved {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog", default="bench.db", help="Catalog database file, created if missing")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per shape and strategy")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
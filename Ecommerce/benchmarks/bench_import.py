@@ -0,0 +1,111 @@
+"""
+Catalog import throughput benchmark.
+
+Writes a generated product feed (NDJSON and CSV) and imports it into a
+scratch SQLite database with ``ImportService``, reporting rows per second.
+A second run interrupts the import half-way and times the resumed run.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_import --rows 200000
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.category import Category
+from app.services.bulk_service import BulkService
+from app.services.import_service import ImportEntity, ImportService
+from benchmarks.bench_product_search import CATEGORIES, product_name
+
+
+def write_feeds(directory: str, rows: int):
+    rng = random.Random(42)
+    records = [
+        {"name": product_name(rng), "description": "Generated product", "category_id": rng.randint(1, CATEGORIES),
+         "attributes": {"weight_g": rng.randint(50, 5000)}}
+        for _ in range(rows)
+    ]
+    ndjson_path = os.path.join(directory, "feed.ndjson")
+    with open(ndjson_path, "w") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+    csv_path = os.path.join(directory, "feed.csv")
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "description", "category_id", "attributes"])
+        writer.writerows([r["name"], r["description"], r["category_id"], json.dumps(r["attributes"])]
+                         for r in records)
+    return ndjson_path, csv_path
+
+
+async def fresh_database(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        now = datetime(2025, 1, 1)
+        await conn.execute(insert(Category), [
+            {"name": f"category-{i}", "path": f"category-{i}", "level": 0, "version": 1,
+             "is_deleted": False, "created_at": now, "updated_at": now}
+            for i in range(1, CATEGORIES + 1)
+        ])
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def run(rows: int, chunk_size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        feeds = write_feeds(tmp, rows)
+        print(f"{rows:,} products, {chunk_size:,} rows per chunk:")
+        for feed in feeds:
+            engine, Session = await fresh_database(os.path.join(tmp, f"{os.path.basename(feed)}.db"))
+            async with Session() as db:
+                result = await ImportService(db, chunk_size=chunk_size).run(feed, ImportEntity.products)
+            print(f"  {os.path.basename(feed):<14} {result.elapsed_seconds:7.2f} s   "
+                  f"{result.rows_per_second:>9,.0f} rows/s")
+            await engine.dispose()
+
+        # Fail half-way through, then resume
+        engine, Session = await fresh_database(os.path.join(tmp, "resume.db"))
+        upsert_products = BulkService.upsert_products
+        calls = 0
+
+        async def failing_upsert(self, items):
+            nonlocal calls
+            calls += 1
+            if calls > rows // chunk_size // 2:
+                raise RuntimeError("interrupted")
+            return await upsert_products(self, items)
+
+        BulkService.upsert_products = failing_upsert
+        async with Session() as db:
+            try:
+                await ImportService(db, chunk_size=chunk_size).run(feeds[0], ImportEntity.products)
+            except RuntimeError:
+                pass
+        BulkService.upsert_products = upsert_products
+        async with Session() as db:
+            started = time.perf_counter()
+            result = await ImportService(db, chunk_size=chunk_size).run(feeds[0], ImportEntity.products)
+        print(f"  resumed after {result.resumed_from:,} rows: {result.rows_written:,} rows in "
+              f"{time.perf_counter() - started:.2f} s (including checksum)")
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
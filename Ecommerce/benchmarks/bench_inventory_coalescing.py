@@ -0,0 +1,111 @@
+"""
+Hot-SKU write coalescing benchmark.
+
+Fires ``--concurrency`` concurrent single-unit decrements at one SKU in a
+scratch SQLite database, either each in its own transaction through
+``InventoryService.adjust`` or queued on an ``InventoryCoalescer`` flushing
+every ``--interval-ms``, and reports throughput, latency percentiles, the
+number of row updates written and the coalescing ratio.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_inventory_coalescing --concurrency 100 500 --interval-ms 5 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import engine_options
+from app.models.sku import SKU
+from app.services.inventory_coalescer import InventoryCoalescer
+from app.services.inventory_service import InsufficientInventory, InventoryService
+from benchmarks.bench_inventory_contention import populate
+from benchmarks.results import save, summarize
+
+
+async def measure(label: str, concurrency: int, interval_ms: int = 0) -> dict:
+    stock = concurrency * 2
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_async_engine(url, **{**engine_options(url), "pool_timeout": 300})
+        await populate(engine, stock)
+        Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        coalescer = None
+        if interval_ms:
+            coalescer = InventoryCoalescer(Session, interval_ms=interval_ms, max_events=500)
+            coalescer.start()
+
+        latencies, outcomes = [], {"ok": 0, "insufficient": 0, "failed": 0}
+
+        async def one() -> None:
+            started = time.perf_counter()
+            try:
+                if coalescer is not None:
+                    await coalescer.adjust(1, -1)
+                else:
+                    async with Session() as session:
+                        await InventoryService(session).adjust(1, -1)
+                outcomes["ok"] += 1
+            except InsufficientInventory:
+                outcomes["insufficient"] += 1
+            except exc.OperationalError:
+                outcomes["failed"] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        stats = {"rows_updated": outcomes["ok"], "coalescing_ratio": 1.0}
+        if coalescer is not None:
+            await coalescer.close()
+            stats = {key: coalescer.stats()[key] for key in ("rows_updated", "coalescing_ratio")}
+        async with Session() as session:
+            final = (await session.get(SKU, 1)).inventory_count
+        await engine.dispose()
+
+    result = {
+        **summarize(latencies),
+        "throughput_rps": round(concurrency / elapsed, 1),
+        **outcomes,
+        **stats,
+        "final_inventory": final,
+        "lost_updates": final - (stock - outcomes["ok"]),
+    }
+    print(f"{label:<16} c={concurrency:<4} {result['throughput_rps']:8.1f} dec/s   "
+          f"p50 {result['p50_ms']:8.2f} ms   p99 {result['p99_ms']:8.2f} ms   "
+          f"rows {result['rows_updated']:>4}   ratio {result['coalescing_ratio']:>6}   "
+          f"lost {result['lost_updates']}")
+    return result
+
+
+async def run(args: argparse.Namespace) -> None:
+    results = {}
+    for concurrency in args.concurrency:
+        level = {"direct": await measure("direct", concurrency)}
+        for interval_ms in args.interval_ms:
+            level[f"coalesced_{interval_ms}ms"] = await measure(
+                f"coalesced {interval_ms}ms", concurrency, interval_ms
+            )
+        results[f"c{concurrency}"] = level
+    path = save("inventory_coalescing", {
+        "concurrency": args.concurrency, "interval_ms": args.interval_ms
+    }, results, args.output)
+    print(f"saved {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--interval-ms", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
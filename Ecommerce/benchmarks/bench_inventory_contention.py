@@ -0,0 +1,131 @@
+"""
+Hot-SKU inventory contention benchmark.
+
+Fires ``--concurrency`` concurrent single-unit decrements at one SKU in a
+scratch SQLite database, each from its own session, in two ways:
+
+- read-modify-write: load the SKU, decrement ``inventory_count`` in Python
+  and write it back, as an update through the ORM would
+- atomic: ``InventoryService.adjust``, one guarded ``UPDATE ... RETURNING``
+
+and reports throughput, latency percentiles and how many decrements were
+lost (final count above what the successful decrements imply).
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_inventory_contention --concurrency 100 500
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import exc, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, engine_options
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+from app.services.inventory_service import InsufficientInventory, InventoryService
+from benchmarks.results import save, summarize
+
+
+async def populate(engine, stock: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        now = datetime(2025, 1, 1)
+        audit = {"version": 1, "is_deleted": False, "created_at": now, "updated_at": now}
+        await conn.execute(insert(Category), [{"name": "hot", "path": "hot", "level": 0, **audit}])
+        await conn.execute(insert(Product), [{"name": "hot", "category_id": 1, **audit}])
+        await conn.execute(insert(SKU), [{
+            "sku_code": "HOT", "product_id": 1, "price": Decimal("9.99"),
+            "inventory_count": stock, "attributes": {"color": "red"}, **audit
+        }])
+
+
+async def read_modify_write(session: AsyncSession) -> None:
+    sku = (await session.execute(select(SKU).where(SKU.id == 1))).scalar_one()
+    count = sku.inventory_count
+    if count < 1:
+        raise InsufficientInventory("Insufficient inventory")
+    # Yield as a request handler would between its read and its write
+    await asyncio.sleep(0)
+    sku.inventory_count = count - 1
+    sku.version += 1
+    await session.commit()
+
+
+async def atomic(session: AsyncSession) -> None:
+    await InventoryService(session).adjust(1, -1)
+
+
+async def measure(label: str, decrement, concurrency: int, stock: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        # The app's pool settings: at most pool_size + max_overflow sessions write at once
+        engine = create_async_engine(url, **{**engine_options(url), "pool_timeout": 300})
+        await populate(engine, stock)
+        Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        latencies, outcomes = [], {"ok": 0, "insufficient": 0, "failed": 0}
+
+        async def one() -> None:
+            started = time.perf_counter()
+            async with Session() as session:
+                try:
+                    await decrement(session)
+                    outcomes["ok"] += 1
+                except InsufficientInventory:
+                    outcomes["insufficient"] += 1
+                except exc.OperationalError:
+                    # "database is locked" once the busy timeout runs out
+                    outcomes["failed"] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        async with Session() as session:
+            final = (await session.get(SKU, 1)).inventory_count
+        await engine.dispose()
+
+    lost = final - (stock - outcomes["ok"])
+    result = {
+        **summarize(latencies),
+        "throughput_rps": round(concurrency / elapsed, 1),
+        **outcomes,
+        "final_inventory": final,
+        "lost_updates": lost,
+    }
+    print(f"{label:<18} c={concurrency:<4} {result['throughput_rps']:8.1f} dec/s   "
+          f"p50 {result['p50_ms']:8.2f} ms   p99 {result['p99_ms']:8.2f} ms   "
+          f"ok {outcomes['ok']:>4}   failed {outcomes['failed']:>3}   lost {lost:>4}")
+    return result
+
+
+async def run(args: argparse.Namespace) -> None:
+    results = {}
+    for concurrency in args.concurrency:
+        stock = concurrency * 2
+        results[f"c{concurrency}"] = {
+            "read_modify_write": await measure("read-modify-write", read_modify_write, concurrency, stock),
+            "atomic": await measure("atomic", atomic, concurrency, stock),
+        }
+    path = save("inventory_contention", {"concurrency": args.concurrency}, results, args.output)
+    print(f"saved {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Offset vs keyset pagination benchmark.
+
+Fills a scratch SQLite database with categories and products, then times
+fetching one deep page through ``CategoryService.get_all`` and
+``ProductService.get_all`` in both offset and cursor mode.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_pagination --rows 1000000 --page 1000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.category import Category
+from app.models.product import Product
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+
+CHUNK_SIZE = 50_000
+
+
+async def populate(engine, rows: int) -> None:
+    """Insert ``rows`` categories and ``rows`` products in bulk."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime(2025, 1, 1)
+    for start in range(0, rows, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, rows)
+        async with engine.begin() as conn:
+            await conn.execute(insert(Category), [
+                {
+                    "name": f"category-{i:08d}",
+                    "path": f"category-{i:08d}",
+                    "level": 0,
+                    "version": 1,
+                    "is_deleted": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, stop)
+            ])
+            await conn.execute(insert(Product), [
+                {
+                    "name": f"product-{i:08d}",
+                    "category_id": 1,
+                    "version": 1,
+                    "is_deleted": False,
+                    "created_at": now + timedelta(seconds=i),
+                    "updated_at": now,
+                }
+                for i in range(start, stop)
+            ])
+
+
+async def time_call(factory, repeat: int) -> float:
+    """Median wall time of ``factory()`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def run(rows: int, page: int, size: int, repeat: int) -> None:
+    """Run the benchmark against a scratch database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        started = time.perf_counter()
+        await populate(engine, rows)
+        print(f"populated {rows:,} categories and products in {time.perf_counter() - started:.1f}s")
+
+        Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with Session() as db:
+            for label, service in (("categories", CategoryService(db)), ("products", ProductService(db))):
+                # Cursor pointing at the end of page - 1, as a client would hold it
+                previous = await service.get_all(page=page - 1, size=size)
+                cursor = service.next_cursor(previous, size)
+
+                offset_ms = await time_call(lambda: service.get_all(page=page, size=size), repeat)
+                cursor_ms = await time_call(lambda: service.get_all(size=size, cursor=cursor), repeat)
+                print(f"{label:<10} page {page}: offset {offset_ms:8.2f} ms   cursor {cursor_ms:8.2f} ms")
+
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.page, args.size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
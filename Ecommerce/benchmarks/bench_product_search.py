@@ -0,0 +1,122 @@
+"""
+Trigram index vs LIKE product search benchmark.
+
+Fills a scratch SQLite database with generated product names, then times a
+page of results plus the total count for several queries, once through
+``lower(name) LIKE '%term%'`` and once through the in-process trigram index.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_product_search --rows 100000 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.category import Category
+from app.models.product import Product
+from app.schemas.product import ProductSearchRequest
+from app.services.product_service import ProductService
+from app.services.search.trigram import product_search_index
+
+CHUNK_SIZE = 50_000
+CATEGORIES = 50
+QUERIES = ["headphones", "wireless", "drone 7", "steel", "xq", "ultra slim charger"]
+
+BRANDS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka"]
+ADJECTIVES = ["Wireless", "Ultra", "Slim", "Portable", "Smart", "Classic", "Steel", "Compact", "Pro"]
+NOUNS = ["Headphones", "Speaker", "Charger", "Keyboard", "Mouse", "Monitor", "Lamp", "Kettle",
+         "Backpack", "Watch", "Camera", "Blender", "Router", "Tablet", "Drone"]
+
+
+def product_name(rng: random.Random) -> str:
+    return (f"{rng.choice(BRANDS)} {rng.choice(ADJECTIVES)} {rng.choice(ADJECTIVES)} "
+            f"{rng.choice(NOUNS)} {rng.randint(1, 9)}{rng.choice('ABCDEFGHJK')}{rng.randint(10, 999)}")
+
+
+async def populate(engine, rows: int) -> None:
+    """Insert ``rows`` products spread over a few categories."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(42)
+    now = datetime(2025, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(insert(Category), [
+            {"name": f"category-{i}", "path": f"category-{i}", "level": 0, "version": 1,
+             "is_deleted": False, "created_at": now, "updated_at": now}
+            for i in range(1, CATEGORIES + 1)
+        ])
+    for start in range(0, rows, CHUNK_SIZE):
+        async with engine.begin() as conn:
+            await conn.execute(insert(Product), [
+                {"name": product_name(rng), "category_id": rng.randint(1, CATEGORIES), "version": 1,
+                 "is_deleted": False, "created_at": now, "updated_at": now}
+                for _ in range(start, min(start + CHUNK_SIZE, rows))
+            ])
+
+
+async def like_search(db: AsyncSession, term: str, size: int = 20):
+    """The LIKE baseline: one page plus a total count."""
+    condition = func.lower(Product.name).like(f"%{term.lower()}%") & (Product.is_deleted == False)
+    page = await db.execute(select(Product).where(condition).order_by(Product.id).limit(size))
+    total = await db.execute(select(func.count(Product.id)).where(condition))
+    return list(page.scalars().all()), total.scalar()
+
+
+async def time_call(factory, repeat: int) -> float:
+    """Median wall time of ``factory()`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def run_rows(rows: int, repeat: int) -> None:
+    """Benchmark one catalog size against a fresh database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        await populate(engine, rows)
+        Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with Session() as db:
+            product_search_index.invalidate()
+            started = time.perf_counter()
+            await product_search_index.get(db)
+            print(f"{rows:,} products: index built in {time.perf_counter() - started:.1f}s")
+
+            service = ProductService(db)
+            for term in QUERIES:
+                _, total = await service.search(ProductSearchRequest(query=term))
+                like_ms = await time_call(lambda: like_search(db, term), repeat)
+                index_ms = await time_call(lambda: service.search(ProductSearchRequest(query=term)), repeat)
+                print(f"  {term!r:<22} {total:>8,} hits   LIKE {like_ms:9.2f} ms   trigram {index_ms:9.2f} ms")
+
+        await engine.dispose()
+
+
+async def run(rows_list, repeat: int) -> None:
+    for rows in rows_list:
+        await run_rows(rows, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Envelope serialization cost per item.
+
+Times rendering a list envelope of N rows two ways:
+
+* before: validate rows into schemas, build the envelope (validating it), then
+  let FastAPI serialize it against ``response_model`` (dump to dict, validate
+  again, ``jsonable_encoder``) and render a ``JSONResponse``
+* after: validate rows into schemas, ``model_construct`` the envelope and
+  render an ``EnvelopeResponse`` straight to JSON bytes
+
+Rows are transient ORM instances, so no database is involved.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_serialization --items 20 100 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.responses import envelope
+from app.models.category import Category as CategoryModel
+from app.models.product import Product as ProductModel
+from app.schemas.category import CategoriesResponse, Category
+from app.schemas.product import Product, ProductsResponse
+
+NOW = datetime(2025, 1, 1)
+
+
+def categories(n: int):
+    return [CategoryModel(
+        id=i, name=f"Category {i}", description="Generated", parent_id=None, path=f"Category {i}",
+        level=0, attributes={"color": "red", "tags": ["a", "b"]}, created_at=NOW, updated_at=NOW,
+        version=1, is_deleted=False
+    ) for i in range(n)]
+
+
+def products(n: int):
+    return [ProductModel(
+        id=i, name=f"Product {i}", description="Generated product", category_id=1,
+        attributes={"weight_g": 120, "colors": ["red", "blue"]}, created_at=NOW, updated_at=NOW,
+        version=1, is_deleted=False
+    ) for i in range(n)]
+
+
+# FastAPI builds the response field once per route
+FIELDS = {
+    model: create_response_field(name="response", type_=model)
+    for model in (CategoriesResponse, ProductsResponse)
+}
+
+
+async def before(response_model, schema, rows) -> bytes:
+    content = response_model(data=[schema.model_validate(row) for row in rows], meta={"page": 1})
+    data = await serialize_response(field=FIELDS[response_model], response_content=content, is_coroutine=True)
+    return JSONResponse(data).body
+
+
+async def after(response_model, schema, rows) -> bytes:
+    return envelope(response_model, data=[schema.model_validate(row) for row in rows], meta={"page": 1}).body
+
+
+async def per_item_us(path, response_model, schema, rows, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await path(response_model, schema, rows)
+        samples.append((time.perf_counter() - started) / len(rows) * 1e6)
+    return statistics.median(samples)
+
+
+async def run(items_list, repeat: int) -> None:
+    for label, response_model, schema, build in [
+        ("categories", CategoriesResponse, Category, categories),
+        ("products", ProductsResponse, Product, products),
+    ]:
+        for items in items_list:
+            rows = build(items)
+            assert (await before(response_model, schema, rows)).count(b'"id"') == \
+                (await after(response_model, schema, rows)).count(b'"id"')
+            old = await per_item_us(before, response_model, schema, rows, repeat)
+            new = await per_item_us(after, response_model, schema, rows, repeat)
+            print(f"{label:<11} {items:>5} items   before {old:7.2f} us/item   "
+                  f"after {new:7.2f} us/item   {old / new:4.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, nargs="+", default=[20, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
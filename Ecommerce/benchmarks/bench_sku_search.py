@@ -0,0 +1,91 @@
+"""
+SKU search microbenchmarks on a generated catalog.
+
+Times ``SKUService.search`` for the typical filter shapes (one product's
+SKUs in a price band, catalog-wide in-stock price band, code prefix) against
+a catalog from ``benchmarks.catalog``. With ``--without-indexes`` the two
+price indexes are dropped first (and recreated afterwards) to show what the
+same filters cost as scans. Reports p50/p95/p99 per shape and saves them with
+``benchmarks.results``.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_sku_search --catalog bench.db --repeat 200
+"""
+import argparse
+import asyncio
+import os
+import random
+from dataclasses import asdict
+from decimal import Decimal
+from typing import Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.sku import SKU
+from app.schemas.sku import SKUSearchRequest
+from app.services.sku_service import SKUService
+from benchmarks.bench_category_service import sample
+from benchmarks.catalog import add_spec_arguments, ensure_catalog, spec_from_args
+from benchmarks.results import save, summarize
+
+PRICE_INDEXES = ("ix_skus_product_price", "ix_skus_price_in_stock")
+
+
+async def run(args: argparse.Namespace) -> None:
+    spec = spec_from_args(args)
+    url = await ensure_catalog(os.path.abspath(args.catalog), spec)
+    engine = create_async_engine(url)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    indexes = [index for index in SKU.__table__.indexes if index.name in PRICE_INDEXES]
+    if args.without_indexes:
+        async with engine.begin() as conn:
+            for index in indexes:
+                await conn.run_sync(index.drop, checkfirst=True)
+
+    rng = random.Random(spec.seed)
+    products = [rng.randrange(1, spec.products + 1) for _ in range(args.repeat + 5)]
+    bands = [Decimal(rng.randint(2, 400)) for _ in range(args.repeat + 5)]
+    shapes = {
+        "product + price band": lambda i: SKUSearchRequest(
+            product_id=products[i], min_price=bands[i], max_price=bands[i] + 100
+        ),
+        "in stock + price band": lambda i: SKUSearchRequest(
+            in_stock=True, min_price=bands[i], max_price=bands[i] + 1
+        ),
+        "code prefix": lambda i: SKUSearchRequest(sku_code=f"SKU-{products[i]:08d}"),
+    }
+
+    results: Dict[str, Dict[str, float]] = {}
+    async with Session() as db:
+        service = SKUService(db)
+        for label, build in shapes.items():
+            results[label] = summarize(await sample(lambda i: service.search(build(i)), args.repeat))
+            print(f"{label:<24} p50 {results[label]['p50_ms']:8.2f} ms   "
+                  f"p95 {results[label]['p95_ms']:8.2f} ms   p99 {results[label]['p99_ms']:8.2f} ms")
+
+    if args.without_indexes:
+        async with engine.begin() as conn:
+            for index in indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+    await engine.dispose()
+    path = save("sku_search", {
+        "repeat": args.repeat,
+        "without_indexes": args.without_indexes,
+        "catalog": asdict(spec),
+    }, results, args.output)
+    print(f"saved {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog", default="bench.db", help="Catalog database file, created if missing")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls per filter shape")
+    parser.add_argument("--without-indexes", action="store_true", help="Drop the price indexes while measuring")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
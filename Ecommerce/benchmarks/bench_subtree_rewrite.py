@@ -0,0 +1,118 @@
+"""
+Subtree path rewrite benchmark.
+
+Builds a category subtree of N nodes (fan-out 10) in a scratch SQLite
+database and times renaming and moving its root through ``CategoryService``,
+which rewrites every descendant path with one set-based UPDATE. The
+row-by-row rewrite it replaced is timed alongside for comparison on
+subtrees up to ``--legacy-max`` nodes (it is quadratic in practice, since every
+per-row ORM UPDATE also scans the session identity map).
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.bench_subtree_rewrite --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.category import Category
+from app.schemas.category import CategoryUpdate
+from app.services.category_service import CategoryService
+
+FAN_OUT = 10
+
+
+async def populate(engine, size: int) -> None:
+    """Insert a 'Target' root plus a 'Root' subtree of ``size`` nodes."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime(2025, 1, 1)
+    rows = [
+        {"id": 1, "name": "Target", "parent_id": None, "path": "Target", "level": 0},
+        {"id": 2, "name": "Root", "parent_id": None, "path": "Root", "level": 0},
+    ]
+    # Breadth-first ids: node n's parent is (n - 3) // FAN_OUT + 2
+    for node_id in range(3, size + 2):
+        parent = rows[(node_id - 3) // FAN_OUT + 1]
+        name = f"n{node_id}"
+        rows.append({
+            "id": node_id,
+            "name": name,
+            "parent_id": parent["id"],
+            "path": f"{parent['path']}.{name}",
+            "level": parent["level"] + 1,
+        })
+    for row in rows:
+        row.update(version=1, is_deleted=False, created_at=now, updated_at=now)
+
+    async with engine.begin() as conn:
+        await conn.execute(insert(Category), rows)
+
+
+async def legacy_rewrite(db: AsyncSession, old_path: str, new_path: str) -> None:
+    """The previous implementation: one UPDATE per descendant."""
+    result = await db.execute(select(Category).where(Category.path.like(f"{old_path}.%")))
+    for descendant in result.scalars().all():
+        await db.execute(
+            update(Category)
+            .where(Category.id == descendant.id)
+            .values(path=descendant.path.replace(old_path, new_path, 1))
+        )
+    await db.commit()
+
+
+async def timed(coro) -> float:
+    """Wall time of awaiting ``coro`` in milliseconds."""
+    started = time.perf_counter()
+    await coro
+    return (time.perf_counter() - started) * 1000
+
+
+async def run_size(size: int, legacy: bool) -> None:
+    """Benchmark one subtree size against a fresh database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        await populate(engine, size)
+        Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with Session() as db:
+            service = CategoryService(db)
+            rename_ms = await timed(service.update(2, CategoryUpdate(name="Renamed")))
+        async with Session() as db:
+            service = CategoryService(db)
+            move_ms = await timed(service.move(2, 1))
+        line = f"{size:>8,} nodes: rename {rename_ms:9.1f} ms   move {move_ms:9.1f} ms"
+
+        if legacy:
+            async with Session() as db:
+                legacy_ms = await timed(legacy_rewrite(db, "Target.Renamed", "Target.Legacy"))
+            line += f"   row-by-row rewrite {legacy_ms:9.1f} ms"
+        print(line)
+
+        await engine.dispose()
+
+
+async def run(sizes, legacy_max: int) -> None:
+    for size in sizes:
+        await run_size(size, size <= legacy_max)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--legacy-max", type=int, default=1_000,
+                        help="Largest subtree to also time with the row-by-row rewrite")
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.legacy_max))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Deterministic synthetic catalog generator.
+
+Builds a category forest of ``roots`` trees, ``fanout`` children per node and
+``depth`` levels, then ``products`` products spread over the leaf categories
+with ``skus_per_product`` SKUs each. Names, descriptions and JSON attributes
+come from a seeded RNG per batch, so the same spec always yields the same
+rows, and rows are written with multi-row inserts of ``BATCH_SIZE``.
+
+The defaults give 1M products and 5M SKUs. Generating them takes a while, so
+``ensure_catalog`` keeps the database file and a ``.json`` spec next to it and
+only regenerates when the spec changes.
+
+Usage (from the Ecommerce directory):
+    python -m benchmarks.catalog bench.db --products 1000000 --skus-per-product 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.database import Base
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+
+BATCH_SIZE = 10_000
+# Bumped when the generated rows change shape; older catalogs are regenerated
+CATALOG_FORMAT = 4
+EPOCH = datetime(2024, 1, 1)
+
+ADJECTIVES = ["Classic", "Ultra", "Compact", "Pro", "Eco", "Smart", "Vintage", "Rugged", "Slim", "Premium"]
+NOUNS = ["Headphones", "Backpack", "Kettle", "Lamp", "Sneakers", "Jacket", "Monitor", "Blender", "Watch", "Tent"]
+BRANDS = ["Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Soylent", "Tyrell"]
+COLORS = ["black", "white", "red", "blue", "green", "grey", "navy", "olive", "beige", "orange"]
+MATERIALS = ["cotton", "steel", "aluminium", "leather", "polyester", "bamboo", "glass", "wool"]
+SIZES = ["XS", "S", "M", "L", "XL", "XXL"]
+TAGS = ["new", "sale", "bestseller", "eco", "limited", "gift", "bundle", "clearance"]
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    """Shape of a generated catalog."""
+    roots: int = 8
+    fanout: int = 6
+    depth: int = 5
+    products: int = 1_000_000
+    skus_per_product: int = 5
+    seed: int = 42
+
+    @property
+    def categories(self) -> int:
+        return self.roots * sum(self.fanout ** level for level in range(self.depth))
+
+    @property
+    def leaves(self) -> range:
+        """Ids of the deepest level; categories are numbered breadth-first from 1."""
+        return range(self.categories - self.roots * self.fanout ** (self.depth - 1) + 1, self.categories + 1)
+
+    @property
+    def skus(self) -> int:
+        return self.products * self.skus_per_product
+
+
+def _category_rows(spec: CatalogSpec) -> Iterator[Dict[str, Any]]:
+    """Categories breadth-first, so every parent id precedes its children."""
+    rng = random.Random(spec.seed)
+    level_rows = []
+    for i in range(spec.roots):
+        name = f"{rng.choice(NOUNS)} {i + 1}"
+        level_rows.append({"id": i + 1, "parent_id": None, "level": 0, "name": name, "path": name})
+    next_id = spec.roots + 1
+    for level in range(spec.depth):
+        children = []
+        for row in level_rows:
+            yield {
+                **row,
+                "description": f"{row['name']} department",
+                "attributes": {"featured": rng.random() < 0.1, "sort_weight": rng.randint(0, 100)},
+                "created_at": EPOCH,
+                "updated_at": EPOCH,
+                "version": 1,
+                "is_deleted": False,
+            }
+            if level + 1 < spec.depth:
+                for _ in range(spec.fanout):
+                    name = f"{rng.choice(ADJECTIVES)} {row['name'].split(' ')[0]} {next_id}"
+                    children.append({
+                        "id": next_id, "parent_id": row["id"], "level": level + 1,
+                        "name": name, "path": f"{row['path']}.{name}",
+                    })
+                    next_id += 1
+        level_rows = children
+
+
+def _product_batch(spec: CatalogSpec, start: int, stop: int) -> List[Dict[str, Any]]:
+    rng = random.Random(f"{spec.seed}:products:{start}")
+    leaves = spec.leaves
+    rows = []
+    for product_id in range(start + 1, stop + 1):
+        brand, noun = rng.choice(BRANDS), rng.choice(NOUNS)
+        rows.append({
+            "id": product_id,
+            "name": f"{brand} {rng.choice(ADJECTIVES)} {noun} {product_id}",
+            "description": f"{rng.choice(ADJECTIVES)} {noun.lower()} in {rng.choice(MATERIALS)} by {brand}.",
+            "category_id": leaves[rng.randrange(len(leaves))],
+            "attributes": {
+                "brand": brand,
+                "material": rng.choice(MATERIALS),
+                "weight_g": rng.randint(50, 5000),
+                "rating": round(rng.uniform(1, 5), 1),
+                "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            },
+            "created_at": EPOCH + timedelta(seconds=product_id),
+            "updated_at": EPOCH + timedelta(seconds=product_id),
+            "version": 1,
+            "is_deleted": rng.random() < 0.01,
+        })
+    return rows
+
+
+def _sku_batch(spec: CatalogSpec, start: int, stop: int) -> List[Dict[str, Any]]:
+    """SKUs for products ``start + 1`` to ``stop``."""
+    rng = random.Random(f"{spec.seed}:skus:{start}")
+    rows = []
+    for product_id in range(start + 1, stop + 1):
+        base_price = rng.randint(199, 49999)
+        for variant in range(spec.skus_per_product):
+            rows.append({
+                "id": (product_id - 1) * spec.skus_per_product + variant + 1,
+                "sku_code": f"SKU-{product_id:08d}-{variant:02d}",
+                "product_id": product_id,
+                "price": Decimal(base_price + variant * 100) / 100,
+                "inventory_count": rng.randint(0, 500),
+                "attributes": {
+                    "color": rng.choice(COLORS),
+                    "size": SIZES[variant % len(SIZES)],
+                },
+                "created_at": EPOCH + timedelta(seconds=product_id),
+                "updated_at": EPOCH + timedelta(seconds=product_id),
+                "version": 1,
+                "is_deleted": False,
+            })
+    return rows
+
+
+async def generate(engine: AsyncEngine, spec: CatalogSpec) -> None:
+    """Create the schema and insert the catalog described by ``spec``."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    categories = list(_category_rows(spec))
+    async with engine.begin() as conn:
+        for start in range(0, len(categories), BATCH_SIZE):
+            await conn.execute(insert(Category), categories[start:start + BATCH_SIZE])
+    print(f"  {len(categories):,} categories in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    for start in range(0, spec.products, BATCH_SIZE):
+        async with engine.begin() as conn:
+            await conn.execute(insert(Product), _product_batch(spec, start, min(start + BATCH_SIZE, spec.products)))
+    print(f"  {spec.products:,} products in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    products_per_batch = max(BATCH_SIZE // max(spec.skus_per_product, 1), 1)
+    for start in range(0, spec.products, products_per_batch):
+        rows = _sku_batch(spec, start, min(start + products_per_batch, spec.products))
+        if rows:
+            async with engine.begin() as conn:
+                await conn.execute(insert(SKU), rows)
+    print(f"  {spec.skus:,} SKUs in {time.perf_counter() - started:.1f}s")
+
+    # Planner statistics, as a production database would have; without them
+    # SQLite prefers the low-cardinality is_deleted indexes
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+
+
+async def ensure_catalog(path: str, spec: CatalogSpec) -> str:
+    """SQLite URL of a database at ``path`` holding ``spec``, generating it if needed."""
+    url = f"sqlite+aiosqlite:///{path}"
+    marker = f"{path}.json"
+    if os.path.exists(path) and os.path.exists(marker):
+        with open(marker) as f:
+            if json.load(f) == {**asdict(spec), "format": CATALOG_FORMAT}:
+                return url
+    for stale in (path, marker):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    print(f"generating {spec} into {path}")
+    engine = create_async_engine(url)
+    try:
+        await generate(engine, spec)
+    finally:
+        await engine.dispose()
+    with open(marker, "w") as f:
+        json.dump({**asdict(spec), "format": CATALOG_FORMAT}, f)
+    return url
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser, **defaults: Any) -> None:
+    """Catalog shape options shared by the benchmarks that generate one."""
+    spec = CatalogSpec(**defaults)
+    for field, value in asdict(spec).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, default=value)
+
+
+def spec_from_args(args: argparse.Namespace) -> CatalogSpec:
+    return CatalogSpec(**{field: getattr(args, field) for field in asdict(CatalogSpec())})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="SQLite database file to create or reuse")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+    print(f"{spec.categories:,} categories, {spec.products:,} products, {spec.skus:,} SKUs")
+    asyncio.run(ensure_catalog(os.path.abspath(args.path), spec))
+
+
+if __name__ == "__main__":
+    main()
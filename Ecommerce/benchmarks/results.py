@@ -0,0 +1,132 @@
+"""
+Latency summaries and saved benchmark results.
+
+Benchmarks in the suite summarize their samples with ``summarize`` and write
+them with ``save`` as JSON documents that record the run's arguments, commit
+and platform next to the numbers. Two saved runs are compared with:
+
+    python -m benchmarks.results BASELINE.json CURRENT.json --threshold 0.10
+
+which prints every metric that got worse by more than the threshold and
+exits with status 1 if any did.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Metric name suffix -> whether larger values are better
+_DIRECTIONS = {"_ms": False, "_rps": True}
+
+
+def percentile(sorted_samples: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    rank = max(math.ceil(fraction * len(sorted_samples)), 1)
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples_ms: Sequence[float]) -> Dict[str, float]:
+    """Count, mean and p50/p95/p99/max of latency samples in milliseconds."""
+    ordered = sorted(samples_ms)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "p50_ms": round(percentile(ordered, 0.50), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(benchmark: str, args: Dict[str, Any], results: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Write ``results`` with run metadata; returns the file written."""
+    created_at = datetime.now(timezone.utc)
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{benchmark}-{created_at:%Y%m%dT%H%M%S}.json")
+    document = {
+        "benchmark": benchmark,
+        "created_at": created_at.isoformat(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "args": args,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return path
+
+
+def _metrics(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Flatten nested results into ``a/b/p95_ms``-style keys."""
+    flat: Dict[str, float] = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(_metrics(value, f"{prefix}{key}/"))
+        elif isinstance(value, (int, float)) and key.endswith(tuple(_DIRECTIONS)):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float
+) -> List[Tuple[str, float, float, float]]:
+    """``(metric, baseline, current, change)`` for metrics worse by more than ``threshold``."""
+    before = _metrics(baseline["results"])
+    after = _metrics(current["results"])
+    regressions = []
+    for metric in sorted(before.keys() & after.keys()):
+        old, new = before[metric], after[metric]
+        if old == 0:
+            continue
+        change = (new - old) / old
+        higher_is_better = next(better for suffix, better in _DIRECTIONS.items() if metric.endswith(suffix))
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append((metric, old, new, change))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two saved benchmark runs.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Tolerated relative change")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    if baseline["benchmark"] != current["benchmark"]:
+        sys.exit(f"Cannot compare {baseline['benchmark']} with {current['benchmark']}")
+
+    regressions = compare(baseline, current, args.threshold)
+    print(f"{baseline['benchmark']}: {baseline['commit']} -> {current['commit']}")
+    for metric, old, new, change in regressions:
+        print(f"  REGRESSION {metric:<50} {old:>12.3f} -> {new:>12.3f} ({change:+.1%})")
+    if not regressions:
+        print(f"  no metric worse by more than {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Catalog import script.
+
+Usage:
+    python import_data.py products feed.csv
+    python import_data.py skus skus.ndjson --chunk-size 5000
+
+Rerunning a file that failed part-way resumes after its last committed chunk.
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.database import AsyncSessionLocal, engine
+from app.services.import_service import ImportEntity, ImportFormat, ImportService
+
+
+def print_progress():
+    """Progress callback printing at most once a second."""
+    last = 0.0
+
+    def report(result):
+        nonlocal last
+        now = time.monotonic()
+        if now - last >= 1:
+            last = now
+            print(f"  {result.rows_processed:,} rows processed "
+                  f"({result.rows_failed:,} failed, {result.rows_per_second:,.0f} rows/s)")
+
+    return report
+
+
+async def import_file(args):
+    """Import one file."""
+    async with AsyncSessionLocal() as session:
+        service = ImportService(session, chunk_size=args.chunk_size)
+        result = await service.run(
+            args.path,
+            ImportEntity(args.entity),
+            format=ImportFormat(args.format) if args.format else None,
+            restart=args.restart,
+            on_progress=print_progress()
+        )
+    await engine.dispose()
+
+    if result.resumed_from:
+        print(f"Resumed after {result.resumed_from:,} rows")
+    print(f"Import {result.status}: {result.rows_written:,} rows written, "
+          f"{result.rows_failed:,} failed in {result.elapsed_seconds:.1f}s "
+          f"({result.rows_per_second:,.0f} rows/s)")
+    for error in result.errors:
+        print(f"  {error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import categories, products or SKUs from CSV/NDJSON.")
+    parser.add_argument("entity", choices=[entity.value for entity in ImportEntity])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=[format.value for format in ImportFormat],
+                        help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, help="rows per transaction")
+    parser.add_argument("--restart", action="store_true", help="ignore any checkpoint and start over")
+    asyncio.run(import_file(parser.parse_args()))
@@ -5,6 +5,11 @@ import asyncio
 from sqlalchemy.ext.asyncio import create_async_engine
 from app.core.config import settings
 from app.core.database import Base
+from app.models.archive import install_archive
+from app.models.attribute_index import install_attribute_index
+from app.models.category_counters import install_category_counters
+from app.models.search import install_search_schema
+from app.models.sku import upgrade_sku_columns
 
 
 async def create_tables():
@@ -17,6 +22,11 @@ async def create_tables():
     
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(install_search_schema)
+        await conn.run_sync(upgrade_sku_columns)
+        await conn.run_sync(install_attribute_index)
+        await conn.run_sync(install_category_counters)
+        await conn.run_sync(install_archive)
     
     await engine.dispose()
     print("Database tables created successfully!")
@@ -0,0 +1,32 @@
+"""
+Category counter repair script.
+
+Recomputes ``child_count`` and ``product_count`` for every category from
+the live rows, in one set-based statement, and reports how many were wrong.
+Triggers keep the counters exact; run this after restoring data with the
+triggers disabled or whenever the counters are suspected to have drifted.
+
+Usage:
+    python repair_counts.py
+"""
+import asyncio
+import time
+
+from app.core.cache import cache
+from app.core.database import engine
+from app.models.category_counters import recount_categories
+
+
+async def repair():
+    """Recount all categories in one transaction."""
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        repaired = await conn.run_sync(recount_categories)
+    # Cached categories may hold the old counts
+    await cache.invalidate(prefixes=("category:", "categories:list:"))
+    await engine.dispose()
+    print(f"Repaired {repaired} categories in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(repair())
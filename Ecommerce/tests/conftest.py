@@ -2,15 +2,22 @@
 Test configuration and fixtures.
 """
 import pytest
+import pytest_asyncio
 import asyncio
+from contextlib import contextmanager
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from httpx import AsyncClient
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_read_db
+from app.core.cache import cache
 from app.core.config import settings
+from app.core.query_stats import track_queries
+from app.services.category_hierarchy import category_hierarchy
+from app.services.search.facets import product_facets
+from app.services.search.trigram import product_search_index
 
 # Test database URL
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -38,7 +45,7 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create test database session."""
     async with test_engine.begin() as connection:
@@ -51,9 +58,15 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         
         # Drop all tables
         await connection.run_sync(Base.metadata.drop_all)
+    
+    # Tables are recreated per test, so cached ids are meaningless
+    category_hierarchy.invalidate()
+    product_search_index.invalidate()
+    product_facets.invalidate()
+    await cache.clear()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Create test client with database dependency override."""
     
@@ -61,8 +74,24 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         return db_session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager failing the test when its block runs more than ``limit`` statements."""
+    
+    @contextmanager
+    def budget(limit: int):
+        with track_queries() as stats:
+            yield stats
+        if stats.count > limit:
+            shapes = "\n".join(f"  {count} x {shape}" for shape, count in stats.shapes.most_common())
+            pytest.fail(f"{stats.count} SQL statements exceed the budget of {limit}:\n{shapes}")
+    
+    return budget
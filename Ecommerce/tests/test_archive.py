@@ -0,0 +1,265 @@
+"""
+Test soft-delete archival, restore and the SQLite partial indexes.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.dialects import sqlite
+
+from app.models.archive import install_archive
+from app.models.product import Product
+from app.services.archive_service import ArchiveService
+
+OLD = datetime.utcnow() - timedelta(days=90)
+
+
+async def _create(client: AsyncClient, name: str, parent_id: int = None) -> int:
+    response = await client.post("/api/v1/categories/", json={"name": name, "parent_id": parent_id})
+    assert response.status_code == 201, response.text
+    return response.json()["data"]["id"]
+
+
+async def _products(client: AsyncClient, category_id: int, *names: str) -> list:
+    response = await client.post("/api/v1/products:bulk", json={"items": [
+        {"name": name, "category_id": category_id} for name in names
+    ]})
+    return [item["id"] for item in response.json()["data"]]
+
+
+async def _tombstone(db_session, table: str, *ids: int, when: datetime = OLD) -> None:
+    """Soft delete rows as if it happened at ``when``."""
+    for entity_id in ids:
+        await db_session.execute(
+            text(f"UPDATE {table} SET is_deleted = 1, updated_at = :when WHERE id = :id"),
+            {"when": when, "id": entity_id}
+        )
+    await db_session.commit()
+
+
+async def _ids(db_session, table: str) -> set:
+    return set((await db_session.execute(text(f"SELECT id FROM {table}"))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_sqlite_indexes_are_partial(db_session):
+    """Test every postgresql_where index is also partial on SQLite."""
+    result = await db_session.execute(text(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql LIKE '% WHERE %'"
+    ))
+    indexes = dict(result.all())
+    assert set(indexes) >= {
+        "ix_categories_name_not_deleted", "ix_products_name_not_deleted", "ix_skus_price_in_stock"
+    }
+    assert all("is_deleted = 0" in sql for sql in indexes.values())
+
+    # The services' ``is_deleted == False`` renders the literal the index needs
+    query = select(Product.id).where(Product.is_deleted == False)
+    assert "is_deleted = 0" in str(query.compile(dialect=sqlite.dialect()))
+    # INDEXED BY fails unless the query's terms imply the index's WHERE
+    plan = await db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM products INDEXED BY ix_products_name_not_deleted "
+        "WHERE is_deleted = 0 ORDER BY name"
+    ))
+    assert "USE TEMP B-TREE" not in " ".join(str(row) for row in plan.all())
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_old_unreferenced_tombstones(client: AsyncClient, db_session):
+    """Test only old tombstones without live references are archived, children first."""
+    home = await _create(client, "Home")
+    old = await _create(client, "Old")
+    recent = await _create(client, "Recent")
+    await _create(client, "Newest")
+    legacy, = await _products(client, old, "Legacy")
+    lamp, rug, vase, _ = await _products(client, home, "Lamp", "Rug", "Vase", "Chair")
+    response = await client.post("/api/v1/skus:bulk", json={"items": [
+        {"sku_code": "RUG-1", "product_id": rug, "price": "10", "inventory_count": 1, "attributes": {}},
+    ]})
+    assert response.status_code == 200
+
+    await _tombstone(db_session, "products", lamp, rug, legacy)
+    await _tombstone(db_session, "products", vase, when=datetime.utcnow())
+    await _tombstone(db_session, "categories", old)
+    await _tombstone(db_session, "categories", recent, when=datetime.utcnow())
+
+    moved = await ArchiveService(db_session, batch_size=1).archive()
+    assert moved == {"skus": 0, "products": 2, "categories": 1}
+    assert await _ids(db_session, "products_archive") == {lamp, legacy}
+    assert await _ids(db_session, "categories_archive") == {old}
+    assert rug in await _ids(db_session, "products")  # still has a SKU
+    assert recent in await _ids(db_session, "categories")
+
+    # Nothing left to do
+    assert await ArchiveService(db_session).archive() == {"skus": 0, "products": 0, "categories": 0}
+
+
+@pytest.mark.asyncio
+async def test_archive_keeps_parents_of_hot_children(client: AsyncClient, db_session):
+    """Test a deleted category stays while its (deleted) child is still in the hot table."""
+    home = await _create(client, "Home")
+    kitchen = await _create(client, "Kitchen", home)
+    await _create(client, "Newest")
+    await _tombstone(db_session, "categories", home)
+    await _tombstone(db_session, "categories", kitchen, when=datetime.utcnow())
+
+    assert (await ArchiveService(db_session).archive())["categories"] == 0
+    assert {home, kitchen} <= await _ids(db_session, "categories")
+
+    # Once the child is archived, the parent follows in the same run
+    await _tombstone(db_session, "categories", kitchen)
+    assert (await ArchiveService(db_session).archive())["categories"] == 2
+    assert await _ids(db_session, "categories_archive") == {home, kitchen}
+
+
+@pytest.mark.asyncio
+async def test_archive_keeps_newest_row(client: AsyncClient, db_session):
+    """Test the highest id stays in the hot table so SQLite never reuses it."""
+    home = await _create(client, "Home")
+    first, last = await _products(client, home, "First", "Last")
+    await _tombstone(db_session, "products", first, last)
+
+    assert (await ArchiveService(db_session).archive())["products"] == 1
+    assert await _ids(db_session, "products") == {last}
+
+
+@pytest.mark.asyncio
+async def test_include_deleted_reads_through_archive(client: AsyncClient, db_session):
+    """Test include_deleted listings and exports include archived rows."""
+    home = await _create(client, "Home")
+    old = await _create(client, "Old")
+    await _create(client, "Spare")
+    gone, kept, _ = await _products(client, home, "Gone", "Kept", "Newest")
+    await _tombstone(db_session, "products", gone)
+    await _tombstone(db_session, "categories", old)
+    await ArchiveService(db_session).archive()
+
+    response = await client.get("/api/v1/categories/?include_deleted=true")
+    assert [item["name"] for item in response.json()["data"]] == ["Home", "Old", "Spare"]
+    response = await client.get("/api/v1/categories/")
+    assert [item["name"] for item in response.json()["data"]] == ["Home", "Spare"]
+
+    response = await client.get(f"/api/v1/products/?category_id={home}&include_deleted=true&expand=category")
+    data = response.json()["data"]
+    assert [item["id"] for item in data] == sorted([gone, kept, data[0]["id"]], reverse=True)
+    assert data[-1]["is_deleted"] is True
+    assert data[-1]["category"]["name"] == "Home"
+
+    response = await client.get("/api/v1/export/products?include_deleted=true")
+    assert response.text.count("\n") == 3
+    response = await client.get("/api/v1/export/products")
+    assert response.text.count("\n") == 2
+
+
+@pytest.mark.asyncio
+async def test_restore_from_hot_table_and_archive(client: AsyncClient, db_session):
+    """Test restores bring rows back, counted, whether archived or not."""
+    home = await _create(client, "Home")
+    old = await _create(client, "Old")
+    await _create(client, "Spare")
+    archived, hot, _ = await _products(client, home, "Archived", "Hot", "Newest")
+    await _tombstone(db_session, "products", archived)
+    await _tombstone(db_session, "categories", old)
+    await ArchiveService(db_session).archive()
+    await _tombstone(db_session, "products", hot)
+
+    response = await client.post(f"/api/v1/products/{archived}/restore")
+    assert response.status_code == 200, response.text
+    assert response.json()["data"]["is_deleted"] is False
+    assert await _ids(db_session, "products_archive") == set()
+    response = await client.post(f"/api/v1/products/{hot}/restore")
+    assert response.json()["data"]["version"] == 2
+
+    data = (await client.get(f"/api/v1/categories/{home}")).json()["data"]
+    assert data["product_count"] == 3
+    response = await client.get(f"/api/v1/products/{archived}")
+    assert response.status_code == 200
+
+    response = await client.post(f"/api/v1/categories/{old}/restore")
+    assert response.status_code == 200
+    response = await client.get("/api/v1/categories/tree")
+    assert "Old" in response.text
+
+
+@pytest.mark.asyncio
+async def test_restore_refusals(client: AsyncClient, db_session):
+    """Test restores of live, unknown, orphaned or conflicting rows are refused."""
+    home = await _create(client, "Home")
+    lamp, _ = await _products(client, home, "Lamp", "Newest")
+    response = await client.post(f"/api/v1/products/{lamp}/restore")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Product is not deleted"
+    assert (await client.post("/api/v1/products/999/restore")).status_code == 404
+    assert (await client.post("/api/v1/skus/999/restore")).status_code == 404
+
+    await _tombstone(db_session, "products", lamp)
+    await _tombstone(db_session, "categories", home)
+    response = await client.post(f"/api/v1/products/{lamp}/restore")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot restore product under a deleted category"
+
+    # The archived category's name has been taken since
+    await _create(client, "Spare")
+    await db_session.execute(text("DELETE FROM products"))
+    await db_session.commit()
+    await ArchiveService(db_session).archive()
+    await _create(client, "Home")
+    response = await client.post(f"/api/v1/categories/{home}/restore")
+    assert response.status_code == 400
+    assert "conflicts" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_install_rebuilds_full_indexes(db_session):
+    """Test installing on an old database makes full indexes partial again."""
+    await db_session.execute(text("DROP INDEX ix_skus_price_in_stock"))
+    await db_session.execute(text("CREATE INDEX ix_skus_price_in_stock ON skus (price)"))
+    await db_session.execute(text("DROP TABLE skus_archive"))
+    await db_session.commit()
+
+    connection = await db_session.connection()
+    await connection.run_sync(install_archive)
+    await db_session.commit()
+    sql = (await db_session.execute(text(
+        "SELECT sql FROM sqlite_master WHERE name = 'ix_skus_price_in_stock'"
+    ))).scalar()
+    assert "WHERE" in sql
+    tables = await db_session.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))
+    assert "skus_archive" in set(tables.scalars())
+
+
+@pytest.mark.asyncio
+async def test_restores_refresh_cached_counters(client: AsyncClient, db_session):
+    """Test restores and imports drop the cached category rows whose counters they move."""
+    home = await _create(client, "Home")
+    hall = await _create(client, "Hall", home)
+    lamp, _ = await _products(client, home, "Lamp", "Newest")
+    await client.get(f"/api/v1/categories/{hall}")  # cached while live
+    await _tombstone(db_session, "products", lamp)
+    await _tombstone(db_session, "categories", hall)
+
+    async def counters(etag: str = None) -> tuple:
+        headers = {"If-None-Match": etag} if etag else {}
+        response = await client.get(f"/api/v1/categories/{home}", headers=headers)
+        assert response.status_code == 200
+        data = response.json()["data"]
+        return (data["child_count"], data["product_count"]), response.headers["ETag"]
+
+    cached, etag = await counters()
+    assert cached == (0, 1)
+    await client.post(f"/api/v1/products/{lamp}/restore")
+    cached, etag = await counters(etag)
+    assert cached == (0, 2)
+    await client.post(f"/api/v1/categories/{hall}/restore")
+    cached, etag = await counters(etag)
+    assert cached == (1, 2)
+    response = await client.get(f"/api/v1/categories/{hall}")
+    assert response.json()["data"]["version"] == 2
+
+    response = await client.post("/api/v1/imports/products", files={
+        "file": ("feed.ndjson", f'{{"name": "Rug", "category_id": {home}}}\n'.encode(), "application/x-ndjson")
+    })
+    assert response.json()["data"]["rows_written"] == 1
+    cached, _ = await counters(etag)
+    assert cached == (1, 3)
@@ -0,0 +1,125 @@
+"""
+Test the attribute index and attr.<key>=<value> filters.
+"""
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select, text
+
+from app.core.config import settings
+from app.models.attribute_index import ProductAttribute, SKUAttribute, install_attribute_index
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+
+
+@pytest_asyncio.fixture
+async def catalog(db_session) -> dict:
+    """Products and SKUs with assorted attributes; ids by name."""
+    category = Category(name="Apparel", path="Apparel")
+    db_session.add(category)
+    await db_session.flush()
+    products = {
+        "jacket": Product(name="Jacket", category_id=category.id,
+                          attributes={"brand": "Acme", "waterproof": True, "layers": 3}),
+        "shirt": Product(name="Shirt", category_id=category.id, attributes={"brand": "Acme", "waterproof": False}),
+        "boots": Product(name="Boots", category_id=category.id,
+                         attributes={"brand": "Trek", "waterproof": True, "tags": ["hiking"]}),
+        "plain": Product(name="Plain", category_id=category.id),
+    }
+    db_session.add_all(products.values())
+    await db_session.flush()
+    skus = {
+        "jacket-red-m": SKU(sku_code="J-R-M", product_id=products["jacket"].id, price=Decimal("90"),
+                            inventory_count=1, attributes={"color": "red", "size": "M"}),
+        "jacket-red-l": SKU(sku_code="J-R-L", product_id=products["jacket"].id, price=Decimal("95"),
+                            inventory_count=1, attributes={"color": "red", "size": "L"}),
+        "shirt-blue-m": SKU(sku_code="S-B-M", product_id=products["shirt"].id, price=Decimal("20"),
+                            inventory_count=1, attributes={"color": "blue", "size": "M"}),
+    }
+    db_session.add_all(skus.values())
+    await db_session.commit()
+    return {name: row.id for name, row in {**products, **skus}.items()}
+
+
+async def _product_names(client: AsyncClient, query: str) -> list:
+    response = await client.get(f"/api/v1/products/?{query}")
+    assert response.status_code == 200, response.text
+    return sorted(product["name"] for product in response.json()["data"])
+
+
+@pytest.mark.asyncio
+async def test_index_follows_writes(db_session, catalog):
+    """Test triggers index scalar entries on insert and re-index on update and delete."""
+    rows = (await db_session.execute(
+        select(ProductAttribute.key, ProductAttribute.value)
+        .where(ProductAttribute.entity_id == catalog["jacket"])
+        .order_by(ProductAttribute.key)
+    )).all()
+    assert rows == [("brand", "Acme"), ("layers", "3"), ("waterproof", "true")]
+    tags = await db_session.execute(select(ProductAttribute).where(ProductAttribute.key == "tags"))
+    assert tags.first() is None
+
+    await db_session.execute(text("UPDATE products SET attributes = '{\"brand\": \"Zed\"}' WHERE id = :id"),
+                             {"id": catalog["jacket"]})
+    await db_session.execute(text("DELETE FROM skus WHERE id = :id"), {"id": catalog["shirt-blue-m"]})
+    await db_session.commit()
+    rows = (await db_session.execute(
+        select(ProductAttribute.key, ProductAttribute.value).where(ProductAttribute.entity_id == catalog["jacket"])
+    )).all()
+    assert rows == [("brand", "Zed")]
+    assert (await db_session.execute(
+        select(SKUAttribute).where(SKUAttribute.entity_id == catalog["shirt-blue-m"])
+    )).first() is None
+
+
+@pytest.mark.asyncio
+async def test_filter_products(client: AsyncClient, catalog, monkeypatch):
+    """Test single and combined filters, typed values, in both join strategies."""
+    assert await _product_names(client, "attr.brand=Acme") == ["Jacket", "Shirt"]
+    assert await _product_names(client, "attr.brand=Acme&attr.waterproof=true") == ["Jacket"]
+    assert await _product_names(client, "attr.layers=3") == ["Jacket"]
+    assert await _product_names(client, "attr.brand=Nobody") == []
+
+    # Every filter above the drive limit: probe each listed row instead
+    monkeypatch.setattr(settings, "ATTRIBUTE_FILTER_DRIVE_LIMIT", 1)
+    assert await _product_names(client, "attr.waterproof=true") == ["Boots", "Jacket"]
+    assert await _product_names(client, "attr.brand=Acme&attr.waterproof=true") == ["Jacket"]
+
+    response = await client.get("/api/v1/products/?attr.brand=Acme")
+    assert response.json()["meta"]["attributes"] == {"brand": "Acme"}
+
+
+@pytest.mark.asyncio
+async def test_filter_skus(client: AsyncClient, catalog):
+    """Test attribute filters combine with the typed SKU search filters."""
+    response = await client.get("/api/v1/skus/search?attr.size=M")
+    assert [sku["sku_code"] for sku in response.json()["data"]] == ["S-B-M", "J-R-M"]
+    response = await client.get("/api/v1/skus/search?attr.color=red&attr.size=M&min_price=50")
+    assert [sku["sku_code"] for sku in response.json()["data"]] == ["J-R-M"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_filters(client: AsyncClient, catalog, monkeypatch):
+    """Test malformed, repeated and excess filters are rejected."""
+    response = await client.get("/api/v1/products/?attr.=x")
+    assert response.status_code == 400
+    response = await client.get("/api/v1/products/?attr.size=M&attr.size=L")
+    assert response.status_code == 400
+    monkeypatch.setattr(settings, "ATTRIBUTE_FILTER_MAX_KEYS", 1)
+    response = await client.get("/api/v1/skus/search?attr.size=M&attr.color=red")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_install_rebuilds_index(db_session, catalog):
+    """Test installing on an existing database indexes the rows already there."""
+    await db_session.execute(text("DELETE FROM product_attributes"))
+    await db_session.commit()
+    connection = await db_session.connection()
+    await connection.run_sync(install_attribute_index)
+    await db_session.commit()
+    count = await db_session.execute(text("SELECT count(*) FROM product_attributes"))
+    assert count.scalar() == 7
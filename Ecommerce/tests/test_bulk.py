@@ -0,0 +1,156 @@
+"""
+Test bulk product and SKU upsert endpoints.
+"""
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+from app.services.bulk_service import BulkService
+
+
+@pytest_asyncio.fixture
+async def category(db_session) -> Category:
+    """Create a category to hold test products."""
+    category = Category(name="Electronics", path="Electronics")
+    db_session.add(category)
+    await db_session.commit()
+    return category
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_products(client: AsyncClient, db_session, category, monkeypatch):
+    """Test chunked product creates and updates with per-item results."""
+    monkeypatch.setattr(settings, "BULK_CHUNK_SIZE", 2)
+    deleted = Product(name="Gone", category_id=category.id, is_deleted=True)
+    db_session.add(deleted)
+    await db_session.commit()
+
+    response = await client.post("/api/v1/products:bulk", json={"items": [
+        {"name": f"Product {i}", "category_id": category.id} for i in range(5)
+    ] + [
+        {"name": "Orphan", "category_id": 999},
+        {"name": "Revived", "category_id": category.id, "id": deleted.id},
+    ]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["meta"] == {"total": 7, "created": 5, "updated": 0, "error": 2}
+    created = data["data"][:5]
+    assert [item["status"] for item in created] == ["created"] * 5
+    assert data["data"][5] == {"index": 5, "status": "error", "id": None, "error": "Category not found"}
+    assert data["data"][6]["error"] == "Product not found"
+
+    # Returned ids line up with the submitted items
+    for i, item in enumerate(created):
+        product = await db_session.get(Product, item["id"])
+        assert product.name == f"Product {i}"
+
+    # Build the search index so the update below has to patch it
+    response = await client.get("/api/v1/products/search?query=product")
+    assert response.json()["meta"]["total"] == 5
+
+    first_id = created[0]["id"]
+    response = await client.post("/api/v1/products:bulk", json={"items": [
+        {"id": first_id, "name": "Renamed", "category_id": category.id},
+        {"id": first_id, "name": "Again", "category_id": category.id},
+    ]})
+    data = response.json()
+    assert [item["status"] for item in data["data"]] == ["updated", "error"]
+    assert data["data"][1]["error"] == "Duplicate product id in batch"
+
+    db_session.expire_all()
+    product = await db_session.get(Product, first_id)
+    assert (product.name, product.version) == ("Renamed", 2)
+    response = await client.get("/api/v1/products/search?query=renamed")
+    assert [item["id"] for item in response.json()["data"]] == [first_id]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_never_recreates_rows(client: AsyncClient, db_session, category, monkeypatch):
+    """Test an update of a product removed after validation fails instead of inserting it."""
+    product = Product(name="Lamp", category_id=category.id)
+    db_session.add(product)
+    await db_session.commit()
+    product_id, created_at = product.id, product.created_at
+
+    # Validation saw both ids live; 999 was hard-deleted (or archived) since
+    async def live_ids(self, model, ids):
+        return set(ids)
+
+    monkeypatch.setattr(BulkService, "_live_ids", live_ids)
+    response = await client.post("/api/v1/products:bulk", json={"items": [
+        {"id": product_id, "name": "Desk Lamp", "category_id": category.id},
+        {"id": 999, "name": "Ghost", "category_id": category.id},
+    ]})
+    assert [item["status"] for item in response.json()["data"]] == ["updated", "error"]
+    assert await db_session.get(Product, 999) is None
+
+    db_session.expire_all()
+    product = await db_session.get(Product, product_id)
+    assert (product.name, product.version, product.created_at) == ("Desk Lamp", 2, created_at)
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_skus(client: AsyncClient, db_session, category):
+    """Test SKU upserts keyed on sku_code with batched validation."""
+    product = Product(name="Headphones", category_id=category.id)
+    other = Product(name="Speaker", category_id=category.id)
+    db_session.add_all([product, other])
+    await db_session.commit()
+    db_session.add_all([
+        SKU(sku_code="SPK-1", product_id=other.id, attributes={}),
+        SKU(sku_code="OLD-1", product_id=product.id, attributes={}, is_deleted=True),
+    ])
+    await db_session.commit()
+
+    def sku(code, product_id=product.id, price="10.00", inventory=5):
+        return {"sku_code": code, "product_id": product_id, "price": price,
+                "inventory_count": inventory, "attributes": {"color": "black"}}
+
+    response = await client.post("/api/v1/skus:bulk", json={"items": [
+        sku("HP-1"), sku("HP-2"), sku("HP-1"), sku("SPK-1"), sku("OLD-1"), sku("X-1", product_id=999),
+    ]})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["status"] for item in data["data"]] == [
+        "created", "created", "error", "error", "error", "error"
+    ]
+    assert [item["error"] for item in data["data"][2:]] == [
+        "Duplicate SKU code in batch",
+        "SKU code already used by another product",
+        "SKU code belongs to a deleted SKU",
+        "Product not found",
+    ]
+
+    response = await client.post("/api/v1/skus:bulk", json={"items": [
+        sku("HP-1", price="12.50", inventory=0), sku("HP-3"),
+    ]})
+    data = response.json()
+    assert [item["status"] for item in data["data"]] == ["updated", "created"]
+
+    result = await db_session.execute(
+        select(SKU.price, SKU.inventory_count, SKU.attributes, SKU.version).where(SKU.sku_code == "HP-1")
+    )
+    price, inventory_count, attributes, version = result.one()
+    assert (price, inventory_count) == (Decimal("12.50"), 0)
+    assert attributes == {"color": "black"}
+    assert version == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_limits(client: AsyncClient, db_session, category, monkeypatch):
+    """Test empty and oversized batches are rejected."""
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+    response = await client.post("/api/v1/products:bulk", json={"items": []})
+    assert response.status_code == 422
+
+    response = await client.post("/api/v1/products:bulk", json={"items": [
+        {"name": f"Product {i}", "category_id": category.id} for i in range(3)
+    ]})
+    assert response.status_code == 400
@@ -0,0 +1,87 @@
+"""
+Test the read-through cache and its backends.
+"""
+import fnmatch
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.cache import Cache, MemoryBackend, RedisBackend, cache
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio client API used by RedisBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend_factory", [
+    lambda: MemoryBackend(max_entries=2),
+    lambda: RedisBackend(FakeRedis()),
+])
+async def test_backend_roundtrip_and_invalidation(backend_factory):
+    """Test get/set, prefix invalidation and counters on every backend."""
+    store = Cache(backend_factory(), ttl_seconds=60)
+    await store.set("categories:list:1:a", [{"id": 1}])
+    await store.set("categories:list:2:a", [{"id": 2}])
+
+    assert await store.get("categories:list:1:a") == [{"id": 1}]
+    assert await store.get("missing") is None
+
+    await store.invalidate(prefixes=("categories:list:1:",))
+    assert await store.get("categories:list:1:a") is None
+    assert await store.get("categories:list:2:a") == [{"id": 2}]
+    assert store.stats()["hits"] == 2
+    assert store.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    """Test the LRU bound."""
+    backend = MemoryBackend(max_entries=2)
+    await backend.set("a", b"1", ttl=60)
+    await backend.set("b", b"2", ttl=60)
+    await backend.get("a")
+    await backend.set("c", b"3", ttl=60)
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1"
+
+
+@pytest.mark.asyncio
+async def test_category_reads_are_cached_and_invalidated(client: AsyncClient):
+    """Test category writes invalidate cached entries and listings."""
+    create_response = await client.post("/api/v1/categories/", json={"name": "Garden"})
+    category_id = create_response.json()["data"]["id"]
+
+    await client.get(f"/api/v1/categories/{category_id}")
+    response = await client.get(f"/api/v1/categories/{category_id}")
+    assert response.json()["data"]["name"] == "Garden"
+    assert cache.hits == 1
+
+    await client.get("/api/v1/categories/")
+    await client.put(f"/api/v1/categories/{category_id}", json={"name": "Yard"})
+
+    response = await client.get(f"/api/v1/categories/{category_id}")
+    assert response.json()["data"]["name"] == "Yard"
+    response = await client.get("/api/v1/categories/")
+    assert response.json()["data"][0]["name"] == "Yard"
+
+    response = await client.get("/metrics")
+    assert response.json()["cache"]["hits"] == 1
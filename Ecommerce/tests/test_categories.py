@@ -3,6 +3,7 @@ Test category API endpoints.
 """
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
 
 
 @pytest.mark.asyncio
@@ -71,7 +72,9 @@ async def test_health_check(client: AsyncClient):
     """Test health check endpoint."""
     response = await client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"}
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert set(data["database"]["pool"]) == {"size", "checked_out", "overflow", "timeouts"}
 
 
 @pytest.mark.asyncio
@@ -83,3 +86,305 @@ async def test_root_endpoint(client: AsyncClient):
     data = response.json()
     assert "message" in data
     assert "version" in data
+
+
+@pytest.mark.asyncio
+async def test_get_category_expand_products(client: AsyncClient, db_session):
+    """Test live products are only included when expanded."""
+    from app.models.product import Product
+
+    create_response = await client.post("/api/v1/categories/", json={"name": "Toys"})
+    category_id = create_response.json()["data"]["id"]
+    db_session.add(Product(name="Robot", category_id=category_id))
+    db_session.add(Product(name="Broken Robot", category_id=category_id, is_deleted=True))
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/categories/{category_id}")
+    assert response.status_code == 200
+    assert "products" not in response.json()["data"]
+
+    response = await client.get(f"/api/v1/categories/{category_id}?expand=products")
+    assert response.status_code == 200
+    products = response.json()["data"]["products"]
+    assert [product["name"] for product in products] == ["Robot"]
+
+    response = await client.get("/api/v1/categories/?expand=products")
+    assert response.status_code == 200
+    assert response.json()["data"][0]["products"][0]["name"] == "Robot"
+
+
+@pytest.mark.asyncio
+async def test_get_categories_unknown_expand(client: AsyncClient):
+    """Test unknown expand values are rejected."""
+    response = await client.get("/api/v1/categories/?expand=skus")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_categories_cursor_pagination(client: AsyncClient):
+    """Test walking categories with the keyset cursor."""
+    for name in ["Garden", "Audio", "Music", "Food", "Sports"]:
+        await client.post("/api/v1/categories/", json={"name": name})
+
+    names = []
+    response = await client.get("/api/v1/categories/?size=2")
+    while True:
+        assert response.status_code == 200
+        data = response.json()
+        names.extend(category["name"] for category in data["data"])
+        next_cursor = data["meta"]["next_cursor"]
+        if next_cursor is None:
+            break
+        response = await client.get(f"/api/v1/categories/?size=2&cursor={next_cursor}")
+
+    assert names == ["Audio", "Food", "Garden", "Music", "Sports"]
+
+    response = await client.get("/api/v1/categories/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_rename_and_move_rewrite_subtree(client: AsyncClient):
+    """Test renames and moves rewrite descendant paths and levels."""
+    async def create(name, parent_id=None):
+        response = await client.post("/api/v1/categories/", json={"name": name, "parent_id": parent_id})
+        return response.json()["data"]["id"]
+
+    home = await create("Home")
+    kitchen = await create("Kitchen%", home)
+    cookware = await create("Cookware", kitchen)
+    # Matches an unescaped 'Home.Kitchen%.%' pattern
+    tools = await create("Kitchen_Tools", home)
+    knives = await create("Knives", tools)
+
+    response = await client.put(f"/api/v1/categories/{kitchen}", json={"name": "Pantry"})
+    assert response.json()["data"]["path"] == "Home.Pantry"
+    response = await client.get(f"/api/v1/categories/{cookware}")
+    assert response.json()["data"]["path"] == "Home.Pantry.Cookware"
+    response = await client.get(f"/api/v1/categories/{knives}")
+    assert response.json()["data"]["path"] == "Home.Kitchen_Tools.Knives"
+
+    response = await client.post(f"/api/v1/categories/{kitchen}/move?new_parent_id={knives}")
+    assert response.json()["data"]["path"] == "Home.Kitchen_Tools.Knives.Pantry"
+    assert response.json()["data"]["level"] == 3
+
+    response = await client.get(f"/api/v1/categories/{cookware}")
+    assert response.json()["data"]["path"] == "Home.Kitchen_Tools.Knives.Pantry.Cookware"
+    assert response.json()["data"]["level"] == 4
+
+
+@pytest.mark.asyncio
+async def test_get_category_tree(client: AsyncClient):
+    """Test the tree endpoint and hierarchy checks served from the snapshot."""
+    async def create(name, parent_id=None):
+        response = await client.post("/api/v1/categories/", json={"name": name, "parent_id": parent_id})
+        return response.json()["data"]["id"]
+
+    home = await create("Home")
+    kitchen = await create("Kitchen", home)
+    await create("Cookware", kitchen)
+    await create("Bath", home)
+
+    response = await client.get("/api/v1/categories/tree")
+    assert response.status_code == 200
+    [root] = response.json()["data"]
+    assert root["name"] == "Home"
+    assert [child["name"] for child in root["children"]] == ["Bath", "Kitchen"]
+    assert root["children"][1]["children"][0]["path"] == "Home.Kitchen.Cookware"
+
+    response = await client.get(f"/api/v1/categories/tree?root_id={kitchen}&max_depth=1")
+    assert response.json()["data"][0]["children"] == []
+
+    response = await client.post(f"/api/v1/categories/{home}/move?new_parent_id={kitchen}")
+    assert response.status_code == 400
+
+    response = await client.delete(f"/api/v1/categories/{home}")
+    assert response.status_code == 400
+
+    response = await client.get("/api/v1/categories/tree?root_id=999")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_category_conditional(client: AsyncClient):
+    """Test ETag / If-None-Match handling for a single category."""
+    create_response = await client.post("/api/v1/categories/", json={"name": "Garden"})
+    category_id = create_response.json()["data"]["id"]
+
+    response = await client.get(f"/api/v1/categories/{category_id}")
+    etag = response.headers["etag"]
+
+    response = await client.get(f"/api/v1/categories/{category_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    await client.put(f"/api/v1/categories/{category_id}", json={"description": "Plants"})
+    response = await client.get(f"/api/v1/categories/{category_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_get_categories_conditional(client: AsyncClient):
+    """Test list ETags change when a listed category changes."""
+    await client.post("/api/v1/categories/", json={"name": "Garden"})
+    response = await client.get("/api/v1/categories/")
+    etag = response.headers["etag"]
+
+    response = await client.get("/api/v1/categories/", headers={"If-None-Match": f'W/{etag}'})
+    assert response.status_code == 304
+
+    response = await client.get("/api/v1/categories/?size=5", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+    await client.post("/api/v1/categories/", json={"name": "Books"})
+    response = await client.get("/api/v1/categories/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_update_is_compare_and_swap(client: AsyncClient, query_budget):
+    """Test version guards, database-enforced names and their round trips."""
+    async def create(name, parent_id=None):
+        response = await client.post("/api/v1/categories/", json={"name": name, "parent_id": parent_id})
+        return response.json()["data"]["id"]
+
+    home = await create("Home")
+    garden = await create("Garden")
+    await client.get("/api/v1/categories/tree")  # load the hierarchy snapshot
+
+    with query_budget(1):
+        response = await client.put(f"/api/v1/categories/{home}", json={"description": "House", "version": 1})
+    assert response.json()["data"]["version"] == 2
+
+    # A stale version misses, then one read tells it from a 404
+    with query_budget(2):
+        response = await client.put(f"/api/v1/categories/{home}", json={"description": "Old", "version": 1})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Category has been modified by another user"
+    response = await client.put("/api/v1/categories/999", json={"description": "Nowhere"})
+    assert response.status_code == 404
+
+    with query_budget(1):
+        response = await client.put(f"/api/v1/categories/{home}", json={"name": "Garden"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Category with this name already exists"
+    with query_budget(1):
+        response = await client.post("/api/v1/categories/", json={"name": "Garden"})
+    assert response.status_code == 400
+    response = await client.get(f"/api/v1/categories/{home}")
+    assert (response.json()["data"]["name"], response.json()["data"]["version"]) == ("Home", 2)
+    assert await create("Yard", garden) is not None
+
+
+@pytest.mark.asyncio
+async def test_patch_changes_only_sent_fields(client: AsyncClient):
+    """Test PATCH clears fields sent as null and moves to the root."""
+    response = await client.post("/api/v1/categories/", json={"name": "Home", "description": "House"})
+    home = response.json()["data"]["id"]
+    response = await client.post("/api/v1/categories/", json={"name": "Kitchen", "parent_id": home})
+    kitchen = response.json()["data"]["id"]
+
+    # PUT keeps null fields
+    response = await client.put(f"/api/v1/categories/{home}", json={"description": None, "attributes": {"a": 1}})
+    assert response.json()["data"]["description"] == "House"
+
+    response = await client.patch(f"/api/v1/categories/{home}", json={"description": None})
+    data = response.json()["data"]
+    assert (data["description"], data["attributes"]) == (None, {"a": 1})
+
+    response = await client.patch(f"/api/v1/categories/{kitchen}", json={"parent_id": None})
+    data = response.json()["data"]
+    assert (data["parent_id"], data["path"], data["level"]) == (None, "Kitchen", 0)
+    assert (await client.get(f"/api/v1/categories/{home}")).json()["data"]["child_count"] == 0
+
+    response = await client.patch(f"/api/v1/categories/{kitchen}", json={"name": None})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_update_retries_on_stale_hierarchy(client: AsyncClient, db_session):
+    """Test a rename made by another process is picked up instead of clobbered."""
+    response = await client.post("/api/v1/categories/", json={"name": "Home"})
+    home = response.json()["data"]["id"]
+    response = await client.post("/api/v1/categories/", json={"name": "Kitchen", "parent_id": home})
+    kitchen = response.json()["data"]["id"]
+
+    # Another worker renamed Home; this worker's snapshot still says "Home"
+    await db_session.execute(text("UPDATE categories SET name = 'House', path = 'House' WHERE id = :id"), {"id": home})
+    await db_session.execute(text("UPDATE categories SET path = 'House.Kitchen' WHERE id = :id"), {"id": kitchen})
+    await db_session.commit()
+
+    response = await client.put(f"/api/v1/categories/{kitchen}", json={"name": "Pantry"})
+    assert response.status_code == 200
+    assert response.json()["data"]["path"] == "House.Pantry"
+
+
+@pytest.mark.asyncio
+async def test_writes_check_parent_in_database(client: AsyncClient, db_session):
+    """Test creates and moves take the parent's path and state from the database, not the snapshot."""
+    async def create(name, parent_id=None):
+        return await client.post("/api/v1/categories/", json={"name": name, "parent_id": parent_id})
+
+    home = (await create("Home")).json()["data"]["id"]
+    garden = (await create("Garden")).json()["data"]["id"]
+    shed = (await create("Shed", garden)).json()["data"]["id"]
+    await client.get("/api/v1/categories/tree")  # load the hierarchy snapshot
+
+    # Another worker renamed Home
+    await db_session.execute(text("UPDATE categories SET name = 'House', path = 'House' WHERE id = :id"), {"id": home})
+    await db_session.commit()
+
+    response = await create("Kitchen", home)
+    assert response.status_code == 201
+    assert response.json()["data"]["path"] == "House.Kitchen"
+    response = await client.post(f"/api/v1/categories/{shed}/move?new_parent_id={home}")
+    assert response.status_code == 200
+    assert (response.json()["data"]["path"], response.json()["data"]["level"]) == ("House.Shed", 1)
+
+    # ...and moved Garden under Home: moving Home under Garden is now a cycle
+    await db_session.execute(text("UPDATE categories SET parent_id = :home, level = 1, path = 'House.Garden' WHERE id = :id"), {"home": home, "id": garden})
+    await db_session.commit()
+    response = await client.post(f"/api/v1/categories/{home}/move?new_parent_id={garden}")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Moving category would create a circular reference"
+
+    # Another worker deleted Garden
+    await db_session.execute(text("UPDATE categories SET is_deleted = 1 WHERE id = :id"), {"id": garden})
+    await db_session.commit()
+    response = await create("Greenhouse", garden)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot create category under deleted parent"
+    response = await client.post(f"/api/v1/categories/{shed}/move?new_parent_id={garden}")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot move category under deleted parent"
+    response = await create("Greenhouse", 999)
+    assert response.json()["detail"] == "Parent category not found"
+
+
+@pytest.mark.asyncio
+async def test_update_guards_name_and_parent_the_snapshot_agrees_with(client: AsyncClient, db_session):
+    """Test a rename or move the snapshot thinks is a no-op is still checked against the database."""
+    async def create(name, parent_id=None):
+        response = await client.post("/api/v1/categories/", json={"name": name, "parent_id": parent_id})
+        return response.json()["data"]["id"]
+
+    shelf = await create("Shelf")
+    left = await create("Left")
+    right = await create("Right")
+    box = await create("Box", left)
+    await client.get("/api/v1/categories/tree")  # load the hierarchy snapshot
+
+    # Another worker renamed Shelf to Rack and moved Box under Right
+    await db_session.execute(text("UPDATE categories SET name = 'Rack', path = 'Rack' WHERE id = :id"), {"id": shelf})
+    await db_session.execute(
+        text("UPDATE categories SET parent_id = :right, path = 'Right.Box' WHERE id = :id"), {"right": right, "id": box}
+    )
+    await db_session.commit()
+
+    response = await client.put(f"/api/v1/categories/{shelf}", json={"name": "Shelf"})
+    assert response.status_code == 200
+    assert (response.json()["data"]["name"], response.json()["data"]["path"]) == ("Shelf", "Shelf")
+    response = await client.patch(f"/api/v1/categories/{box}", json={"parent_id": left})
+    assert response.status_code == 200
+    assert (response.json()["data"]["parent_id"], response.json()["data"]["path"]) == (left, "Left.Box")
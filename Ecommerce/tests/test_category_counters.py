@@ -0,0 +1,115 @@
+"""
+Test the denormalized category child and product counters.
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+
+from app.models.category import Category
+from app.models.category_counters import install_category_counters, recount_categories
+
+
+async def _create(client: AsyncClient, name: str, parent_id: int = None) -> int:
+    response = await client.post("/api/v1/categories/", json={"name": name, "parent_id": parent_id})
+    assert response.status_code == 201, response.text
+    return response.json()["data"]["id"]
+
+
+async def _counts(client: AsyncClient, category_id: int) -> tuple:
+    data = (await client.get(f"/api/v1/categories/{category_id}")).json()["data"]
+    return data["child_count"], data["product_count"]
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_category_writes(client: AsyncClient):
+    """Test create, move, soft delete and hard delete adjust the parent's child_count."""
+    home = await _create(client, "Home")
+    garden = await _create(client, "Garden")
+    kitchen = await _create(client, "Kitchen", home)
+    bath = await _create(client, "Bath", home)
+    assert await _counts(client, home) == (2, 0)
+
+    response = await client.post(f"/api/v1/categories/{kitchen}/move?new_parent_id={garden}")
+    assert response.status_code == 200
+    assert await _counts(client, home) == (1, 0)
+    assert await _counts(client, garden) == (1, 0)
+
+    assert (await client.delete(f"/api/v1/categories/{bath}")).status_code == 204
+    assert (await client.delete(f"/api/v1/categories/{kitchen}?force=true")).status_code == 204
+    assert await _counts(client, home) == (0, 0)
+    assert await _counts(client, garden) == (0, 0)
+
+    response = await client.get("/api/v1/categories/")
+    assert {item["name"]: item["child_count"] for item in response.json()["data"]} == {"Garden": 0, "Home": 0}
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_product_writes(client: AsyncClient, db_session):
+    """Test bulk creates and moves, soft deletes and raw deletes adjust product_count."""
+    home = await _create(client, "Home")
+    garden = await _create(client, "Garden")
+    response = await client.post("/api/v1/products:bulk", json={"items": [
+        {"name": f"Mug {i}", "category_id": home} for i in range(3)
+    ]})
+    ids = [item["id"] for item in response.json()["data"]]
+    assert await _counts(client, home) == (0, 3)
+
+    response = await client.post("/api/v1/products:bulk", json={"items": [
+        {"id": ids[0], "name": "Mug 0", "category_id": garden}
+    ]})
+    assert response.status_code == 200
+    assert await _counts(client, home) == (0, 2)
+    assert await _counts(client, garden) == (0, 1)
+
+    await db_session.execute(text("UPDATE products SET is_deleted = 1 WHERE id = :id"), {"id": ids[1]})
+    await db_session.execute(text("DELETE FROM products WHERE id = :id"), {"id": ids[2]})
+    await db_session.commit()
+    category = (await db_session.execute(
+        select(Category).where(Category.id == home).execution_options(populate_existing=True)
+    )).scalar_one()
+    assert (category.child_count, category.product_count) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_delete_checks_counters(client: AsyncClient, query_budget):
+    """Test deletes are guarded by the counters, without counting rows."""
+    home = await _create(client, "Home")
+    kitchen = await _create(client, "Kitchen", home)
+    await client.post("/api/v1/products:bulk", json={"items": [{"name": "Kettle", "category_id": kitchen}]})
+
+    # The guarded write misses, then one read of the counters says why
+    with query_budget(2):
+        response = await client.delete(f"/api/v1/categories/{home}")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot delete category with children"
+
+    response = await client.delete(f"/api/v1/categories/{kitchen}")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot delete category with products"
+
+
+@pytest.mark.asyncio
+async def test_recount_and_install_repair_drift(client: AsyncClient, db_session):
+    """Test the repair recount and installing on an existing database fix wrong counters."""
+    home = await _create(client, "Home")
+    await _create(client, "Kitchen", home)
+    await client.post("/api/v1/products:bulk", json={"items": [{"name": "Lamp", "category_id": home}]})
+
+    await db_session.execute(text("UPDATE categories SET child_count = 7, product_count = 0"))
+    await db_session.commit()
+    connection = await db_session.connection()
+    assert await connection.run_sync(recount_categories) == 2
+    await db_session.commit()
+    assert await _counts(client, home) == (1, 1)
+
+    # A database from before the counters: no triggers, zeroed columns
+    await db_session.execute(text("DROP TRIGGER products_product_count_ai"))
+    await db_session.execute(text("UPDATE categories SET child_count = 0, product_count = 0"))
+    await db_session.commit()
+    connection = await db_session.connection()
+    assert await connection.run_sync(install_category_counters) == 1
+    await db_session.commit()
+    assert await _counts(client, home) == (1, 1)
+
+    await client.post("/api/v1/products:bulk", json={"items": [{"name": "Rug", "category_id": home}]})
+    assert await _counts(client, home) == (1, 2)
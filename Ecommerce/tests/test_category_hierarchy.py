@@ -0,0 +1,42 @@
+"""
+Test the in-process category hierarchy snapshot.
+"""
+from app.services.category_hierarchy import HierarchyNode, HierarchySnapshot
+
+
+def make_snapshot() -> HierarchySnapshot:
+    """Home > Kitchen > Cookware, Home > Bath, plus a deleted Home > Old."""
+    return HierarchySnapshot([
+        HierarchyNode(1, None, 0, "Home", "Home", False),
+        HierarchyNode(2, 1, 1, "Home.Kitchen", "Kitchen", False),
+        HierarchyNode(3, 2, 2, "Home.Kitchen.Cookware", "Cookware", False),
+        HierarchyNode(4, 1, 1, "Home.Bath", "Bath", False),
+        HierarchyNode(5, 1, 1, "Home.Old", "Old", True),
+    ])
+
+
+def test_ancestors_and_cycles():
+    """Test ancestor walks and cycle detection."""
+    snapshot = make_snapshot()
+    assert snapshot.ancestors(3) == [2, 1]
+    assert snapshot.ancestors(1) == []
+    assert snapshot.would_create_cycle(1, 3)
+    assert snapshot.would_create_cycle(2, 2)
+    assert not snapshot.would_create_cycle(4, 3)
+
+
+def test_children_skip_deleted():
+    """Test children index only counts live categories."""
+    snapshot = make_snapshot()
+    assert snapshot.children_count(1) == 2
+    assert sorted(snapshot.descendants(1)) == [2, 3, 4]
+    assert snapshot.get(5).is_deleted
+
+
+def test_patches_return_new_snapshots():
+    """Test patching leaves the original snapshot untouched."""
+    snapshot = make_snapshot()
+    patched = snapshot.with_node(HierarchyNode(6, 4, 2, "Home.Bath.Towels", "Towels", False))
+    assert patched.children(4) == [6]
+    assert snapshot.children(4) == []
+    assert 6 not in patched.without_node(6)
@@ -0,0 +1,64 @@
+"""
+Test streaming catalog export endpoints.
+"""
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.product import Product
+
+
+@pytest.mark.asyncio
+async def test_export_products_ndjson(client: AsyncClient, db_session, monkeypatch):
+    """Test NDJSON export streams every live row in id order across batches."""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    category = Category(name="Electronics", path="Electronics")
+    db_session.add(category)
+    await db_session.commit()
+    for i in range(5):
+        db_session.add(Product(
+            name=f"Product {i}", category_id=category.id,
+            attributes={"color": "red"}, is_deleted=(i == 3)
+        ))
+    await db_session.commit()
+
+    response = await client.get("/api/v1/export/products")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Product 0", "Product 1", "Product 2", "Product 4"]
+    assert rows[0]["attributes"] == {"color": "red"}
+    assert rows[0]["category_id"] == category.id
+
+    response = await client.get("/api/v1/export/products?include_deleted=true")
+    assert len(response.text.splitlines()) == 5
+
+
+@pytest.mark.asyncio
+async def test_export_categories_csv_gzip(client: AsyncClient, db_session):
+    """Test gzip-compressed CSV export with a header row."""
+    db_session.add(Category(name="Books, Rare", path="Books, Rare", attributes={"a": 1}))
+    await db_session.commit()
+
+    response = await client.get("/api/v1/export/categories?format=csv&gzip=true")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert 'filename="categories.csv.gz"' in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+    assert len(rows) == 1
+    assert rows[0]["name"] == "Books, Rare"
+    assert json.loads(rows[0]["attributes"]) == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_export_unknown_table(client: AsyncClient, db_session):
+    """Test only catalog tables can be exported."""
+    response = await client.get("/api/v1/export/users")
+    assert response.status_code == 422
@@ -0,0 +1,239 @@
+"""
+Test bitmap facet counts for product search.
+"""
+import random
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+from app.services.search.bitmap import ARRAY_LIMIT, Bitmap
+from app.services.search.facets import FacetIndex, product_facets
+from app.services.search.trigram import product_search_index
+
+
+def test_bitmap_matches_set_semantics():
+    """Test sparse and dense chunks against plain sets, across conversions."""
+    rng = random.Random(7)
+    a_ids = set(rng.sample(range(200000), 9000)) | set(range(70000, 80000))
+    b_ids = set(rng.sample(range(200000), 3000)) | set(range(75000, 76000))
+    a, b = Bitmap(sorted(a_ids)), Bitmap(b_ids)
+
+    assert len(a) == len(a_ids) and list(a) == sorted(a_ids)
+    assert list(a & b) == sorted(a_ids & b_ids)
+    assert a.intersection_count(b) == len(a_ids & b_ids)
+    assert list(a | b) == sorted(a_ids | b_ids)
+
+    for value in range(70000, 79990):
+        a.discard(value)
+        a_ids.discard(value)
+    assert list(a) == sorted(a_ids) and len(a) == len(a_ids)
+    assert 79995 in a and 70000 not in a
+
+
+def test_bitmap_dense_chunk():
+    """Test a chunk past ARRAY_LIMIT ids is a bitset and counts, intersects and shrinks back."""
+    ids = set(range(0, 2 * ARRAY_LIMIT + 2, 2))
+    bitmap = Bitmap(ids)
+    assert isinstance(bitmap._chunks[0], int)
+    assert len(bitmap) == len(ids) == ARRAY_LIMIT + 1
+    assert bitmap.intersection_count(Bitmap(range(0, 2 * ARRAY_LIMIT, 4))) == ARRAY_LIMIT // 2
+    assert len(bitmap | Bitmap(range(1, 100, 2))) == len(ids) + 50
+
+    for value in sorted(ids)[:ARRAY_LIMIT // 2 + 1]:
+        bitmap.discard(value)
+        ids.discard(value)
+    assert not isinstance(bitmap._chunks[0], int)
+    assert list(bitmap) == sorted(ids) and len(bitmap) == len(ids)
+
+
+def test_index_updates_in_place():
+    """Test moves, attribute changes, SKU values and removals keep counts exact."""
+    index = FacetIndex(["brand"], ["color"])
+    index.put(1, 10, {"brand": "Acme"})
+    index.put(2, 10, {"brand": "Trek", "waterproof": True})
+    index.put(3, 20, {"brand": "Acme"})
+    index.put_skus(1, [("color", "red"), ("color", "blue")])
+
+    assert index.category_counts(None) == {10: 2, 20: 1}
+    assert index.value_counts("brand", None, 10) == [("Acme", 2), ("Trek", 1)]
+    assert index.value_counts("color", None, 10) == [("blue", 1), ("red", 1)]
+
+    index.put(1, 20, {"brand": "Trek"})
+    assert index.category_counts(None) == {10: 1, 20: 2}
+    assert index.value_counts("brand", None, 10) == [("Trek", 2), ("Acme", 1)]
+    assert index.value_counts("color", None, 10) == [("blue", 1), ("red", 1)]
+
+    index.put_skus(1, [])
+    index.remove(3)
+    assert index.value_counts("color", None, 10) == []
+    assert index.value_counts("brand", None, 10) == [("Trek", 2)]
+    assert index.category_counts(None) == {10: 1, 20: 1}
+    assert len(index) == 2
+
+    matches = index.match([index.value("brand", "Trek"), index.category(20)])
+    assert list(matches) == [1]
+    assert index.category_counts(matches) == {20: 1}
+
+
+@pytest_asyncio.fixture
+async def catalog(db_session) -> dict:
+    """Apparel > (Jackets, Shoes) and Kitchen with branded products and SKUs."""
+    apparel = Category(name="Apparel", path="Apparel")
+    kitchen = Category(name="Kitchen", path="Kitchen")
+    db_session.add_all([apparel, kitchen])
+    await db_session.flush()
+    jackets = Category(name="Jackets", parent_id=apparel.id, level=1, path="Apparel/Jackets")
+    shoes = Category(name="Shoes", parent_id=apparel.id, level=1, path="Apparel/Shoes")
+    db_session.add_all([jackets, shoes])
+    await db_session.flush()
+
+    products = {
+        "rain jacket": Product(name="Rain Jacket", category_id=jackets.id, attributes={"brand": "Acme"}),
+        "ski jacket": Product(name="Ski Jacket", category_id=jackets.id, attributes={"brand": "Trek"}),
+        "trail shoe": Product(name="Trail Shoe", category_id=shoes.id, attributes={"brand": "Trek"}),
+        "kettle": Product(name="Kettle", category_id=kitchen.id, attributes={"brand": "Acme"}),
+        "old jacket": Product(name="Old Jacket", category_id=jackets.id, attributes={"brand": "Acme"},
+                              is_deleted=True),
+    }
+    db_session.add_all(products.values())
+    await db_session.flush()
+    db_session.add_all([
+        SKU(sku_code="RJ-R", product_id=products["rain jacket"].id, price=Decimal("90"),
+            attributes={"color": "red", "size": "M"}),
+        SKU(sku_code="RJ-B", product_id=products["rain jacket"].id, price=Decimal("90"),
+            attributes={"color": "blue", "size": "M"}),
+        SKU(sku_code="SJ-R", product_id=products["ski jacket"].id, price=Decimal("150"),
+            attributes={"color": "red", "size": "L"}),
+        SKU(sku_code="TS-R", product_id=products["trail shoe"].id, price=Decimal("80"),
+            attributes={"color": "red"}, is_deleted=True),
+    ])
+    await db_session.commit()
+    ids = {name: row.id for name, row in products.items()}
+    ids.update(apparel=apparel.id, kitchen=kitchen.id, jackets=jackets.id, shoes=shoes.id)
+    return ids
+
+
+async def _facets(client: AsyncClient, query: str = "") -> dict:
+    response = await client.get(f"/api/v1/products/facets?{query}")
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def _values(facets: dict, key: str) -> dict:
+    return {item["value"]: item["count"] for item in facets["attributes"][key]}
+
+
+def _categories(facets: dict) -> dict:
+    return {item["name"]: item["count"] for item in facets["categories"]}
+
+
+@pytest.mark.asyncio
+async def test_unfiltered_facets(client: AsyncClient, catalog):
+    """Test counts over all live products roll up to root categories."""
+    facets = await _facets(client)
+    assert facets["total"] == 4
+    assert facets["categories"][0] == {"id": catalog["apparel"], "name": "Apparel", "count": 3}
+    assert _categories(facets) == {"Apparel": 3, "Kitchen": 1}
+    assert _values(facets, "brand") == {"Acme": 2, "Trek": 2}
+    assert _values(facets, "color") == {"red": 2, "blue": 1}
+    assert _values(facets, "size") == {"M": 1, "L": 1}
+    assert facets["attributes"]["material"] == []
+
+
+@pytest.mark.asyncio
+async def test_filtered_facets(client: AsyncClient, catalog):
+    """Test query, category subtree and attribute filters intersect."""
+    facets = await _facets(client, "query=jacket")
+    assert facets["total"] == 2
+    assert _categories(facets) == {"Apparel": 2}
+    assert _values(facets, "brand") == {"Acme": 1, "Trek": 1}
+
+    facets = await _facets(client, f"category_id={catalog['apparel']}")
+    assert facets["total"] == 3
+    assert _categories(facets) == {"Jackets": 2, "Shoes": 1}
+
+    facets = await _facets(client, f"category_id={catalog['apparel']}&attr.color=red")
+    assert facets["total"] == 2
+    assert _categories(facets) == {"Jackets": 2}
+    assert _values(facets, "size") == {"M": 1, "L": 1}
+
+    facets = await _facets(client, "query=jacket&attr.brand=Trek&top=1")
+    assert facets["total"] == 1
+    assert _values(facets, "color") == {"red": 1}
+
+    facets = await _facets(client, "attr.brand=Nobody")
+    assert facets["total"] == 0
+    assert facets["categories"] == []
+
+
+@pytest.mark.asyncio
+async def test_non_facet_filter_rejected(client: AsyncClient, catalog):
+    """Test filters on keys without a facet are a bad request."""
+    response = await client.get("/api/v1/products/facets?attr.weight=1")
+    assert response.status_code == 400
+    assert "not a facet" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_writes_update_loaded_facets(client: AsyncClient, catalog, query_budget):
+    """Test bulk product and SKU writes patch the warm indexes without a rebuild."""
+    await _facets(client, "query=jacket")
+
+    response = await client.post("/api/v1/products:bulk", json={"items": [
+        {"id": catalog["kettle"], "name": "Kettle", "category_id": catalog["shoes"], "attributes": {"brand": "Trek"}},
+        {"name": "Down Jacket", "category_id": catalog["jackets"], "attributes": {"brand": "Zed"}},
+    ]})
+    assert response.status_code == 200, response.text
+    response = await client.post("/api/v1/skus:bulk", json={"items": [
+        {"sku_code": "RJ-B", "product_id": catalog["rain jacket"], "price": "90", "inventory_count": 1,
+         "attributes": {"color": "green"}},
+        {"sku_code": "K-W", "product_id": catalog["kettle"], "price": "30", "inventory_count": 1,
+         "attributes": {"color": "white"}},
+    ]})
+    assert response.status_code == 200, response.text
+
+    with query_budget(0):
+        facets = await _facets(client)
+    assert facets["total"] == 5
+    assert _categories(facets) == {"Apparel": 5}
+    assert _values(facets, "brand") == {"Trek": 3, "Acme": 1, "Zed": 1}
+    assert _values(facets, "color") == {"red": 2, "green": 1, "white": 1}
+
+    with query_budget(0):
+        facets = await _facets(client, "query=down")
+    assert facets["total"] == 1
+    assert _values(facets, "brand") == {"Zed": 1}
+
+
+@pytest.mark.asyncio
+async def test_indexes_pick_up_other_workers_writes(client: AsyncClient, db_session, catalog, monkeypatch):
+    """Test the warm indexes are rebuilt once the watermark moves and the interval passed."""
+    assert (await _facets(client, "query=jacket"))["total"] == 2
+
+    # Another worker renamed the kettle and rebranded it
+    await db_session.execute(
+        text("UPDATE products SET name = 'Kettle Jacket', attributes = :attributes, updated_at = :now WHERE id = :id"),
+        {"attributes": '{"brand": "Zed"}', "now": datetime.utcnow(), "id": catalog["kettle"]}
+    )
+    await db_session.commit()
+    assert (await _facets(client, "query=jacket"))["total"] == 2  # within the interval
+
+    monkeypatch.setattr(product_facets.watermark, "interval_seconds", 0)
+    monkeypatch.setattr(product_search_index.watermark, "interval_seconds", 0)
+    facets = await _facets(client, "query=jacket")
+    assert facets["total"] == 3
+    assert _values(facets, "brand") == {"Acme": 1, "Trek": 1, "Zed": 1}
+    response = await client.get("/api/v1/products/search?query=kettle jacket")
+    assert [item["id"] for item in response.json()["data"]] == [catalog["kettle"]]
+
+    # Unchanged tables cost one watermark read per index, not a rebuild
+    index = await product_facets.get(db_session)
+    await _facets(client, "query=jacket")
+    assert await product_facets.get(db_session) is index
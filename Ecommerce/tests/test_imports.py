@@ -0,0 +1,147 @@
+"""
+Test the resumable catalog import pipeline.
+"""
+import json
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.models.category import Category
+from app.models.import_job import ImportJob
+from app.models.product import Product
+from app.services.bulk_service import BulkService
+from app.services.category_service import CategoryService
+from app.services.import_service import ImportEntity, ImportService
+
+
+@pytest_asyncio.fixture
+async def category(db_session) -> Category:
+    """Create a category to hold imported products."""
+    category = Category(name="Electronics", path="Electronics")
+    db_session.add(category)
+    await db_session.commit()
+    return category
+
+
+@pytest.mark.asyncio
+async def test_import_products_csv_upload(client: AsyncClient, db_session, category):
+    """Test CSV upload with quoted multi-line fields, JSON attributes and bad rows."""
+    content = (
+        "name,description,category_id,attributes\n"
+        f'Headphones,"Over-ear,\nwireless",{category.id},"{{""color"": ""black""}}"\n'
+        f",Missing name,{category.id},\n"
+        "Orphan,,999,\n"
+        f"Speaker,,{category.id},\n"
+    )
+    response = await client.post(
+        "/api/v1/imports/products",
+        files={"file": ("feed.csv", content.encode(), "text/csv")}
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert (data["status"], data["rows_processed"], data["rows_written"], data["rows_failed"]) == \
+        ("completed", 4, 2, 2)
+    assert data["errors"][0].startswith("row 2: name:")
+    assert data["errors"][1] == "row 3: Category not found"
+
+    result = await db_session.execute(select(Product).where(Product.name == "Headphones"))
+    product = result.scalar_one()
+    assert product.description == "Over-ear,\nwireless"
+    assert product.attributes == {"color": "black"}
+
+    # The same file is not imported twice
+    response = await client.post(
+        "/api/v1/imports/products",
+        files={"file": ("feed.csv", content.encode(), "text/csv")}
+    )
+    assert response.json()["data"]["rows_written"] == 0
+    assert await db_session.scalar(select(func.count(Product.id))) == 2
+
+    response = await client.get(f"/api/v1/imports/{data['job_id']}")
+    assert response.json()["data"]["rows_failed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_import_resumes_after_failure(db_session, category, tmp_path, monkeypatch):
+    """Test a failed import resumes after the last committed chunk."""
+    path = tmp_path / "products.ndjson"
+    path.write_text("".join(
+        json.dumps({"name": f"Product {i}", "category_id": category.id}) + "\n" for i in range(10)
+    ))
+
+    calls = 0
+    upsert_products = BulkService.upsert_products
+
+    async def flaky_upsert(self, items):
+        nonlocal calls
+        calls += 1
+        if calls == 3:
+            raise RuntimeError("database went away")
+        return await upsert_products(self, items)
+
+    monkeypatch.setattr(BulkService, "upsert_products", flaky_upsert)
+    progress = []
+    with pytest.raises(RuntimeError):
+        await ImportService(db_session, chunk_size=3).run(
+            str(path), ImportEntity.products, on_progress=lambda result: progress.append(result.rows_processed)
+        )
+    assert progress == [3, 6]
+    job = (await db_session.execute(select(ImportJob))).scalar_one()
+    assert (job.status, job.rows_processed) == ("failed", 6)
+    assert await db_session.scalar(select(func.count(Product.id))) == 6
+
+    result = await ImportService(db_session, chunk_size=3).run(str(path), ImportEntity.products)
+    assert (result.status, result.resumed_from, result.rows_processed, result.rows_written) == \
+        ("completed", 6, 10, 4)
+    names = (await db_session.execute(select(Product.name).order_by(Product.id))).scalars().all()
+    assert names == [f"Product {i}" for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_import_categories_ndjson(db_session, tmp_path):
+    """Test categories are created in file order so children find parents."""
+    path = tmp_path / "categories.ndjson"
+    path.write_text(
+        '{"name": "Electronics"}\n'
+        '\n'
+        '{"name": "Audio", "parent_id": 1}\n'
+        'not json\n'
+        '{"name": "Audio", "parent_id": 1}\n'
+    )
+    result = await ImportService(db_session, chunk_size=2).run(str(path), ImportEntity.categories)
+    assert (result.rows_processed, result.rows_written, result.rows_failed) == (4, 2, 2)
+    assert result.errors == [
+        "row 3: invalid JSON: Expecting value",
+        "row 4: Category with this name already exists",
+    ]
+    paths = (await db_session.execute(select(Category.path).order_by(Category.id))).scalars().all()
+    assert paths == ["Electronics", "Electronics.Audio"]
+
+
+@pytest.mark.asyncio
+async def test_import_categories_chunk_is_one_transaction(db_session, tmp_path, monkeypatch):
+    """Test a category chunk that fails midway leaves nothing behind, so the resume reports no duplicates."""
+    path = tmp_path / "categories.ndjson"
+    path.write_text("".join(json.dumps({"name": f"Category {i}"}) + "\n" for i in range(4)))
+
+    calls = 0
+    insert_one = CategoryService._insert_one
+
+    async def flaky_insert(self, item):
+        nonlocal calls
+        calls += 1
+        if calls == 4:
+            raise RuntimeError("database went away")
+        return await insert_one(self, item)
+
+    monkeypatch.setattr(CategoryService, "_insert_one", flaky_insert)
+    with pytest.raises(RuntimeError):
+        await ImportService(db_session, chunk_size=2).run(str(path), ImportEntity.categories)
+    assert await db_session.scalar(select(func.count(Category.id))) == 2
+
+    result = await ImportService(db_session, chunk_size=2).run(str(path), ImportEntity.categories)
+    assert (result.resumed_from, result.rows_written, result.rows_failed) == (2, 2, 0)
+    names = (await db_session.execute(select(Category.name).order_by(Category.id))).scalars().all()
+    assert names == [f"Category {i}" for i in range(4)]
@@ -0,0 +1,116 @@
+"""
+Test atomic inventory adjustment endpoints.
+"""
+import asyncio
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+from app.services.inventory_service import InsufficientInventory, InventoryService
+
+
+@pytest_asyncio.fixture
+async def skus(db_session) -> list:
+    """Three live SKUs with 10, 5 and 0 units, plus a deleted one."""
+    category = Category(name="Electronics", path="Electronics")
+    db_session.add(category)
+    await db_session.flush()
+    product = Product(name="Phone", category_id=category.id)
+    db_session.add(product)
+    await db_session.flush()
+    rows = [
+        SKU(sku_code="A", product_id=product.id, price=Decimal("1.00"), inventory_count=10, attributes={"color": "red"}),
+        SKU(sku_code="B", product_id=product.id, price=Decimal("1.00"), inventory_count=5, attributes={}),
+        SKU(sku_code="C", product_id=product.id, price=Decimal("1.00"), inventory_count=0, attributes={}),
+        SKU(sku_code="D", product_id=product.id, inventory_count=5, attributes={}, is_deleted=True),
+    ]
+    db_session.add_all(rows)
+    await db_session.commit()
+    return rows
+
+
+async def _inventory(db_session, sku: SKU) -> int:
+    await db_session.refresh(sku)
+    return sku.inventory_count
+
+
+@pytest.mark.asyncio
+async def test_adjust_inventory(client: AsyncClient, db_session, skus, query_budget):
+    """Test a delta is applied in one statement and the count never drops below zero."""
+    sku = skus[0]
+    with query_budget(1):
+        response = await client.post(f"/api/v1/skus/{sku.id}/inventory:adjust", json={"delta": -4})
+    assert response.status_code == 200
+    assert response.json()["data"] == {"sku_id": sku.id, "inventory_count": 6}
+    assert await _inventory(db_session, sku) == 6
+    assert sku.attributes["color"] == "red"
+    assert sku.version == 2
+
+    response = await client.post(f"/api/v1/skus/{sku.id}/inventory:adjust", json={"delta": -7})
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Insufficient inventory"
+    assert await _inventory(db_session, sku) == 6
+
+    response = await client.post(f"/api/v1/skus/{skus[3].id}/inventory:adjust", json={"delta": 1})
+    assert response.status_code == 404
+    response = await client.post("/api/v1/skus/999/inventory:adjust", json={"delta": 1})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_adjust_inventory_batch(client: AsyncClient, db_session, skus):
+    """Test batches sum repeated SKUs and atomic batches apply all or nothing."""
+    a, b, c, deleted = [sku.id for sku in skus]
+    items = [
+        {"sku_id": a, "delta": -3},
+        {"sku_id": b, "delta": -5},
+        {"sku_id": a, "delta": -2},
+        {"sku_id": c, "delta": -1},
+        {"sku_id": deleted, "delta": 1},
+    ]
+    response = await client.post("/api/v1/skus/inventory:adjust", json={"items": items})
+    assert response.status_code == 409
+    data = response.json()
+    assert data["meta"] == {"total": 4, "adjusted": 0, "rejected": 4}
+    assert [(r["sku_id"], r["status"], r["error"]) for r in data["data"]] == [
+        (a, "skipped", "Batch rejected"),
+        (b, "skipped", "Batch rejected"),
+        (c, "error", "Insufficient inventory"),
+        (deleted, "error", "SKU not found"),
+    ]
+    assert await _inventory(db_session, skus[0]) == 10
+
+    response = await client.post("/api/v1/skus/inventory:adjust", json={"items": items, "atomic": False})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["meta"] == {"total": 4, "adjusted": 2, "rejected": 2}
+    assert [(r["sku_id"], r["status"], r["inventory_count"]) for r in data["data"][:2]] == [
+        (a, "adjusted", 5), (b, "adjusted", 0)
+    ]
+    assert await _inventory(db_session, skus[0]) == 5
+    assert await _inventory(db_session, skus[1]) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_decrements_lose_no_updates(db_session, skus):
+    """Test concurrent sessions decrementing one SKU neither lose updates nor oversell."""
+    sku = skus[0]
+    Session = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+
+    async def decrement() -> bool:
+        async with Session() as session:
+            try:
+                await InventoryService(session).adjust(sku.id, -1)
+                return True
+            except InsufficientInventory:
+                return False
+
+    outcomes = await asyncio.gather(*(decrement() for _ in range(25)))
+    assert outcomes.count(True) == 10
+    assert await _inventory(db_session, sku) == 0
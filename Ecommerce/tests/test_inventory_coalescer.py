@@ -0,0 +1,169 @@
+"""
+Test write coalescing of inventory adjustments.
+"""
+import asyncio
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+from app.services.inventory_coalescer import InventoryCoalescer, inventory_coalescer
+from app.services.inventory_service import InsufficientInventory, InventoryService
+
+
+@pytest_asyncio.fixture
+async def sku_ids(db_session) -> list:
+    """Ids of two live SKUs with 10 and 3 units."""
+    category = Category(name="Electronics", path="Electronics")
+    db_session.add(category)
+    await db_session.flush()
+    product = Product(name="Phone", category_id=category.id)
+    db_session.add(product)
+    await db_session.flush()
+    rows = [
+        SKU(sku_code="A", product_id=product.id, price=Decimal("1.00"), inventory_count=10, attributes={}),
+        SKU(sku_code="B", product_id=product.id, price=Decimal("1.00"), inventory_count=3, attributes={}),
+    ]
+    db_session.add_all(rows)
+    await db_session.commit()
+    return [sku.id for sku in rows]
+
+
+@pytest_asyncio.fixture
+async def coalescer(db_session):
+    """A coalescer on the test database that only flushes when told to."""
+    Session = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    coalescer = InventoryCoalescer(Session, interval_ms=60_000, max_events=100)
+    coalescer.start()
+    yield coalescer
+    await coalescer.close()
+
+
+async def _stored(db_session, sku_id: int) -> int:
+    return await InventoryService(db_session).get_count(sku_id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_adjustments_share_one_flush(db_session, sku_ids, coalescer):
+    """Test queued deltas for a SKU are written as one row update and all callers see it."""
+    a, b = sku_ids
+    calls = [asyncio.create_task(coalescer.adjust(a, -1)) for _ in range(6)]
+    calls.append(asyncio.create_task(coalescer.adjust(b, 2)))
+    await asyncio.sleep(0)
+    assert coalescer.pending_delta(a) == -6
+    assert await _stored(db_session, a) == 10
+
+    await coalescer.flush()
+    assert await asyncio.gather(*calls) == [4] * 6 + [5]
+    assert await _stored(db_session, a) == 4
+    stats = coalescer.stats()
+    assert (stats["events"], stats["flushes"], stats["rows_updated"]) == (7, 1, 2)
+    assert stats["coalescing_ratio"] == 3.5
+    assert stats["flush_seconds"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_overdrawn_sku_replays_in_arrival_order(db_session, sku_ids, coalescer):
+    """Test a batch that would overdraw accepts exactly the adjustments that fit, in order."""
+    _, b = sku_ids
+    deltas = [-2, -2, 1, -2, -1]
+    calls = [asyncio.create_task(coalescer.adjust(b, delta)) for delta in deltas]
+    await asyncio.sleep(0)
+    await coalescer.flush()
+
+    outcomes = await asyncio.gather(*calls, return_exceptions=True)
+    # 3 -> 1, refused, 2, 0, refused
+    assert [isinstance(o, InsufficientInventory) for o in outcomes] == [False, True, False, False, True]
+    assert [o for o in outcomes if not isinstance(o, Exception)] == [0, 0, 0]
+    assert await _stored(db_session, b) == 0
+    assert coalescer.stats()["replayed_events"] == 5
+
+
+@pytest.mark.asyncio
+async def test_overdrawing_prefix_replays_even_when_sum_fits(db_session, sku_ids, coalescer):
+    """Test [-1, +1] at zero refuses the -1, as it would be unbatched, though the sum is 0."""
+    _, b = sku_ids
+    assert await InventoryService(db_session).adjust(b, -3) == 0
+    calls = [asyncio.create_task(coalescer.adjust(b, delta)) for delta in (-1, 1)]
+    await asyncio.sleep(0)
+    await coalescer.flush()
+
+    refused, accepted = await asyncio.gather(*calls, return_exceptions=True)
+    assert isinstance(refused, InsufficientInventory)
+    assert accepted == 1
+    assert await _stored(db_session, b) == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_sku_resolves_to_none(coalescer, sku_ids):
+    """Test adjustments of unknown SKUs do not fail the rest of the batch."""
+    a, _ = sku_ids
+    calls = [asyncio.create_task(coalescer.adjust(999, 1)), asyncio.create_task(coalescer.adjust(a, 1))]
+    await asyncio.sleep(0)
+    await coalescer.flush()
+    assert await asyncio.gather(*calls) == [None, 11]
+
+
+@pytest.mark.asyncio
+async def test_read_includes_pending_deltas(db_session, sku_ids, coalescer):
+    """Test reads add queued deltas to the stored count."""
+    a, _ = sku_ids
+    call = asyncio.create_task(coalescer.adjust(a, -3))
+    await asyncio.sleep(0)
+    assert await coalescer.read(db_session, a) == 7
+    assert await coalescer.read(db_session, 999) is None
+
+    await coalescer.flush()
+    assert await call == 7
+    assert await coalescer.read(db_session, a) == 7
+
+
+@pytest.mark.asyncio
+async def test_max_events_and_close_flush(db_session, sku_ids):
+    """Test a full queue flushes before the interval and close() drains the rest."""
+    a, _ = sku_ids
+    Session = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    coalescer = InventoryCoalescer(Session, interval_ms=60_000, max_events=3)
+    coalescer.start()
+
+    full = [asyncio.create_task(coalescer.adjust(a, -1)) for _ in range(3)]
+    assert await asyncio.wait_for(asyncio.gather(*full), 5) == [7, 7, 7]
+
+    queued = asyncio.create_task(coalescer.adjust(a, -1))
+    await asyncio.sleep(0)
+    await coalescer.close()
+    assert not coalescer.running
+    assert await queued == 6
+    assert await _stored(db_session, a) == 6
+
+
+@pytest.mark.asyncio
+async def test_inventory_endpoints(client: AsyncClient, db_session, sku_ids, monkeypatch):
+    """Test the read endpoint and that adjustments go through a running coalescer."""
+    a, _ = sku_ids
+    response = await client.get(f"/api/v1/skus/{a}/inventory")
+    assert response.status_code == 200
+    assert response.json()["data"] == {"sku_id": a, "inventory_count": 10}
+    response = await client.get("/api/v1/skus/999/inventory")
+    assert response.status_code == 404
+
+    Session = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(inventory_coalescer, "session_factory", Session)
+    monkeypatch.setattr(inventory_coalescer, "interval", 0.001)
+    inventory_coalescer.start()
+    try:
+        events = inventory_coalescer.events
+        response = await client.post(f"/api/v1/skus/{a}/inventory:adjust", json={"delta": -4})
+        assert response.status_code == 200
+        assert response.json()["data"] == {"sku_id": a, "inventory_count": 6}
+        response = await client.post(f"/api/v1/skus/{a}/inventory:adjust", json={"delta": -7})
+        assert response.status_code == 409
+        assert inventory_coalescer.events == events + 2
+    finally:
+        await inventory_coalescer.close()
+    assert await _stored(db_session, a) == 6
@@ -0,0 +1,46 @@
+"""
+Test the multi-get (?ids=) endpoints.
+"""
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_multi_get_endpoints(client: AsyncClient, query_budget):
+    """Test ?ids= returns rows in request order and reports the missing ones."""
+    ids = []
+    for name in ("Home", "Garden", "Books"):
+        response = await client.post("/api/v1/categories/", json={"name": name})
+        ids.append(response.json()["data"]["id"])
+    await client.delete(f"/api/v1/categories/{ids[1]}")
+
+    with query_budget(1):
+        response = await client.get(f"/api/v1/categories/?ids={ids[2]},{ids[1]},{ids[0]},{ids[2]}")
+    data = response.json()
+    assert [item["name"] for item in data["data"]] == ["Books", "Home"]
+    assert data["meta"]["missing"] == [ids[1]]
+    # Served from the cache now
+    with query_budget(0):
+        await client.get(f"/api/v1/categories/?ids={ids[0]},{ids[2]}")
+
+    response = await client.post("/api/v1/products:bulk", json={"items": [
+        {"name": f"Lamp {i}", "category_id": ids[0]} for i in range(3)
+    ]})
+    product_ids = [item["id"] for item in response.json()["data"]]
+    response = await client.get(f"/api/v1/products/?ids={product_ids[2]},{product_ids[0]}&expand=category")
+    data = response.json()["data"]
+    assert [item["name"] for item in data] == ["Lamp 2", "Lamp 0"]
+    assert data[0]["category"]["name"] == "Home"
+
+    response = await client.post("/api/v1/skus:bulk", json={"items": [
+        {"sku_code": "LAMP-1", "product_id": product_ids[0], "price": "10", "inventory_count": 1},
+    ]})
+    sku_id = response.json()["data"][0]["id"]
+    response = await client.get(f"/api/v1/skus/?ids={sku_id},999")
+    assert [item["sku_code"] for item in response.json()["data"]] == ["LAMP-1"]
+    assert response.json()["meta"]["missing"] == [999]
+
+    assert (await client.get("/api/v1/skus/")).status_code == 400
+    assert (await client.get("/api/v1/categories/?ids=1,x")).status_code == 400
+    ids_param = ",".join(str(i) for i in range(1, 102))
+    assert (await client.get(f"/api/v1/products/?ids={ids_param}")).status_code == 400
@@ -0,0 +1,56 @@
+"""
+Test the instrumented connection pool.
+"""
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import engine_options
+from app.core.pool import InstrumentedAsyncPool, pool_stats
+
+
+def test_engine_options():
+    """Test pool settings apply to file databases and asyncpg gets a statement cache."""
+    assert engine_options("sqlite+aiosqlite://") == {}
+    options = engine_options("sqlite+aiosqlite:///./app.db")
+    assert options["poolclass"] is InstrumentedAsyncPool
+    assert "connect_args" not in options
+    options = engine_options("postgresql+asyncpg://user:pw@db/app")
+    assert options["connect_args"] == {"statement_cache_size": 100}
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics(tmp_path):
+    """Test checkouts, overflow events, timeouts and the wait histogram."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05
+    )
+    try:
+        first = await engine.connect()
+        second = await engine.connect()
+        await second.execute(text("SELECT 1"))
+
+        stats = pool_stats(engine.pool)
+        assert (stats["size"], stats["checked_out"], stats["overflow"]) == (1, 2, 1)
+        assert stats["overflow_events"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            await engine.connect()
+        await first.close()
+        await second.close()
+
+        stats = pool_stats(engine.pool)
+        assert stats["checked_out"] == 0
+        assert (stats["checkouts"], stats["timeouts"]) == (3, 1)
+        histogram = stats["wait_seconds"]
+        assert histogram["count"] == 3
+        assert histogram["buckets"]["+Inf"] == 3
+        # The timed-out checkout waited at least pool_timeout
+        assert histogram["max"] >= 0.05
+        assert histogram["buckets"]["0.01"] <= 2
+    finally:
+        await engine.dispose()
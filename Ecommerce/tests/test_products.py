@@ -0,0 +1,197 @@
+"""
+Test product API endpoints.
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+from app.services.product_service import ProductService
+
+
+@pytest_asyncio.fixture
+async def category(db_session) -> Category:
+    """Create a category to hold test products."""
+    category = Category(name="Electronics", path="Electronics")
+    db_session.add(category)
+    await db_session.commit()
+    return category
+
+
+@pytest.mark.asyncio
+async def test_get_products_cursor_pagination(client: AsyncClient, db_session, category):
+    """Test cursor pages match offset pages, newest first."""
+    created_at = datetime(2025, 1, 1)
+    for i in range(5):
+        db_session.add(Product(
+            name=f"Product {i}",
+            category_id=category.id,
+            created_at=created_at + timedelta(minutes=i // 2)
+        ))
+    await db_session.commit()
+
+    offset_names = []
+    for page in (1, 2, 3):
+        response = await client.get(f"/api/v1/products/?size=2&page={page}")
+        offset_names.extend(product["name"] for product in response.json()["data"])
+
+    cursor_names = []
+    response = await client.get("/api/v1/products/?size=2")
+    while True:
+        assert response.status_code == 200
+        data = response.json()
+        cursor_names.extend(product["name"] for product in data["data"])
+        if data["meta"]["next_cursor"] is None:
+            break
+        response = await client.get(f"/api/v1/products/?size=2&cursor={data['meta']['next_cursor']}")
+
+    assert cursor_names == offset_names
+    assert cursor_names == ["Product 4", "Product 3", "Product 2", "Product 1", "Product 0"]
+
+
+@pytest.mark.asyncio
+async def test_get_product_expand_category(client: AsyncClient, db_session, category):
+    """Test product category is only included when expanded."""
+    product = Product(name="Phone", category_id=category.id)
+    db_session.add(product)
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/products/{product.id}")
+    assert response.status_code == 200
+    assert "category" not in response.json()["data"]
+
+    response = await client.get(f"/api/v1/products/{product.id}?expand=category")
+    assert response.status_code == 200
+    assert response.json()["data"]["category"]["name"] == "Electronics"
+
+
+@pytest.mark.asyncio
+async def test_expand_skus_skips_deleted(client: AsyncClient, db_session, category):
+    """Test expanded SKUs leave out soft-deleted ones."""
+    product = Product(name="Phone", category_id=category.id)
+    db_session.add(product)
+    await db_session.flush()
+    db_session.add_all([
+        SKU(sku_code="PH-1", product_id=product.id, price=Decimal("10"), attributes={}),
+        SKU(sku_code="PH-2", product_id=product.id, price=Decimal("10"), attributes={}, is_deleted=True),
+    ])
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/products/{product.id}?expand=skus")
+    assert [sku["sku_code"] for sku in response.json()["data"]["skus"]] == ["PH-1"]
+    response = await client.get("/api/v1/products/?expand=skus")
+    assert [sku["sku_code"] for sku in response.json()["data"][0]["skus"]] == ["PH-1"]
+
+
+@pytest.mark.asyncio
+async def test_search_products(client: AsyncClient, db_session, category):
+    """Test ranked, case-insensitive partial name search with category filter."""
+    other = Category(name="Books", path="Books")
+    db_session.add(other)
+    await db_session.commit()
+    for name, category_id in [
+        ("Wireless Headphones", category.id),
+        ("Headphone Stand", category.id),
+        ("Earphones", category.id),
+        ("Headphones", category.id),
+        ("Headphones for Dummies", other.id),
+    ]:
+        db_session.add(Product(name=name, category_id=category_id))
+    await db_session.commit()
+
+    response = await client.get("/api/v1/products/search?query=HEADPHONE")
+    assert response.status_code == 200
+    data = response.json()
+    assert [product["name"] for product in data["data"]] == [
+        "Headphones", "Headphone Stand", "Headphones for Dummies", "Wireless Headphones"
+    ]
+    assert data["meta"]["total"] == 4
+
+    response = await client.get(
+        f"/api/v1/products/search?query=phone&category_id={category.id}&size=2&page=2"
+    )
+    data = response.json()
+    assert data["meta"]["total"] == 4
+    # Equal rank: shorter names first
+    assert [product["name"] for product in data["data"]] == ["Headphone Stand", "Wireless Headphones"]
+
+    response = await client.get(f"/api/v1/products/search?category_id={other.id}")
+    assert [product["name"] for product in response.json()["data"]] == ["Headphones for Dummies"]
+
+
+@pytest.mark.asyncio
+async def test_search_products_bad_request(client: AsyncClient, monkeypatch):
+    """Test a search the service rejects is a 400, not a 500."""
+    async def reject(self, search):
+        raise ValueError("Unsupported search query")
+
+    monkeypatch.setattr(ProductService, "search", reject)
+    response = await client.get("/api/v1/products/search?query=x")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unsupported search query"
+
+
+@pytest.mark.asyncio
+async def test_search_products_full_text(client: AsyncClient, db_session, category, monkeypatch):
+    """Test FTS5 search: word prefixes, BM25 ranking and snippets."""
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", "fts")
+    for name, description in [
+        ("Wireless Headphones", "Bluetooth over-ear headphones"),
+        ("Headphone Stand", None),
+        ("Phone Case", "Fits most headphone-free phones"),
+        ("Speaker", "Pairs with wireless headphones"),
+    ]:
+        db_session.add(Product(name=name, description=description, category_id=category.id))
+    await db_session.commit()
+
+    response = await client.get("/api/v1/products/search?query=headph")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["meta"]["total"] == 4
+    # Name matches outrank description-only matches
+    assert {product["name"] for product in data["data"][:2]} == {"Wireless Headphones", "Headphone Stand"}
+    assert data["data"][-1]["score"] <= data["data"][0]["score"]
+    assert "<mark>Headphone" in data["data"][0]["highlight"]
+
+    # Every word must match; trailing words are prefixes
+    response = await client.get("/api/v1/products/search?query=wireless+head")
+    assert {product["name"] for product in response.json()["data"]} == {"Wireless Headphones", "Speaker"}
+
+    # Updates and soft deletes are picked up
+    product = (await db_session.execute(
+        select(Product).where(Product.name == "Speaker")
+    )).scalar_one()
+    product.name = "Smart Speaker"
+    product.description = None
+    stand = (await db_session.execute(
+        select(Product).where(Product.name == "Headphone Stand")
+    )).scalar_one()
+    stand.is_deleted = True
+    await db_session.commit()
+    response = await client.get("/api/v1/products/search?query=headph")
+    assert {product["name"] for product in response.json()["data"]} == {"Wireless Headphones", "Phone Case"}
+
+
+@pytest.mark.asyncio
+async def test_search_products_like_fallback(client: AsyncClient, db_session, category, monkeypatch):
+    """Test the LIKE backend matches substrings and highlights names."""
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", "like")
+    db_session.add(Product(name="Wireless Headphones", category_id=category.id))
+    db_session.add(Product(name="100% Cotton", category_id=category.id))
+    await db_session.commit()
+
+    response = await client.get("/api/v1/products/search?query=LESS")
+    data = response.json()["data"]
+    assert [product["name"] for product in data] == ["Wireless Headphones"]
+    assert data[0]["highlight"] == "Wire<mark>less</mark> Headphones"
+
+    # LIKE wildcards in the query are matched literally
+    response = await client.get("/api/v1/products/search?query=0%25")
+    assert [product["name"] for product in response.json()["data"]] == ["100% Cotton"]
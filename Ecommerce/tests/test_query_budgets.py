@@ -0,0 +1,165 @@
+"""
+Test SQL statement budgets for every API route.
+
+Each route runs against a small catalog with several products and SKUs per
+category, so a per-row query (N+1) pushes it over its budget. Budgets are the
+statement counts the route needs today; raise one only together with the
+change that justifies it.
+"""
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.query_stats import statement_shape, track_queries
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU
+
+PRODUCTS_PER_CATEGORY = 6
+SKUS_PER_PRODUCT = 2
+
+
+@pytest_asyncio.fixture
+async def catalog(client: AsyncClient, db_session) -> None:
+    """
+    Categories 1 > 2 > 3, 4 and an empty 5, with products and SKUs under 2, 3
+    and 4, plus a deleted category 6, product 19 and SKU 37 to restore.
+    """
+    parent_id = None
+    for name in ("Root", "Child", "Leaf"):
+        response = await client.post("/api/v1/categories/", json={"name": name, "parent_id": parent_id})
+        parent_id = response.json()["data"]["id"]
+    await client.post("/api/v1/categories/", json={"name": "Other"})
+    await client.post("/api/v1/categories/", json={"name": "Empty"})
+
+    for category_id in (2, 3, 4):
+        for i in range(PRODUCTS_PER_CATEGORY):
+            product = Product(name=f"Widget {category_id}-{i}", category_id=category_id)
+            db_session.add(product)
+            await db_session.flush()
+            for j in range(SKUS_PER_PRODUCT):
+                db_session.add(SKU(
+                    sku_code=f"W-{product.id}-{j}",
+                    product_id=product.id,
+                    price=Decimal("9.99"),
+                    inventory_count=5,
+                    attributes={"color": "red"}
+                ))
+    db_session.add(Category(name="Retired", path="Retired", is_deleted=True))
+    db_session.add(Product(name="Retired Widget", category_id=4, is_deleted=True))
+    await db_session.flush()
+    db_session.add(SKU(sku_code="W-1-retired", product_id=1, price=Decimal("9.99"), attributes={}, is_deleted=True))
+    await db_session.commit()
+    # Budgets are for a warm process: load the category hierarchy snapshot
+    await client.get("/api/v1/categories/tree")
+
+
+ROUTES = [
+    ("POST", "/api/v1/categories/", {"name": "New", "parent_id": 3}, 1),
+    ("GET", "/api/v1/categories/", None, 1),
+    ("GET", "/api/v1/categories/?expand=products", None, 2),
+    ("GET", "/api/v1/categories/tree", None, 1),
+    ("GET", "/api/v1/categories/2", None, 1),
+    ("GET", "/api/v1/categories/2?expand=products", None, 2),
+    ("GET", "/api/v1/categories/?ids=1,2,3,4,999", None, 1),
+    ("PUT", "/api/v1/categories/2", {"description": "Updated", "version": 1}, 1),
+    ("PATCH", "/api/v1/categories/3", {"name": "Renamed", "description": None}, 1),
+    ("PATCH", "/api/v1/categories/2", {"parent_id": None}, 2),
+    ("POST", "/api/v1/categories/3/move?new_parent_id=4", None, 1),
+    ("DELETE", "/api/v1/categories/5", None, 1),
+    ("POST", "/api/v1/categories/6/restore", None, 4),
+    ("POST", "/api/v1/products:bulk", {"items": [
+        {"name": f"Bulk {i}", "category_id": 3} for i in range(10)
+    ]}, 2),
+    ("GET", "/api/v1/products/", None, 1),
+    ("GET", "/api/v1/products/?expand=category", None, 1),
+    ("GET", "/api/v1/products/search?query=widget", None, 3),
+    ("GET", "/api/v1/products/facets?query=widget&attr.color=red", None, 6),
+    ("GET", "/api/v1/products/5", None, 1),
+    ("GET", "/api/v1/products/5?expand=category", None, 1),
+    ("POST", "/api/v1/products/19/restore", None, 5),
+    ("GET", "/api/v1/products/?expand=skus", None, 2),
+    ("GET", "/api/v1/products/?attr.color=red&attr.size=M", None, 2),
+    ("GET", "/api/v1/products/5?expand=category,skus", None, 2),
+    ("GET", "/api/v1/products/?ids=1,5,9,13&expand=category,skus", None, 2),
+    ("POST", "/api/v1/skus:bulk", {"items": [
+        {"sku_code": f"B-{i}", "product_id": 1, "price": "1.00", "inventory_count": 1} for i in range(10)
+    ]}, 3),
+    ("GET", "/api/v1/skus/search?product_id=1&min_price=5&in_stock=true", None, 1),
+    ("GET", "/api/v1/skus/search?max_price=20&size=5", None, 2),
+    ("GET", "/api/v1/skus/search?attr.color=red", None, 3),
+    ("GET", "/api/v1/skus/?ids=1,2,3,4,5,6", None, 1),
+    ("POST", "/api/v1/skus/37/restore", None, 5),
+    ("GET", "/api/v1/skus/1/inventory", None, 1),
+    ("POST", "/api/v1/skus/1/inventory:adjust", {"delta": -1}, 1),
+    ("POST", "/api/v1/skus/inventory:adjust", {"items": [
+        {"sku_id": i, "delta": -1} for i in range(1, 11)
+    ]}, 1),
+    ("GET", "/api/v1/export/products", None, 1),
+    ("GET", "/api/v1/export/skus?format=csv", None, 1),
+    ("GET", "/api/v1/export/categories", None, 1),
+    # Uploads send bytes as the file; one chunk of rows costs 3 statements
+    # (validate, insert, checkpoint) on top of the job's 4
+    ("POST", "/api/v1/imports/products", "".join(
+        ["name,category_id\n"] + [f"Imported {i},3\n" for i in range(10)]
+    ).encode(), 7),
+    ("GET", "/api/v1/imports/404", None, 1),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method,url,body,budget", ROUTES, ids=[f"{r[0]} {r[1]}" for r in ROUTES])
+async def test_route_query_budget(client: AsyncClient, catalog, query_budget, method, url, body, budget):
+    """Test each route stays within its statement budget."""
+    if isinstance(body, bytes):
+        request = {"files": {"file": ("upload.csv", body, "text/csv")}}
+    else:
+        request = {"json": body}
+    with query_budget(budget):
+        response = await client.request(method, url, **request)
+    assert response.status_code < 400 or url.endswith("/404")
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(client: AsyncClient, catalog):
+    """Test responses report their statement count and DB time."""
+    response = await client.get("/api/v1/products/?expand=skus")
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith("db;dur=")
+    assert server_timing.endswith('desc="2 queries"')
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_are_n_plus_one_suspects(db_session):
+    """Test identical statement shapes are counted together and flagged."""
+    with track_queries() as outer:
+        with track_queries() as stats:
+            for product_id in range(6):
+                await db_session.get(Product, product_id)
+        await db_session.get(SKU, 1)
+
+    assert stats.count == 6
+    assert outer.count == 7
+    [(shape, count)] = stats.repeated(threshold=5)
+    assert count == 6
+    assert shape.startswith("SELECT products.id")
+    assert statement_shape("SELECT 1 WHERE id IN (?, ?,  ?)") == statement_shape("SELECT 1 WHERE id IN (?)")
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_are_timed_and_cleared(db_session):
+    """Test a statement that raises is counted and leaves no start time behind."""
+    with track_queries() as stats:
+        with pytest.raises(DBAPIError):
+            await db_session.execute(text("SELECT * FROM no_such_table"))
+        await db_session.rollback()
+        await db_session.execute(text("SELECT 1"))
+
+    assert stats.count == 2
+    assert 0 <= stats.seconds < 5
+    connection = await db_session.connection()
+    assert "query_started" not in connection.info
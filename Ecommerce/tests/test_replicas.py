@@ -0,0 +1,96 @@
+"""
+Test read-replica routing for GET traffic.
+"""
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import database
+from app.core.database import Base, ReplicaRouter, get_read_db
+from app.main import app
+from app.models.category import Category
+from app.models.product import Product
+
+
+async def _seed_replica(router: ReplicaRouter, index: int, name: str) -> None:
+    """Create the schema on a replica with one product named ``name``."""
+    async with router.engines[index].begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with router._sessionmakers[router.engines[index]]() as session:
+        category = Category(name="Replicated", path="Replicated")
+        session.add(category)
+        await session.flush()
+        session.add(Product(name=name, category_id=category.id))
+        await session.commit()
+
+
+@pytest_asyncio.fixture
+async def replicas(tmp_path, client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    """Two SQLite replicas behind ``get_read_db``, with the test database as primary."""
+    router = ReplicaRouter(
+        [f"sqlite+aiosqlite:///{tmp_path / 'replica_a.db'}", f"sqlite+aiosqlite:///{tmp_path / 'replica_b.db'}"],
+        eject_seconds=60
+    )
+    await _seed_replica(router, 0, "From replica A")
+    await _seed_replica(router, 1, "From replica B")
+
+    category = Category(name="Primary", path="Primary")
+    db_session.add(category)
+    await db_session.flush()
+    db_session.add(Product(name="From primary", category_id=category.id))
+    await db_session.commit()
+
+    monkeypatch.setattr(database, "replica_router", router)
+    monkeypatch.setattr(
+        database, "AsyncSessionLocal",
+        async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    )
+    app.dependency_overrides.pop(get_read_db)
+    yield router
+    await router.dispose()
+
+
+async def _product_names(client: AsyncClient, **headers) -> list:
+    response = await client.get("/api/v1/products/", headers=headers)
+    assert response.status_code == 200
+    return [product["name"] for product in response.json()["data"]]
+
+
+@pytest.mark.asyncio
+async def test_reads_round_robin_over_replicas(client: AsyncClient, replicas):
+    """Test GETs alternate between replicas and writes stay on the primary."""
+    names = [await _product_names(client) for _ in range(4)]
+    assert names == [["From replica A"], ["From replica B"], ["From replica A"], ["From replica B"]]
+
+    response = await client.post("/api/v1/categories/", json={"name": "Written"})
+    assert response.status_code == 201
+    assert [replica["healthy"] for replica in replicas.stats()] == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_uses_primary(client: AsyncClient, replicas):
+    """Test the read-your-writes header routes a GET to the primary."""
+    assert await _product_names(client, **{"X-Read-Your-Writes": "1"}) == ["From primary"]
+    assert await _product_names(client) == ["From replica A"]
+
+
+@pytest.mark.asyncio
+async def test_failed_replica_is_ejected(client: AsyncClient, replicas, tmp_path):
+    """Test a replica that cannot connect leaves the rotation, then reads fall back to the primary."""
+    broken = ReplicaRouter(
+        [f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}", str(replicas.engines[1].url)],
+        eject_seconds=60
+    )
+    database.replica_router = broken
+    try:
+        response = await client.get("/api/v1/products/")
+        assert response.status_code == 500
+        assert [replica["healthy"] for replica in broken.stats()] == [False, True]
+        assert [await _product_names(client) for _ in range(2)] == [["From replica B"], ["From replica B"]]
+
+        broken.eject(broken.engines[1])
+        assert broken.next_sessionmaker() is None
+        assert await _product_names(client) == ["From primary"]
+    finally:
+        await broken.dispose()
@@ -0,0 +1,114 @@
+"""
+Test typed SKU price/inventory columns and SKU search.
+"""
+import json
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sku import SKU, upgrade_sku_columns
+
+
+@pytest_asyncio.fixture
+async def product_ids(db_session) -> list:
+    """Two products with SKUs at assorted prices and stock levels."""
+    category = Category(name="Electronics", path="Electronics")
+    db_session.add(category)
+    await db_session.flush()
+    products = [Product(name="Phone", category_id=category.id), Product(name="Case", category_id=category.id)]
+    db_session.add_all(products)
+    await db_session.flush()
+    phone, case = products
+    db_session.add_all([
+        SKU(sku_code="PH-64", product_id=phone.id, price=Decimal("499.00"), inventory_count=3, attributes={}),
+        SKU(sku_code="PH-128", product_id=phone.id, price=Decimal("599.00"), inventory_count=0, attributes={}),
+        SKU(sku_code="PH-256", product_id=phone.id, price=Decimal("699.00"), inventory_count=1, attributes={}),
+        SKU(sku_code="PH-OLD", product_id=phone.id, price=Decimal("99.00"), inventory_count=9, attributes={},
+            is_deleted=True),
+        SKU(sku_code="CS-RED", product_id=case.id, price=Decimal("19.99"), inventory_count=50, attributes={}),
+    ])
+    await db_session.commit()
+    return [phone.id, case.id]
+
+
+async def _codes(client: AsyncClient, params: dict) -> list:
+    response = await client.get("/api/v1/skus/search", params=params)
+    assert response.status_code == 200
+    return [sku["sku_code"] for sku in response.json()["data"]]
+
+
+@pytest.mark.asyncio
+async def test_search_skus(client: AsyncClient, product_ids):
+    """Test every search filter, cheapest first, deleted SKUs excluded."""
+    phone, case = product_ids
+    assert await _codes(client, {}) == ["CS-RED", "PH-64", "PH-128", "PH-256"]
+    assert await _codes(client, {"product_id": phone}) == ["PH-64", "PH-128", "PH-256"]
+    assert await _codes(client, {"min_price": "500", "max_price": "699.00"}) == ["PH-128", "PH-256"]
+    assert await _codes(client, {"in_stock": "true", "product_id": phone}) == ["PH-64", "PH-256"]
+    assert await _codes(client, {"in_stock": "false"}) == ["PH-128"]
+    assert await _codes(client, {"sku_code": "PH-"}) == ["PH-64", "PH-128", "PH-256"]
+    assert await _codes(client, {"sku_code": "PH-1"}) == ["PH-128"]
+    # Case-sensitive on every backend, and LIKE wildcards are literal
+    assert await _codes(client, {"sku_code": "ph-"}) == []
+    assert await _codes(client, {"sku_code": "PH_"}) == []
+
+    response = await client.get("/api/v1/skus/search", params={"size": 2, "page": 2})
+    data = response.json()
+    assert [sku["sku_code"] for sku in data["data"]] == ["PH-128", "PH-256"]
+    assert data["meta"]["total"] == 4
+    assert data["data"][0]["price"] == "599.00"
+    assert data["data"][0]["inventory_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_search_uses_price_index(db_session, product_ids):
+    """Test product + price filters are answered from the composite price index."""
+    plan = await db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM skus "
+        "WHERE product_id = 1 AND price >= 500 AND is_deleted = 0 ORDER BY price, id"
+    ))
+    details = " ".join(row[-1] for row in plan.all())
+    assert "ix_skus_product_price" in details
+    assert "TEMP B-TREE" not in details
+
+
+@pytest.mark.asyncio
+async def test_upgrade_moves_json_values_into_columns(tmp_path):
+    """Test the upgrade adds the columns, backfills them and strips the JSON keys."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "CREATE TABLE skus (id INTEGER PRIMARY KEY, sku_code VARCHAR(64) NOT NULL UNIQUE, "
+            "product_id INTEGER NOT NULL, attributes JSON NOT NULL, created_at DATETIME NOT NULL, "
+            "updated_at DATETIME NOT NULL, version INTEGER NOT NULL, is_deleted BOOLEAN NOT NULL)"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO skus VALUES "
+            "(1, 'A', 1, '{\"price\": \"12.50\", \"inventory_count\": 7, \"color\": \"red\"}', "
+            "'2025-01-01', '2025-01-01', 1, 0), "
+            "(2, 'B', 1, '{\"size\": \"M\"}', '2025-01-01', '2025-01-01', 1, 0), "
+            "(3, 'C', 1, '{\"inventory_count\": 2}', '2025-01-01', '2025-01-01', 1, 0)"
+        )
+        assert await conn.run_sync(upgrade_sku_columns, 2) == 2
+        # Re-running finds nothing left to move
+        assert await conn.run_sync(upgrade_sku_columns, 2) == 0
+
+        rows = (await conn.exec_driver_sql(
+            "SELECT price, inventory_count, attributes FROM skus ORDER BY id"
+        )).all()
+        indexes = (await conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'skus'"
+        )).scalars().all()
+    await engine.dispose()
+
+    assert [(Decimal(str(price)), count) for price, count, _ in rows] == [
+        (Decimal("12.5"), 7), (Decimal("0"), 0), (Decimal("0"), 2)
+    ]
+    assert [json.loads(attributes) for _, _, attributes in rows] == [{"color": "red"}, {"size": "M"}, {}]
+    assert {"ix_skus_product_price", "ix_skus_price_in_stock"} <= set(indexes)
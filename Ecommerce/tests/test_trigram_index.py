@@ -0,0 +1,33 @@
+"""
+Test the in-process trigram product index.
+"""
+from app.services.search.trigram import TrigramIndex
+
+
+def test_incremental_updates():
+    """Test adds, renames and removals keep postings consistent."""
+    index = TrigramIndex()
+    index.add(1, "Red Mug", category_id=1)
+    index.add(2, "Blue Mug", category_id=2)
+
+    assert index.search("mug") == ([1, 2], 2)
+    assert index.search("mug", category_id=2) == ([2], 1)
+
+    index.add(1, "Red Cup", category_id=1)
+    assert index.search("mug") == ([2], 1)
+    assert index.search("cup") == ([1], 1)
+
+    index.remove(2)
+    assert index.search("mug") == ([], 0)
+    assert index._category_postings.get(2) is None
+
+
+def test_short_terms_and_descriptions():
+    """Test terms shorter than a trigram and description matches."""
+    index = TrigramIndex(index_description=True)
+    index.add(1, "Kettle", category_id=1, description="Boils water fast")
+    index.add(2, "Water Bottle", category_id=1)
+
+    assert index.search("wa") == ([2, 1], 2)
+    assert index.search("water") == ([2, 1], 2)
+    assert index.search("boils") == ([1], 1)